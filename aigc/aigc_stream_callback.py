@@ -17,7 +17,11 @@ import random
 import urllib3
 from urllib.parse import urlencode
 import json
-from gmssl import sm3, func
+
+try:
+    from common.http_pool import shared_pool_manager
+except ImportError:  # 单独运行示例代码时使用独立的连接池
+    shared_pool_manager = urllib3.PoolManager
 
 
 class AigcStreamCallbackAPIDemo(object):
@@ -34,7 +38,7 @@ class AigcStreamCallbackAPIDemo(object):
         """
         self.secret_id = secret_id
         self.secret_key = secret_key
-        self.http = urllib3.PoolManager()  # 初始化连接池
+        self.http = shared_pool_manager()  # 初始化连接池，同一进程内的API类共享
 
     def gen_signature(self, params=None):
         """生成签名信息
@@ -43,14 +47,22 @@ class AigcStreamCallbackAPIDemo(object):
         Returns:
             参数签名md5值
         """
-        buff = ""
-        for k in sorted(params.keys()):
-            buff += str(k) + str(params[k])
-        buff += self.secret_key
+        keys = sorted(params.keys())
         if "signatureMethod" in params.keys() and params["signatureMethod"] == "SM3":
-            return sm3.sm3_hash(func.bytes_to_list(bytes(buff, encoding='utf8')))
+            if "sm3" not in hashlib.algorithms_available:
+                from gmssl import sm3, func  # 本地OpenSSL不支持SM3时才导入gmssl
+                buff = b"".join(str(k).encode("utf8") + str(params[k]).encode("utf8") for k in keys)
+                return sm3.sm3_hash(func.bytes_to_list(buff + self.secret_key.encode("utf8")))
+            # 优先使用OpenSSL原生SM3实现
+            digest = hashlib.new("sm3")
         else:
-            return hashlib.md5(buff.encode("utf8")).hexdigest()
+            digest = hashlib.md5()
+        # 逐个参数增量计算摘要，避免拼接完整的签名字符串
+        for k in keys:
+            digest.update(str(k).encode("utf8"))
+            digest.update(str(params[k]).encode("utf8"))
+        digest.update(self.secret_key.encode("utf8"))
+        return digest.hexdigest()
 
     def check(self):
         """请求易盾接口
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+易盾反垃圾云服务名单批量写入性能基准测试
+使用固定延迟的模拟list/submit、list/pageQuery，对比common.bulk_writer.BulkWriter在不同批次大小、
+并发数下导入名单的请求次数与耗时；sequential为逐条顺序调用，与示例代码的用法相同
+模拟接口不含签名、编码及服务端处理耗时，结果主要体现请求次数与往返延迟的影响
+python版本：python3.7
+运行:
+    $ python -m benchmark.bench_bulk_writer
+    $ python -m benchmark.bench_bulk_writer --entries 100000 --latency 0.05
+"""
+__author__ = 'yidun-dev'
+__date__ = '2026/10/18'
+__version__ = '0.2-dev'
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from common import json_codec
+from common.bulk_writer import BulkWriter
+
+# (名称, 批次大小, 并发数, 远端去重)
+CASES = (
+    ("sequential", 1, 1, False),
+    ("batch", 100, 1, True),
+    ("batch+concurrency", 100, 8, True),
+    ("batch+concurrency", 100, 32, True),
+)
+
+
+class _MockListApi(object):
+    """按list/submit、list/pageQuery响应格式返回，每次请求固定延迟"""
+
+    def __init__(self, existing, latency):
+        self.remote = set(existing)
+        self.latency = latency
+
+    async def request(self, endpoint, params):
+        await asyncio.sleep(self.latency)
+        if endpoint.name == "list_query":
+            rows = [{"entity": entity, "releaseTime": 0} for entity in sorted(self.remote)]
+            page, size = int(params["pageNum"]), int(params["pageSize"])
+            return {"code": 200, "msg": "ok", "result": {"count": len(rows), "rows": rows[(page - 1) * size:page * size]}}
+        entities = json_codec.loads(params["entities"])
+        result = [{"entity": entity, "uuid": entity, "exist": entity in self.remote} for entity in entities]
+        self.remote.update(entities)
+        return {"code": 200, "msg": "ok", "result": result}
+
+
+def main(args):
+    entries = ["user_%08d" % i for i in range(args.entries)]
+    existing = entries[:int(args.entries * args.existing)]
+    print("%-18s %6s %12s %9s %9s %9s %12s" % ("mode", "batch", "concurrency", "requests", "skipped", "seconds",
+                                               "entries/s"))
+    for name, batch_size, concurrency, dedup in CASES:
+        # 逐条调用耗时过长，只导入最后sequential_limit条(远端不存在的部分)
+        items = entries[-args.sequential_limit:] if name == "sequential" else entries
+        journal = os.path.join(tempfile.mkdtemp(prefix="bench_bulk_writer_"), "journal")
+        writer = BulkWriter(_MockListApi(existing, args.latency), "list_submit", {"listType": 2, "entityType": 1},
+                            batch_size=batch_size, concurrency=concurrency, dedup=dedup, journal=journal)
+        start = time.perf_counter()
+        report = asyncio.run(writer.run(items))
+        seconds = time.perf_counter() - start
+        os.remove(journal)
+        os.rmdir(os.path.dirname(journal))
+        print("%-18s %6d %12d %9d %9d %9.2f %12.0f" % (name, batch_size, concurrency, report.requests, report.skipped,
+                                                       seconds, len(items) / seconds))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="名单批量写入性能基准测试")
+    parser.add_argument("--entries", type=int, default=20000, help="导入的名单条数")
+    parser.add_argument("--existing", type=float, default=0.2, help="远端已存在的比例")
+    parser.add_argument("--latency", type=float, default=0.02, help="模拟接口单次请求延迟，秒")
+    parser.add_argument("--sequential-limit", type=int, default=1000, help="逐条顺序调用导入的条数")
+    main(parser.parse_args())
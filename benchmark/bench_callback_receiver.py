@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+易盾反垃圾云服务主动回调接收组件本地压测
+启动CallbackReceiver，使用CallbackPusher并发推送签名后的文本检测结果，统计接收吞吐和503背压次数
+python版本：python3.7
+运行:
+    $ python -m benchmark.bench_callback_receiver [推送总数] [并发数]
+"""
+__author__ = 'yidun-dev'
+__date__ = '2026/10/18'
+__version__ = '0.2-dev'
+
+import asyncio
+import sys
+import time
+
+from common.callback_receiver import CallbackReceiver, CallbackPusher
+
+SECRET_ID = "bench_secret_id"
+SECRET_KEY = "bench_secret_key"
+
+
+async def main(total, concurrency):
+    receiver = CallbackReceiver({SECRET_ID: SECRET_KEY}, queue_size=1000, workers=4)
+    receiver.on("text", lambda product, data, params: None)
+    port = await receiver.start("127.0.0.1", 0)
+    pusher = CallbackPusher("http://127.0.0.1:%d/callback/text" % port, SECRET_ID, SECRET_KEY, concurrency)
+    statuses = {}
+    callback_data = {"antispam": {"taskId": "bench", "dataId": "bench", "suggestion": 0, "labels": []}}
+    remaining = iter(range(total))
+
+    async def worker():
+        for _ in remaining:
+            status = await pusher.push(callback_data)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    await receiver.join()
+    elapsed = time.perf_counter() - start
+    print("推送: %d, 耗时: %.2fs, 吞吐: %.0f/s, 状态码: %s, 处理完成: %d, 背压: %d"
+          % (total, elapsed, total / elapsed, statuses, receiver.handled, receiver.busy))
+    pusher.close()
+    await receiver.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000,
+                     int(sys.argv[2]) if len(sys.argv) > 2 else 64))
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+易盾反垃圾云服务客户端冷启动性能基准测试
+每轮在独立的python进程中测量，对比同一进程内使用全部接口的两种方式:
+    demos  加载全部示例代码模块，每个接口创建一个API类实例
+    client 导入common.client，创建一个APIClient，通过接口描述符调用全部接口
+import(ms)为导入耗时，import(KB)为导入新增内存，per_client(B)为单个客户端实例占用内存，
+all(KB)为覆盖全部接口的客户端实例合计占用内存，gmssl为导入后gmssl是否已被加载
+python版本：python3.7
+运行:
+    $ python -m benchmark.bench_client
+"""
+__author__ = 'yidun-dev'
+__date__ = '2026/10/18'
+__version__ = '0.2-dev'
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = r'''
+import glob, importlib.util, json, os, sys, time, tracemalloc
+
+mode, trace = sys.argv[1], sys.argv[2] == "memory"
+if trace:  # tracemalloc会显著拖慢导入，耗时与内存分两个进程测量
+    tracemalloc.start()
+start = time.perf_counter()
+if mode == "demos":
+    classes = []
+    for path in sorted(glob.glob("*/*.py")):
+        if path.startswith(("common", "benchmark")):
+            continue
+        spec = importlib.util.spec_from_file_location(os.path.basename(path)[:-3], path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        classes.extend(v for v in vars(module).values() if isinstance(v, type) and hasattr(v, "API_URL"))
+
+    def create():
+        return [cls(*("id", "key", "business")[:cls.__init__.__code__.co_argcount - 1]) for cls in classes]
+else:
+    from common.client import APIClient
+
+    def create():
+        return [APIClient("id", "key", "business")]
+elapsed = time.perf_counter() - start
+imported = tracemalloc.get_traced_memory()[0]
+
+from common.http_pool import shared_pool_manager
+shared_pool_manager()  # 共享连接池在两种方式下相同，不计入客户端内存
+before = tracemalloc.get_traced_memory()[0]
+clients = create()
+total = tracemalloc.get_traced_memory()[0] - before
+print(json.dumps({"import_ms": elapsed * 1000, "import_kb": imported / 1024, "clients": len(clients),
+                  "per_client": total / len(clients), "all_kb": total / 1024, "gmssl": "gmssl" in sys.modules}))
+'''
+
+
+def probe(mode, what="time"):
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    output = subprocess.check_output([sys.executable, "-c", PROBE, mode, what], cwd=ROOT, env=env)
+    return json.loads(output.decode("utf8"))
+
+
+def main(rounds=7):
+    print("%-8s %8s %11s %11s %14s %9s %6s" % ("mode", "clients", "import(ms)", "import(KB)", "per_client(B)",
+                                              "all(KB)", "gmssl"))
+    for mode in ("demos", "client"):
+        probe(mode)  # 首次运行生成pyc，不计入
+        results = [probe(mode) for _ in range(rounds)]
+        ret = probe(mode, "memory")
+        print("%-8s %8d %11.2f %11.1f %14.0f %9.1f %6s" % (
+            mode, ret["clients"], statistics.median(r["import_ms"] for r in results), ret["import_kb"],
+            ret["per_client"], ret["all_kb"], ret["gmssl"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+易盾反垃圾云服务请求全流程性能基准测试
+按产品选取代表性接口和请求参数，分阶段测量:
+    sign      公共参数填充及签名(sign_params/gen_signature)
+    encode    请求参数urlencode
+    transport 对本地模拟服务(common.mock_server)的HTTP往返，模拟服务运行在子进程中，内存分配只统计客户端
+    parse     响应json.loads及结果遍历
+每个阶段输出吞吐、p50/p99延迟以及单次执行的内存分配，结果可保存为json，用于不同版本之间的回归对比
+python版本：python3.7
+运行:
+    $ python -m benchmark.bench_e2e --output result.json
+    $ python -m benchmark.bench_e2e --output new.json --compare result.json
+"""
+__author__ = 'yidun-dev'
+__date__ = '2026/10/18'
+__version__ = '0.2-dev'
+
+import argparse
+import asyncio
+import base64
+import json
+import multiprocessing
+import os
+import platform
+import time
+import tracemalloc
+from urllib.parse import parse_qsl, urlencode
+
+from common.async_client import AsyncAPIClient
+from common.endpoints import get_endpoint
+from common.mock_server import MockServer
+from common.signature import sign_params
+
+SECRET_ID = "bench_secret_id"
+SECRET_KEY = "bench_secret_key"
+BUSINESS_ID = "bench_business_id"
+IMAGE_URL = "https://nos.netease.com/yidun/2-0-0-a6133509763d4d6eac881a58f1791976.jpg"
+VIDEO_URL = "http://xxx.xxx.com/xxxx"
+
+
+def _texts(count):
+    return json.dumps([{"dataId": "data-%d" % i, "content": "易盾批量检测接口！v5接口! %d" % i} for i in range(count)])
+
+
+def _images(count, base64_bytes=0):
+    images = []
+    for i in range(count):
+        if base64_bytes:
+            data = base64.b64encode(os.urandom(base64_bytes)).decode()
+            images.append({"name": "image-%d" % i, "type": 2, "data": data})
+        else:
+            images.append({"name": "image-%d" % i, "type": 1, "data": IMAGE_URL})
+    return json.dumps(images)
+
+
+# 各产品代表性接口及请求参数
+PAYLOADS = [
+    ("text_check", "text_check", lambda: {"dataId": "data-0", "content": "易盾测试内容！v5接口!"}),
+    ("text_batch_check", "text_batch_check", lambda: {"texts": _texts(100), "checkLabels": "200, 500"}),
+    ("image_check_url", "image_check", lambda: {"images": _images(32)}),
+    ("image_check_base64", "image_check", lambda: {"images": _images(4, 256 << 10)}),
+    ("audio_submit", "audio_submit", lambda: {"url": VIDEO_URL, "title": "title", "ip": "123.115.77.137"}),
+    ("video_submit", "video_submit", lambda: {"url": VIDEO_URL, "dataId": "data-0", "scFrequency": 5}),
+    ("livevideosolution_submit", "livevideosolution_submit", lambda: {"url": VIDEO_URL, "dataId": "data-0"}),
+    ("videosolution_submit", "videosolution_submit", lambda: {"url": VIDEO_URL, "dataId": "data-0"}),
+    ("mediasolution_submit", "mediasolution_submit", lambda: {"dataId": "data-0", "content": json.dumps(
+        [{"type": "text", "data": "易盾测试内容 %d" % i} for i in range(20)] + [
+            {"type": "image", "data": IMAGE_URL} for _ in range(10)])}),
+    ("digital_submit", "digital_submit", lambda: {"dataId": "data-0", "content": json.dumps(
+        [{"type": "text", "data": "易盾测试内容 %d" % i} for i in range(20)])}),
+    ("report_submit", "report_submit", lambda: {"dataId": "data-0", "content": json.dumps(
+        [{"type": "text", "data": "易盾测试内容 %d" % i} for i in range(20)])}),
+    ("filesolution_submit", "filesolution_submit", lambda: {"dataId": "data-0", "url": VIDEO_URL}),
+    ("crawler_submit", "crawler_submit", lambda: {"dataId": "data-0", "url": VIDEO_URL}),
+    ("aigc_stream_push", "aigc_stream_push", lambda: {"sessionId": "session-0", "type": 1, "dataId": "data-0",
+                                                      "content": "易盾测试内容"}),
+    ("keyword_submit", "keyword_submit", lambda: {"category": 100, "keywords": ",".join(
+        "keyword%d" % i for i in range(100))}),
+    ("list_submit", "list_submit", lambda: {"entityType": 1, "listType": 2, "entities": ",".join(
+        "account%d" % i for i in range(100))}),
+    ("text_query", "text_query", lambda: {"taskIds": ["task-%d" % i for i in range(100)]}),
+    ("text_callback", "text_callback", lambda: {}),
+    ("video_callback", "video_callback", lambda: {}),
+]
+
+
+def traverse(obj):
+    """遍历解析结果中的全部字段，模拟示例代码中的结果处理，Returns: 字段数"""
+    count = 0
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            count += len(item)
+            stack.extend(item.values())
+        elif isinstance(item, list):
+            stack.extend(item)
+    return count
+
+
+def percentile(samples, p):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+def summarize(latencies, total_seconds, alloc_bytes, alloc_blocks):
+    return {
+        "ops_per_sec": len(latencies) / total_seconds if total_seconds else 0.0,
+        "p50_us": percentile(latencies, 0.50) * 1e6,
+        "p99_us": percentile(latencies, 0.99) * 1e6,
+        "alloc_bytes": alloc_bytes,
+        "alloc_blocks": alloc_blocks,
+    }
+
+
+def start_allocations():
+    """开始统计内存分配，Returns: 开始时的快照"""
+    tracemalloc.start()
+    return tracemalloc.take_snapshot()
+
+
+def stop_allocations(before):
+    """Returns: (start_allocations之后新分配的字节数峰值, 内存块数)"""
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename") if stat.count_diff > 0)
+    return peak, blocks
+
+
+def measure_allocations(func):
+    """Returns: (单次执行新分配的字节数峰值, 内存块数)"""
+    before = start_allocations()
+    func()
+    return stop_allocations(before)
+
+
+def measure(func, rounds):
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(rounds):
+        t = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - t)
+    total = time.perf_counter() - start
+    return summarize(latencies, total, *measure_allocations(func))
+
+
+def serve(ports):
+    async def run():
+        ports.put(await MockServer({SECRET_ID: SECRET_KEY}).start())
+        while True:
+            await asyncio.sleep(3600)
+
+    asyncio.run(run())
+
+
+def start_mock_server():
+    """在子进程中启动模拟服务，服务端的内存分配不计入transport阶段，Returns: (端口, 子进程)"""
+    ports = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(ports,), daemon=True)
+    server.start()
+    return ports.get(), server
+
+
+async def measure_transport(client, name, build, rounds):
+    async def send(params):
+        ret = await client.check(name, params)
+        if ret is None or ret["code"] != 200:
+            raise RuntimeError("%s request failed: %s" % (name, ret))
+
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(rounds):
+        params = build()
+        t = time.perf_counter()
+        await send(params)
+        latencies.append(time.perf_counter() - t)
+    total = time.perf_counter() - start
+    # 与其他阶段相同，单独执行一次统计内存分配，不影响上面的延迟
+    params = build()
+    before = start_allocations()
+    await send(params)
+    return summarize(latencies, total, *stop_allocations(before))
+
+
+def run(rounds):
+    port, server = start_mock_server()
+    mock = MockServer()
+    results = {}
+
+    async def transport_all():
+        async with AsyncAPIClient(SECRET_ID, SECRET_KEY, BUSINESS_ID,
+                                  base_url="http://127.0.0.1:%d" % port) as client:
+            for case, name, build in PAYLOADS:
+                results[case]["transport"] = await measure_transport(client, name, build, rounds)
+
+    for case, name, build in PAYLOADS:
+        endpoint = get_endpoint(name)
+        business_id = BUSINESS_ID if endpoint.business else None
+        params = build()
+        signed = sign_params(dict(params), SECRET_ID, SECRET_KEY, endpoint.version, business_id)
+        # 与服务端收到的表单参数保持一致
+        form = dict(parse_qsl(urlencode(signed)))
+        body = json.dumps(mock.response(name, form, mock.config), ensure_ascii=False).encode("utf8")
+        results[case] = {
+            "endpoint": name,
+            "request_bytes": len(urlencode(signed)),
+            "response_bytes": len(body),
+            "sign": measure(lambda: sign_params(dict(params), SECRET_ID, SECRET_KEY, endpoint.version,
+                                                business_id), rounds),
+            "encode": measure(lambda: urlencode(signed).encode("utf8"), rounds),
+            "parse": measure(lambda: traverse(json.loads(body)), rounds),
+        }
+    asyncio.run(transport_all())
+    server.terminate()
+    return results
+
+
+def compare(base, current):
+    """打印与基线结果的对比，p50/p99变化超过10%的阶段标记为回归"""
+    print("%-26s %-10s %12s %12s %10s" % ("case", "stage", "base p50us", "p50us", "change"))
+    for case, stages in current["results"].items():
+        if case not in base["results"]:
+            continue
+        for stage in ("sign", "encode", "transport", "parse"):
+            old = base["results"][case][stage]["p50_us"]
+            new = stages[stage]["p50_us"]
+            change = (new - old) / old * 100 if old else 0.0
+            flag = " REGRESSION" if change > 10 else ""
+            print("%-26s %-10s %12.1f %12.1f %9.1f%%%s" % (case, stage, old, new, change, flag))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="易盾反垃圾云服务请求全流程性能基准测试")
+    parser.add_argument("--rounds", type=int, default=200, help="每个阶段的执行次数")
+    parser.add_argument("--output", help="结果保存路径，json格式")
+    parser.add_argument("--compare", help="对比的基线结果路径")
+    args = parser.parse_args()
+
+    report = {
+        "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "rounds": args.rounds,
+        "results": run(args.rounds),
+    }
+    print("%-26s %-10s %12s %10s %10s %12s" % ("case", "stage", "ops/s", "p50us", "p99us", "alloc(KB)"))
+    for case, stages in report["results"].items():
+        for stage in ("sign", "encode", "transport", "parse"):
+            r = stages[stage]
+            print("%-26s %-10s %12.0f %10.1f %10.1f %12.1f"
+                  % (case, stage, r["ops_per_sec"], r["p50_us"], r["p99_us"], r["alloc_bytes"] / 1024))
+    if args.output:
+        with open(args.output, "w", encoding="utf8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf8") as f:
+            compare(json.load(f), report)
@@ -0,0 +1,210 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+易盾反垃圾云服务asyncio客户端HTTP/1.1与HTTP/2传输对比
+在子进程中启动本地模拟服务的HTTP/1.1及HTTP/2(h2c)两个版本，以相同并发请求text_check、image_check，
+对比服务端建立的连接数、客户端进程CPU时间、p50/p99延迟及失败数；并验证http2=True访问HTTP/1.1服务时的自动回退
+失败按异常类型或返回码分别统计。单核机器上HTTP/2两端的h2均为纯python实现，高并发时部分请求的响应时间
+可能超过text_check 1秒的读超时，表现为TimeoutError，此时fail不为0
+依赖h2: pip install h2
+python版本：python3.7
+运行:
+    $ python -m benchmark.bench_http2 [请求总数] [并发数]
+"""
+__author__ = 'yidun-dev'
+__date__ = '2026/10/18'
+__version__ = '0.2-dev'
+
+import asyncio
+import collections
+import json
+import multiprocessing
+import sys
+import time
+
+import h2.config
+import h2.connection
+import h2.events
+import h2.exceptions
+
+from common.async_client import AsyncAPIClient
+from common.endpoints import get_endpoint
+from common.http_server import HttpServer, HttpRequest
+from common.mock_server import MockConfig, MockServer
+
+SECRET_ID = "bench_secret_id"
+SECRET_KEY = "bench_secret_key"
+BUSINESS_ID = "bench_business_id"
+
+
+class CountingHttpServer(HttpServer):
+    """统计连接数的HTTP/1.1服务"""
+
+    def __init__(self, handler, counter, backlog):
+        super(CountingHttpServer, self).__init__(handler, backlog=backlog)
+        self.counter = counter
+
+    async def _serve(self, reader, writer):
+        self.counter.value += 1
+        await super(CountingHttpServer, self)._serve(reader, writer)
+
+
+class H2Server(object):
+    """本地HTTP/2(h2c prior knowledge)服务，请求交给与HttpServer相同的handler处理"""
+
+    def __init__(self, handler, counter, backlog):
+        self.handler = handler
+        self.counter = counter
+        self.backlog = backlog
+        self.port = None
+
+    async def start(self, host="127.0.0.1", port=0):
+        server = await asyncio.start_server(self._serve, host, port, backlog=self.backlog)
+        self.port = server.sockets[0].getsockname()[1]
+        return self
+
+    async def _serve(self, reader, writer):
+        self.counter.value += 1
+        conn = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False, header_encoding="utf-8"))
+        conn.initiate_connection()
+        writer.write(conn.data_to_send())
+        streams = {}
+        window = asyncio.Event()
+        try:
+            while True:
+                data = await reader.read(64 << 10)
+                if not data:
+                    break
+                for event in conn.receive_data(data):
+                    if isinstance(event, h2.events.RequestReceived):
+                        streams[event.stream_id] = (dict(event.headers), [])
+                    elif isinstance(event, h2.events.DataReceived):
+                        if event.stream_id in streams:
+                            streams[event.stream_id][1].append(event.data)
+                        conn.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+                    elif isinstance(event, h2.events.StreamEnded):
+                        if event.stream_id in streams:
+                            asyncio.ensure_future(self._respond(conn, writer, window, event.stream_id,
+                                                                *streams.pop(event.stream_id)))
+                    elif isinstance(event, h2.events.StreamReset):
+                        # 客户端取消请求，唤醒等待发送窗口的响应，由其发现流已关闭后退出
+                        streams.pop(event.stream_id, None)
+                        window.set()
+                    elif isinstance(event, (h2.events.WindowUpdated, h2.events.RemoteSettingsChanged)):
+                        window.set()
+                writer.write(conn.data_to_send())
+        except (ConnectionError, h2.exceptions.H2Error):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, conn, writer, window, stream_id, headers, body):
+        path, _, query = headers[":path"].partition("?")
+        request = HttpRequest(headers[":method"], path, query,
+                              dict((k, v) for k, v in headers.items() if not k.startswith(":")), b"".join(body))
+        response = await self.handler(request)
+        try:
+            conn.send_headers(stream_id, [(":status", str(response.status)), ("content-type", response.content_type),
+                                          ("content-length", str(len(response.body)))])
+            data = response.body
+            while data:
+                size = min(conn.local_flow_control_window(stream_id), conn.max_outbound_frame_size, len(data))
+                if size <= 0:
+                    window.clear()
+                    writer.write(conn.data_to_send())
+                    await window.wait()
+                    continue
+                conn.send_data(stream_id, data[:size])
+                data = data[size:]
+            conn.end_stream(stream_id)
+        except (h2.exceptions.StreamClosedError, h2.exceptions.NoSuchStreamError):
+            # 客户端已重置该流，不再发送
+            pass
+        writer.write(conn.data_to_send())
+
+
+def serve(ports, h1_connections, h2_connections, backlog):
+    async def run():
+        mock = MockServer({SECRET_ID: SECRET_KEY}, MockConfig(latency=0.005, jitter=0.002))
+        h1 = await CountingHttpServer(mock.handle, h1_connections, backlog).start()
+        h2_server = await H2Server(mock.handle, h2_connections, backlog).start()
+        ports.put((h1.port, h2_server.port))
+        while True:
+            await asyncio.sleep(3600)
+
+    asyncio.run(run())
+
+
+def percentile(samples, p):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+async def run_case(port, http2, total, concurrency):
+    images = json.dumps([{"name": "image-%d" % i, "type": 1, "data": "http://xxx.xxx.com/%d.jpg" % i}
+                         for i in range(8)])
+    latencies = []
+    failures = collections.Counter()
+    remaining = iter(range(total))
+    async with AsyncAPIClient(SECRET_ID, SECRET_KEY, BUSINESS_ID, max_connections_per_host=concurrency,
+                              base_url="http://127.0.0.1:%d" % port, http2=http2) as client:
+
+        async def worker():
+            for i in remaining:
+                if i % 2:
+                    name, params = "text_check", {"dataId": "data-%d" % i, "content": "易盾测试内容！v5接口!"}
+                else:
+                    name, params = "image_check", {"images": images}
+                start = time.perf_counter()
+                try:
+                    ret = await client.request(get_endpoint(name), params)
+                except Exception as ex:
+                    failures[type(ex).__name__] += 1
+                else:
+                    if ret["code"] != 200:
+                        failures["code=%s" % ret["code"]] += 1
+                latencies.append(time.perf_counter() - start)
+
+        cpu = time.process_time()
+        start = time.perf_counter()
+        await asyncio.gather(*[worker() for _ in range(concurrency)])
+        elapsed = time.perf_counter() - start
+        cpu = time.process_time() - cpu
+        pool = next(iter(client._pools.values()))
+        protocol = "HTTP/2" if getattr(pool, "http2", False) else "HTTP/1.1"
+    return protocol, latencies, failures, elapsed, cpu
+
+
+def main(total, concurrency):
+    ports = multiprocessing.Queue()
+    h1_connections = multiprocessing.Value("i", 0)
+    h2_connections = multiprocessing.Value("i", 0)
+    # HTTP/1.1客户端会同时发起concurrency个连接，监听队列需容纳全部连接，避免连接超时影响对比
+    server = multiprocessing.Process(target=serve, args=(ports, h1_connections, h2_connections,
+                                                         max(128, concurrency * 2)), daemon=True)
+    server.start()
+    h1_port, h2_port = ports.get()
+    cases = [
+        ("HTTP/1.1", h1_port, False, h1_connections),
+        ("HTTP/2", h2_port, True, h2_connections),
+        ("HTTP/2 -> HTTP/1.1回退", h1_port, True, h1_connections),
+    ]
+    print("请求总数: %d, 并发数: %d" % (total, concurrency))
+    print("%-24s %-10s %8s %10s %10s %10s %10s %6s" % (
+        "transport", "protocol", "conns", "req/s", "cpu(ms)", "p50(ms)", "p99(ms)", "fail"))
+    details = []
+    for label, port, http2, counter in cases:
+        before = counter.value
+        protocol, latencies, failures, elapsed, cpu = asyncio.run(run_case(port, http2, total, concurrency))
+        print("%-24s %-10s %8d %10.0f %10.1f %10.2f %10.2f %6d" % (
+            label, protocol, counter.value - before, total / elapsed, cpu * 1000,
+            percentile(latencies, 0.5) * 1000, percentile(latencies, 0.99) * 1000, sum(failures.values())))
+        if failures:
+            details.append("%s: %s" % (label, ", ".join("%s x%d" % item for item in failures.most_common())))
+    for line in details:
+        print("失败明细 " + line)
+    server.terminate()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000, int(sys.argv[2]) if len(sys.argv) > 2 else 200)
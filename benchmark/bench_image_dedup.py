@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+易盾反垃圾云服务图片去重索引性能基准测试
+按千万级记录测试common.image_dedup.ImageDedupIndex:
+    build     在子进程中重建磁盘索引的耗时，即改为后台重建前add达到阈值时阻塞的时长
+    open      加载已重建索引的耗时
+    exact     按内容哈希查找的耗时(命中与未命中各半)
+    similar   按感知哈希查找近似图片的耗时(命中与未命中各半)
+    add       后台重建期间按固定速率写入时单次add的耗时
+python版本：python3.7
+运行:
+    $ python -m benchmark.bench_image_dedup
+    $ python -m benchmark.bench_image_dedup --entries 20000000 --rate 2000
+"""
+__author__ = 'yidun-dev'
+__date__ = '2026/10/18'
+__version__ = '0.2-dev'
+
+import argparse
+import multiprocessing
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from common.image_dedup import RECORD, ImageDedupIndex, _build_index
+
+CHUNK = 100000
+
+
+def generate(path, count, rnd):
+    """直接写入count条随机记录"""
+    with open(os.path.join(path, "records.bin"), "wb") as f:
+        for start in range(0, count, CHUNK):
+            f.write(b"".join(RECORD.pack(rnd.getrandbits(64), rnd.getrandbits(64) or 1, 0, 0, 0, 0)
+                             for _ in range(min(CHUNK, count - start))))
+
+
+def percentiles(samples):
+    """Returns: (p50, p99, 最大值)，单位毫秒"""
+    samples = sorted(samples)
+    return tuple(samples[min(len(samples) - 1, int(len(samples) * q))] * 1000 for q in (0.5, 0.99, 1.0))
+
+
+def timed(func, args):
+    """Returns: 每次调用的耗时，秒"""
+    samples = []
+    for arg in args:
+        start = time.perf_counter()
+        func(arg)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main(args):
+    rnd = random.Random(1)
+    path = tempfile.mkdtemp(prefix="bench_image_dedup_")
+    try:
+        generate(path, args.entries, rnd)
+        # 与后台重建相同，在子进程中构建
+        start = time.perf_counter()
+        builder = multiprocessing.Process(target=_build_index, args=(path, args.entries, 0))
+        builder.start()
+        builder.join()
+        build_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index = ImageDedupIndex(path, compact_threshold=args.threshold)
+        open_seconds = time.perf_counter() - start
+        records = [index.record(rnd.randrange(args.entries)) for _ in range(args.lookups)]
+        keys = [record[1] for record in records] + [rnd.getrandbits(64) for _ in records]
+        # 命中的查询与已有记录相差3位
+        phashes = [record[0] ^ (0b10010001 << rnd.randrange(56)) for record in records] + [
+            rnd.getrandbits(64) for _ in records]
+        exact = percentiles(timed(index.find_content, keys))
+        similar = percentiles(timed(lambda phash: index.find_similar(phash, args.max_distance), phashes))
+
+        # 写入threshold条后开始后台重建，按固定速率继续写入直到切换到新索引
+        samples, interval, generation = [], 1.0 / args.rate, index._generation
+        start = time.perf_counter()
+        while True:
+            began = time.perf_counter()
+            index.add(rnd.getrandbits(64), rnd.getrandbits(64) or 1, 0, 0, 0)
+            samples.append(time.perf_counter() - began)
+            if index._generation != generation:
+                break
+            time.sleep(max(0.0, interval - (time.perf_counter() - began)))
+        add_seconds = time.perf_counter() - start
+        add = percentiles(samples)
+        index.close()
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+    print("entries            %d" % args.entries)
+    print("build(s)           %.1f" % build_seconds)
+    print("open(s)            %.3f" % open_seconds)
+    print("%-18s %9s %9s %9s" % ("ms", "p50", "p99", "max"))
+    print("%-18s %9.3f %9.3f %9.3f" % (("exact",) + exact))
+    print("%-18s %9.3f %9.3f %9.3f" % (("similar",) + similar))
+    print("%-18s %9.3f %9.3f %9.3f" % (("add(compacting)",) + add))
+    print("add during compaction: %d adds in %.1fs" % (len(samples), add_seconds))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="图片去重索引性能基准测试")
+    parser.add_argument("--entries", type=int, default=10000000, help="索引记录条数")
+    parser.add_argument("--lookups", type=int, default=5000, help="命中与未命中的查找各多少次")
+    parser.add_argument("--max-distance", type=int, default=4, help="近似图片的最大海明距离")
+    parser.add_argument("--threshold", type=int, default=10000, help="增量索引达到该条数时开始后台重建")
+    parser.add_argument("--rate", type=float, default=1000, help="后台重建期间每秒add次数")
+    main(parser.parse_args())
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+易盾反垃圾云服务JSON编解码性能基准测试
+对比原有json.dumps/json.loads与common.json_codec标准库、orjson实现在典型大payload下的耗时，
+并校验两种实现编码结果逐字节一致(参与签名)
+python版本：python3.7
+运行:
+    $ python -m benchmark.bench_json
+"""
+__author__ = 'yidun-dev'
+__date__ = '2026/10/18'
+__version__ = '0.2-dev'
+
+import base64
+import json
+import os
+import time
+
+from common import json_codec
+
+
+def texts(count):
+    """文本批量检测texts参数"""
+    return [{"dataId": "data-%d" % i, "content": "易盾批量检测接口！v5接口! %d" % i} for i in range(count)]
+
+
+def images(count, size):
+    """图片检测images参数，base64图片"""
+    return [{"name": "image-%d" % i, "type": 2, "data": base64.b64encode(os.urandom(size)).decode()}
+            for i in range(count)]
+
+
+def solution_content(count):
+    """融媒体、数字阅读、投诉举报解决方案content参数"""
+    return {
+        "texts": [{"dataId": "text-%d" % i, "content": "易盾测试内容" * 20} for i in range(count)],
+        "images": [{"dataId": "image-%d" % i, "url": "https://nos.netease.com/yidun/%d.jpg" % i}
+                   for i in range(count)],
+        "audios": [{"dataId": "audio-%d" % i, "url": "https://nos.netease.com/yidun/%d.mp3" % i}
+                   for i in range(count)],
+    }
+
+
+def callback_response(count):
+    """视频回调响应"""
+    labels = [{"label": 100, "level": 2, "rate": 0.9987,
+               "subLabels": [{"subLabel": "100001", "details": {"hitInfos": [{"value": "易盾测试"}]}}]}]
+    return {"code": 200, "msg": "ok", "result": [{"antispam": {
+        "taskId": "fx6sxdcd89fvbvg4967b4o3k00009vq5", "status": 0, "suggestion": 2,
+        "pictures": [{"type": 1, "url": "https://nos.netease.com/yidun/%d.jpg" % i, "startTime": i * 1000,
+                      "endTime": i * 1000 + 999, "labels": labels} for i in range(count)]}}]}
+
+
+# (名称, 请求参数对象)
+ENCODE_CASES = [
+    ("text_batch_check texts x100", texts(100)),
+    ("text_batch_check texts x1000", texts(1000)),
+    ("image_check base64 4x256KB", images(4, 256 << 10)),
+    ("image_check base64 1x4MB", images(1, 4 << 20)),
+    ("mediasolution content x50", solution_content(50)),
+    ("digital/report content x500", solution_content(500)),
+]
+DECODE_CASES = [
+    ("video_callback 1k pictures", callback_response(1000)),
+    ("video_callback 20k pictures", callback_response(20000)),
+]
+
+
+def measure(func, arg):
+    """Returns: 单次耗时ms"""
+    rounds = 3
+    while True:
+        start = time.perf_counter()
+        for _ in range(rounds):
+            func(arg)
+        elapsed = time.perf_counter() - start
+        if elapsed >= 0.2 or rounds >= 10000:
+            return elapsed * 1000 / rounds
+        rounds *= 4
+
+
+def with_backend(name, func):
+    def run(arg):
+        json_codec.set_backend(name)
+        return func(arg)
+    return run
+
+
+def main():
+    backends = ["json"] + (["orjson"] if json_codec.orjson is not None else [])
+    print("encode (ms)")
+    print("%-32s %10s %12s %12s %12s" % ("case", "size(KB)", "json.dumps", "codec/json", "codec/orjson"))
+    for case, obj in ENCODE_CASES:
+        outputs = [with_backend(name, json_codec.dumps)(obj) for name in backends]
+        assert len(set(outputs)) == 1, "codec output differs between backends: %s" % case
+        timings = [measure(json.dumps, obj)] + [measure(with_backend(name, json_codec.dumps), obj)
+                                                for name in backends]
+        print("%-32s %10d %12.3f %12.3f %12s" % (case, len(outputs[0].encode("utf8")) >> 10, timings[0], timings[1],
+                                                 "%.3f" % timings[2] if len(timings) > 2 else "-"))
+    print("\ndecode (ms)")
+    print("%-32s %10s %12s %12s %12s" % ("case", "size(KB)", "json.loads", "codec/json", "codec/orjson"))
+    for case, obj in DECODE_CASES:
+        raw = json.dumps(obj, ensure_ascii=False).encode("utf8")
+        timings = [measure(json.loads, raw)] + [measure(with_backend(name, json_codec.loads), raw)
+                                                for name in backends]
+        print("%-32s %10d %12.3f %12.3f %12s" % (case, len(raw) >> 10, timings[0], timings[1],
+                                                 "%.3f" % timings[2] if len(timings) > 2 else "-"))
+    json_codec.set_backend(backends[-1])
+
+
+if __name__ == "__main__":
+    main()
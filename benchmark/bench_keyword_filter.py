@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+易盾反垃圾云服务自定义敏感词本地预过滤性能基准测试
+按不同词表规模构建common.keyword_filter.KeywordFilter，对比每秒处理的消息数:
+    local       只做本地匹配
+    remote      全部请求本地模拟服务(common.mock_server)的/v5/text/check
+    prefiltered 先本地匹配，未命中时再请求模拟服务
+模拟服务在本机回环，不含公网往返耗时，remote为实际接口的上限，可通过--latency模拟网络延迟
+python版本：python3.7
+运行:
+    $ python -m benchmark.bench_keyword_filter
+    $ python -m benchmark.bench_keyword_filter --latency 0.02
+"""
+__author__ = 'yidun-dev'
+__date__ = '2026/10/18'
+__version__ = '0.2-dev'
+
+import argparse
+import asyncio
+import random
+import threading
+import time
+
+from common.client import APIClient
+from common.keyword_filter import KeywordFilter
+from common.mock_server import MockConfig, MockServer
+
+SECRET_ID = "bench_secret_id"
+SECRET_KEY = "bench_secret_key"
+BUSINESS_ID = "bench_business_id"
+CHARS = "易盾测试内容敏感词广告色情违禁涉政谩骂灌水网站链接加微信免费领取优惠活动abcdefghijklmnopqrstuvwxyz0123456789"
+KEYWORD_COUNTS = (1000, 10000, 100000)
+
+
+def build_filter(rnd, count):
+    """Returns: (KeywordFilter, 敏感词列表)"""
+    query = _StaticQuery(rnd, count)
+    keyword_filter = KeywordFilter()
+    keyword_filter.load(query, categories=["100"], page_size=1000)
+    return keyword_filter, query.words
+
+
+class _StaticQuery(object):
+    """按keyword/query响应格式分页返回随机敏感词"""
+
+    def __init__(self, rnd, count):
+        self.words = ["".join(rnd.choice(CHARS) for _ in range(rnd.randint(4, 8))) for _ in range(count)]
+
+    def check(self, params):
+        page, size = int(params["pageNum"]), int(params["pageSize"])
+        rows = [{"id": i, "word": word, "category": 100}
+                for i, word in enumerate(self.words[(page - 1) * size:page * size], (page - 1) * size)]
+        return {"code": 200, "msg": "ok", "result": {"words": {"count": len(self.words), "rows": rows}}}
+
+
+def messages(rnd, words, count, hit_rate, length=50):
+    ret = []
+    for _ in range(count):
+        content = "".join(rnd.choice(CHARS) for _ in range(length))
+        if rnd.random() < hit_rate:
+            pos = rnd.randint(0, length)
+            content = content[:pos] + rnd.choice(words) + content[pos:]
+        ret.append(content)
+    return ret
+
+
+def start_mock_server(latency):
+    """在后台线程中启动模拟服务，Returns: 端口"""
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+    state = {}
+
+    def run():
+        asyncio.set_event_loop(loop)
+        server = MockServer({SECRET_ID: SECRET_KEY}, MockConfig(latency=latency))
+        state["port"] = loop.run_until_complete(server.start())
+        started.set()
+        loop.run_forever()
+
+    threading.Thread(target=run, daemon=True).start()
+    started.wait()
+    return state["port"]
+
+
+def throughput(func, contents):
+    """Returns: (每秒消息数, p99耗时us)"""
+    latencies = []
+    start = time.perf_counter()
+    for content in contents:
+        t = time.perf_counter()
+        func(content)
+        latencies.append(time.perf_counter() - t)
+    total = time.perf_counter() - start
+    latencies.sort()
+    return len(contents) / total, latencies[int(len(latencies) * 0.99)] * 1e6
+
+
+def main(args):
+    rnd = random.Random(1)
+    client = APIClient(SECRET_ID, SECRET_KEY, BUSINESS_ID, base_url="http://127.0.0.1:%d" % start_mock_server(
+        args.latency))
+    text_check = client.text_check
+
+    def remote(content):
+        ret = text_check.check({"dataId": "bench", "content": content})
+        if ret is None or ret["code"] != 200:
+            raise RuntimeError("text_check failed: %s" % ret)
+
+    print("%-9s %9s %9s %13s %11s %12s %15s" % ("keywords", "build(s)", "hit_rate", "local(msg/s)", "local_p99",
+                                               "remote(msg/s)", "prefiltered(msg/s)"))
+    for count in KEYWORD_COUNTS:
+        start = time.perf_counter()
+        keyword_filter, words = build_filter(rnd, count)
+        build_seconds = time.perf_counter() - start
+        contents = messages(rnd, words, args.messages, args.hit_rate)
+        local_rate, local_p99 = throughput(keyword_filter.match, contents)
+        remote_contents = contents[:args.remote_messages]
+        remote_rate, _ = throughput(remote, remote_contents)
+        prefiltered = keyword_filter.wrap(client.text_check)
+        prefiltered_rate, _ = throughput(lambda content: prefiltered.check({"dataId": "bench", "content": content}),
+                                         remote_contents)
+        hit_rate = sum(1 for content in contents if keyword_filter.match(content)) / float(len(contents))
+        print("%-9d %9.2f %9.2f %13.0f %9.1fus %12.0f %15.0f" % (count, build_seconds, hit_rate, local_rate, local_p99,
+                                                              remote_rate, prefiltered_rate))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="自定义敏感词本地预过滤性能基准测试")
+    parser.add_argument("--messages", type=int, default=50000, help="本地匹配的消息数")
+    parser.add_argument("--remote-messages", type=int, default=2000, help="请求模拟服务的消息数")
+    parser.add_argument("--hit-rate", type=float, default=0.2, help="插入敏感词的消息比例")
+    parser.add_argument("--latency", type=float, default=0.0, help="模拟服务固定延迟，秒")
+    main(parser.parse_args())
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+易盾反垃圾云服务名单本地镜像性能基准测试
+按不同名单规模测试common.list_mirror.ListMirror:
+    sync      通过模拟的list/pageQuery全量同步耗时
+    restart   从快照和变更日志重新加载耗时
+    lookup    单核每秒判断次数，分别为用户名单、IP精确匹配及含CIDR网段的IP名单
+    memory    每条名单占用的内存(tracemalloc)
+模拟查询不含网络耗时，实际全量同步耗时远高于sync，restart为重启后无需重新同步节省的时间
+python版本：python3.7
+运行:
+    $ python -m benchmark.bench_list_mirror
+"""
+__author__ = 'yidun-dev'
+__date__ = '2026/10/18'
+__version__ = '0.2-dev'
+
+import argparse
+import asyncio
+import random
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+from common.list_mirror import ENTITY_IP, ENTITY_USER, LIST_BLACK, ListMirror
+
+ENTRY_COUNTS = (10000, 100000, 1000000)
+NETWORKS = ("10.0.0.0/8", "172.16.0.0/12", "192.168.0.0/16", "100.64.0.0/10", "2001:db8::/32")
+
+
+class _StaticQuery(object):
+    """按list/pageQuery响应格式分页返回随机名单"""
+
+    def __init__(self, rnd, count):
+        now = int(time.time() * 1000) - 1000
+        self.rows = {
+            ENTITY_USER: [{"entity": "user_%016x" % rnd.getrandbits(64), "releaseTime": now - i}
+                          for i in range(count)],
+            ENTITY_IP: [{"entity": "%d.%d.%d.%d" % tuple(rnd.randint(1, 254) for _ in range(4)), "releaseTime": now}
+                        for _ in range(count)] + [{"entity": network, "releaseTime": now} for network in NETWORKS],
+        }
+
+    async def request(self, endpoint, params):
+        page, size = int(params["pageNum"]), int(params["pageSize"])
+        rows = [row for row in self.rows[params["entityType"]]
+                if params["startTime"] <= row["releaseTime"] <= params["endTime"]]
+        return {"code": 200, "msg": "ok", "result": {"count": len(rows), "rows": rows[(page - 1) * size:page * size]}}
+
+
+def lookups(func, keys, repeat):
+    """Returns: 每秒判断次数"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for key in keys:
+            func(key)
+    return len(keys) * repeat / (time.perf_counter() - start)
+
+
+def main(args):
+    rnd = random.Random(1)
+    print("%-9s %9s %11s %14s %14s %14s %11s" % ("entries", "sync(s)", "restart(s)", "user(/s)", "ip(/s)",
+                                                 "ip_cidr(/s)", "bytes/entry"))
+    for count in ENTRY_COUNTS:
+        path = tempfile.mkdtemp(prefix="bench_list_mirror_")
+        try:
+            query = _StaticQuery(rnd, count)
+            mirror = ListMirror(path)
+            start = time.perf_counter()
+            # 模拟查询按时间过滤需遍历全部名单，使用最大页大小减少请求次数
+            asyncio.run(mirror.full_sync(query, windows=1, page_size=max(1000, count // 10),
+                                         max_page_size=max(1000, count // 10)))
+            sync_seconds = time.perf_counter() - start
+            mirror.close()
+
+            start = time.perf_counter()
+            ListMirror(path).close()
+            restart_seconds = time.perf_counter() - start
+            # tracemalloc会使加载明显变慢，单独加载一次统计内存
+            tracemalloc.start()
+            mirror = ListMirror(path)
+            memory = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+
+            users = [row["entity"] for row in rnd.sample(query.rows[ENTITY_USER], 1000)] + [
+                "user_%016x" % rnd.getrandbits(64) for _ in range(1000)]
+            ips = [row["entity"] for row in rnd.sample(query.rows[ENTITY_IP][:count], 1000)] + [
+                "%d.%d.%d.%d" % tuple(rnd.randint(1, 254) for _ in range(4)) for _ in range(1000)]
+            user_rate = lookups(mirror.contains, users, args.repeat)
+            ip_cidr_rate = lookups(lambda ip: mirror.contains(ip, ENTITY_IP), ips, args.repeat)
+            for network in NETWORKS:
+                mirror.remove(LIST_BLACK, ENTITY_IP, network)
+            ip_rate = lookups(lambda ip: mirror.contains(ip, ENTITY_IP), ips, args.repeat)
+            mirror.close()
+            print("%-9d %9.2f %11.3f %14.0f %14.0f %14.0f %11.0f" % (
+                count, sync_seconds, restart_seconds, user_rate, ip_rate, ip_cidr_rate, memory / (2.0 * count)))
+        finally:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="名单本地镜像性能基准测试")
+    parser.add_argument("--repeat", type=int, default=500, help="每个名单判断的轮数，每轮2000次")
+    main(parser.parse_args())
@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+易盾反垃圾云服务响应解析性能基准测试
+对比json.loads整体解析与common.responses按需解析在视频、音频回调及图片OCR大响应下的耗时和内存:
+    top  只读取code、taskId、suggestion等顶层字段
+    full 遍历全部segments/pictures/details及其中的分类
+retained为解析结果在只读取顶层字段后仍占用的内存
+python版本：python3.7
+运行:
+    $ python -m benchmark.bench_responses
+"""
+__author__ = 'yidun-dev'
+__date__ = '2026/10/18'
+__version__ = '0.2-dev'
+
+import gc
+import json
+import time
+import tracemalloc
+
+from common.responses import parse
+
+LABELS = [{"label": 100, "level": 2, "rate": 0.9987,
+           "subLabels": [{"subLabel": "100001", "details": {"hitInfos": [{"value": "易盾测试", "positions": []}]}}]}]
+
+
+def video_callback(count):
+    pictures = [{"type": 1, "url": "https://nos.netease.com/yidun/2-0-0-%032d.jpg" % i, "startTime": i * 1000,
+                 "endTime": i * 1000 + 999, "labels": LABELS} for i in range(count)]
+    return {"code": 200, "msg": "ok", "result": [{"antispam": {
+        "taskId": "fx6sxdcd89fvbvg4967b4o3k00009vq5", "status": 0, "suggestion": 2, "callback": "{}",
+        "pictures": pictures}}]}
+
+
+def audio_callback(count):
+    segments = [{"startTime": i * 5, "endTime": i * 5 + 5, "type": 0, "content": "易盾测试内容%d" % i,
+                 "labels": LABELS} for i in range(count)]
+    return {"code": 200, "msg": "ok", "result": [{"antispam": {
+        "taskId": "3d5b2a2e9a1b4a0c8a8d0f8d3c1b9e7f", "dataId": "audio-1", "status": 2, "suggestion": 1,
+        "resultType": 1, "segments": segments}}]}
+
+
+def image_ocr(count):
+    details = [{"content": "易盾测试内容%d" % i, "lineContents": [
+        {"lineContent": "易盾测试内容%d-%d" % (i, j), "polygon": [0, 0, 100, 0, 100, 20, 0, 20]} for j in range(8)]}
+        for i in range(count)]
+    return {"code": 200, "msg": "ok", "result": [{
+        "antispam": {"name": "bench", "taskId": "img-1", "status": 2, "suggestion": 0, "labels": []},
+        "ocr": {"name": "bench", "taskId": "img-1", "details": details}}]}
+
+
+# (名称, 接口名称, 构造函数, 元素个数, 大数组字段)
+CASES = [
+    ("video_callback", "video_callback", video_callback, 20000, "pictures"),
+    ("audio_callback", "audio_callback", audio_callback, 20000, "segments"),
+    ("image_ocr", "image_check", image_ocr, 5000, None),
+]
+
+
+def dict_top(raw, field):
+    ret = json.loads(raw)
+    antispam = ret["result"][0]["antispam"]
+    return ret, (ret["code"], antispam["taskId"], antispam["suggestion"])
+
+
+def lazy_top(raw, name):
+    ret = parse(raw, name)
+    antispam = ret.result[0].antispam
+    return ret, (ret.code, antispam.task_id, antispam.suggestion)
+
+
+def dict_full(raw, field):
+    ret = json.loads(raw)
+    count = 0
+    for result in ret["result"]:
+        items = result["antispam"][field] if field else result["ocr"]["details"]
+        for item in items:
+            count += len(item["labels"]) if field else len(item["lineContents"])
+    return ret, count
+
+
+def lazy_full(raw, name):
+    ret = parse(raw, name)
+    count = 0
+    for result in ret.result:
+        if name == "image_check":
+            for detail in result.ocr.details:
+                count += len(detail["lineContents"])
+        else:
+            antispam = result.antispam
+            for item in (antispam.pictures if name == "video_callback" else antispam.segments):
+                count += len(item.labels)
+    return ret, count
+
+
+def measure(func, raw, arg, rounds):
+    """Returns: (结果, 单次耗时ms, 内存峰值KB, 保留内存KB)"""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func(raw, arg)
+    elapsed = (time.perf_counter() - start) * 1000 / rounds
+    gc.collect()
+    tracemalloc.start()
+    ret, value = func(raw, arg)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del ret
+    return value, elapsed, peak / 1024, retained / 1024
+
+
+def main(rounds=5):
+    print("%-16s %-5s %9s %11s %11s %12s %12s %13s %13s"
+          % ("case", "mode", "size(KB)", "dict(ms)", "lazy(ms)", "dict_peak", "lazy_peak", "dict_retain", "lazy_retain"))
+    for case, name, build, count, field in CASES:
+        raw = json.dumps(build(count), ensure_ascii=False).encode("utf8")
+        for mode, dict_func, lazy_func in (("top", dict_top, lazy_top), ("full", dict_full, lazy_full)):
+            dict_value, dict_ms, dict_peak, dict_retained = measure(dict_func, raw, field, rounds)
+            lazy_value, lazy_ms, lazy_peak, lazy_retained = measure(lazy_func, raw, name, rounds)
+            assert dict_value == lazy_value
+            print("%-16s %-5s %9d %11.2f %11.2f %12.1f %12.1f %13.1f %13.1f"
+                  % (case, mode, len(raw) >> 10, dict_ms, lazy_ms, dict_peak, lazy_peak, dict_retained, lazy_retained))
+
+
+if __name__ == "__main__":
+    main()
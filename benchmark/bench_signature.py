@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+易盾反垃圾云服务签名性能基准测试
+对比原有拼接字符串签名与流式签名在不同图片payload大小下的单次请求CPU耗时和内存峰值
+python版本：python3.7
+运行:
+    $ python -m benchmark.bench_signature
+"""
+__author__ = 'yidun-dev'
+__date__ = '2026/10/18'
+__version__ = '0.2-dev'
+
+import base64
+import hashlib
+import json
+import os
+import time
+import tracemalloc
+
+from common.signature import gen_signature
+
+SECRET_KEY = "your_secret_key"
+PAYLOAD_SIZES = [1 << 10, 64 << 10, 1 << 20, 4 << 20, 8 << 20]
+
+
+def legacy_gen_signature(secret_key, params):
+    """原有示例代码中的签名实现"""
+    buff = ""
+    for k in sorted(params.keys()):
+        buff += str(k) + str(params[k])
+    buff += secret_key
+    return hashlib.md5(buff.encode("utf8")).hexdigest()
+
+
+def build_params(size):
+    """构造包含一张base64图片的图片检测请求参数"""
+    images = [{"name": "bench", "type": 2, "data": base64.b64encode(os.urandom(size)).decode()}]
+    return {
+        "images": json.dumps(images),
+        "secretId": "your_secret_id",
+        "businessId": "your_business_id",
+        "version": "v5.1",
+        "timestamp": int(time.time() * 1000),
+        "nonce": 12345678,
+    }
+
+
+def measure(func, params, rounds):
+    """Returns: (单次CPU耗时ms, 内存峰值KB)"""
+    start = time.process_time()
+    for _ in range(rounds):
+        func(SECRET_KEY, params)
+    cpu_ms = (time.process_time() - start) * 1000 / rounds
+    tracemalloc.start()
+    func(SECRET_KEY, params)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return cpu_ms, peak / 1024
+
+
+if __name__ == "__main__":
+    print("%10s %12s %12s %14s %14s" % ("payload", "legacy(ms)", "stream(ms)", "legacy(KB)", "stream(KB)"))
+    for size in PAYLOAD_SIZES:
+        params = build_params(size)
+        assert legacy_gen_signature(SECRET_KEY, params) == gen_signature(SECRET_KEY, params)
+        rounds = max(3, (32 << 20) // (size * 4))
+        legacy_cpu, legacy_peak = measure(legacy_gen_signature, params, rounds)
+        stream_cpu, stream_peak = measure(gen_signature, params, rounds)
+        print("%9dK %12.3f %12.3f %14.1f %14.1f"
+              % (size >> 10, legacy_cpu, stream_cpu, legacy_peak, stream_peak))
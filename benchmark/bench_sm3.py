@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+易盾反垃圾云服务SM3签名实现性能基准测试
+对比gmssl与common.sm3各可用实现在1KB~10MB输入下的吞吐
+python版本：python3.7
+运行:
+    $ python -m benchmark.bench_sm3          # gmssl与纯python实现仅测试1MB以内
+    $ python -m benchmark.bench_sm3 --full   # 全部实现测试全部大小，耗时较长
+"""
+__author__ = 'yidun-dev'
+__date__ = '2026/10/18'
+__version__ = '0.2-dev'
+
+import os
+import sys
+import time
+
+from common import sm3
+
+INPUT_SIZES = [1 << 10, 16 << 10, 256 << 10, 1 << 20, 10 << 20]
+SLOW_ENGINE_LIMIT = 1 << 20
+
+
+def gmssl_hash(data):
+    from gmssl import sm3 as gmssl_sm3, func
+    return gmssl_sm3.sm3_hash(func.bytes_to_list(data))
+
+
+def engine_hash(name):
+    def run(data):
+        sm3.set_engine(name)
+        return sm3.sm3_hash(data)
+    return run
+
+
+def measure(func, data):
+    """Returns: (摘要, 耗时秒)"""
+    rounds = max(1, (256 << 10) // len(data))
+    start = time.perf_counter()
+    for _ in range(rounds):
+        digest = func(data)
+    return digest, (time.perf_counter() - start) / rounds
+
+
+if __name__ == "__main__":
+    full = "--full" in sys.argv
+    candidates = [("gmssl", gmssl_hash)] + [(name, engine_hash(name)) for name in sm3.available_engines()]
+    print("%10s %10s %12s %12s" % ("input", "engine", "time(ms)", "MB/s"))
+    for size in INPUT_SIZES:
+        data = os.urandom(size)
+        expected = None
+        for name, func in candidates:
+            if name in ("gmssl", "python") and size > SLOW_ENGINE_LIMIT and not full:
+                continue
+            digest, seconds = measure(func, data)
+            expected = expected or digest
+            assert digest == expected, "%s digest mismatch" % name
+            print("%9dK %10s %12.3f %12.2f" % (size >> 10, name, seconds * 1000, size / seconds / (1 << 20)))
+    sm3.set_engine()
@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+"""
+易盾反垃圾云服务python示例代码公共组件
+"""
@@ -0,0 +1,370 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+易盾反垃圾云服务asyncio异步客户端
+支持common.endpoints中的全部接口，签名和参数编码方式与各示例代码一致
+    1. 每个host维护keep-alive连接池，通过信号量限制单host并发连接数
+    2. 连接超时、读超时分别控制，请求超时或被取消时关闭对应连接，不会把状态不确定的连接放回连接池
+    3. http2=True时使用common.h2_transport在少量连接上多路复用，服务端不支持时自动回退为HTTP/1.1
+    4. 设置timeouts时按common.timeouts根据接口最近耗时及请求体大小计算读超时
+    5. 设置rate_limiter时按common.rate_limit限流，等待令牌后再签名，保证timestamp为实际发出时间
+    6. lazy_responses=True时返回common.responses中按需解析的响应模型，而不是json_codec.loads得到的dict
+python版本：python3.7
+运行:
+    1. 修改 SECRET_ID,SECRET_KEY,BUSINESS_ID 为对应申请到的值
+    2. $ python -m common.async_client
+"""
+__author__ = 'yidun-dev'
+__date__ = '2026/10/18'
+__version__ = '0.2-dev'
+
+import asyncio
+import collections
+import ssl
+import time
+from urllib.parse import urlencode, urlsplit
+
+from common import json_codec
+from common.endpoints import get_endpoint, endpoint_host
+from common.image_stream import form_body_size, is_streaming, iter_form_body
+from common.responses import parse as parse_response
+from common.signature import sign_params
+
+
+class ConnectError(ConnectionError):
+    """建立连接失败，请求尚未发出"""
+
+
+class ResponseDecodeError(ValueError):
+    """响应体无法按json解析"""
+
+
+class HttpStatusError(Exception):
+    """服务端返回HTTP 5xx"""
+
+    def __init__(self, status, data):
+        super(HttpStatusError, self).__init__("HTTP %d" % status)
+        self.status = status
+        self.data = data
+
+
+async def open_connection(host, port, ssl_context, connect_timeout):
+    """建立连接，失败或超时时抛出ConnectError"""
+    try:
+        return await asyncio.wait_for(asyncio.open_connection(host, port, ssl=ssl_context), connect_timeout)
+    except (OSError, asyncio.TimeoutError) as ex:
+        raise ConnectError("connect to %s:%s failed: %s" % (host, port, str(ex) or type(ex).__name__)) from ex
+
+
+class HttpResponse(object):
+    """HTTP响应"""
+
+    __slots__ = ("status", "headers", "data")
+
+    def __init__(self, status, headers, data):
+        self.status = status
+        self.headers = headers
+        self.data = data
+
+
+class AsyncConnectionPool(object):
+    """单个host的keep-alive连接池"""
+
+    def __init__(self, scheme, host, port, max_connections=64):
+        """
+        Args:
+            scheme (str) http或https
+            host (str) 主机名
+            port (int) 端口
+            max_connections (int) 最大并发连接数，超出时请求排队等待
+        """
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.max_connections = max_connections
+        self._semaphore = asyncio.Semaphore(max_connections)
+        self._idle = collections.deque()
+        self._ssl = ssl.create_default_context() if scheme == "https" else None
+
+    @property
+    def in_use(self):
+        """当前正在使用的连接数"""
+        return self.max_connections - self._semaphore._value
+
+    @property
+    def idle(self):
+        """当前空闲的连接数"""
+        return len(self._idle)
+
+    async def _acquire(self, connect_timeout):
+        while self._idle:
+            reader, writer = self._idle.pop()
+            if not reader.at_eof() and not writer.is_closing():
+                return reader, writer
+            writer.close()
+        return await open_connection(self.host, self.port, self._ssl, connect_timeout)
+
+    async def request(self, method, path, body, headers, timeout):
+        """发送请求
+        Args:
+            method (str) 请求方法
+            path (str) 请求路径
+            body (bytes|iterable) 请求体，bytes生成器时使用chunked方式逐块发送
+            headers (dict) 请求头
+            timeout (tuple) (连接超时, 读超时)秒
+        Returns:
+            HttpResponse
+        """
+        async with self._semaphore:
+            reader, writer = await self._acquire(timeout[0])
+            try:
+                chunked = not isinstance(body, (bytes, bytearray))
+                head = ["%s %s HTTP/1.1" % (method, path), "Host: %s" % self.host, "Connection: keep-alive",
+                        "Transfer-Encoding: chunked" if chunked else "Content-Length: %d" % len(body)]
+                head.extend("%s: %s" % item for item in headers.items())
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1"))
+                if chunked:
+                    await asyncio.wait_for(self._write_chunked(writer, body), timeout[1])
+                else:
+                    writer.write(body)
+                response, keep_alive = await asyncio.wait_for(self._read_response(reader, writer), timeout[1])
+            except BaseException:
+                # 超时、取消或异常时连接状态不确定，直接关闭
+                writer.close()
+                raise
+            if keep_alive:
+                self._idle.append((reader, writer))
+            else:
+                writer.close()
+            return response
+
+    @staticmethod
+    async def _write_chunked(writer, body):
+        for chunk in body:
+            if chunk:
+                writer.write(b"%x\r\n" % len(chunk))
+                writer.write(chunk)
+                writer.write(b"\r\n")
+                # 等待发送缓冲区排空，避免整个请求体堆积在内存中
+                await writer.drain()
+        writer.write(b"0\r\n\r\n")
+
+    @staticmethod
+    async def _read_response(reader, writer):
+        await writer.drain()
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError("connection closed by server")
+        version, status = status_line.split(None, 2)[:2]
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            data = b"".join(chunks)
+        elif "content-length" in headers:
+            data = await reader.readexactly(int(headers["content-length"]))
+        else:
+            data = await reader.read()
+            return HttpResponse(int(status), headers, data), False
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" and (version != b"HTTP/1.0" or connection == "keep-alive")
+        return HttpResponse(int(status), headers, data), keep_alive
+
+    def close(self):
+        """关闭全部空闲连接"""
+        while self._idle:
+            self._idle.pop()[1].close()
+
+
+class AsyncAPIClient(object):
+    """易盾反垃圾云服务异步客户端"""
+
+    def __init__(self, secret_id, secret_key, business_id=None, max_connections_per_host=64,
+                 signature_method=None, base_url=None, http2=False, max_streams_per_connection=100, timeouts=None,
+                 rate_limiter=None, lazy_responses=False):
+        """
+        Args:
+            secret_id (str) 产品密钥ID，产品标识
+            secret_key (str) 产品私有密钥，服务端生成签名信息使用
+            business_id (str) 业务ID，易盾根据产品业务特点分配，解决方案类接口无需设置
+            max_connections_per_host (int) 单host最大并发连接数
+            signature_method (str) 签名方法，默认MD5，支持SM3
+            base_url (str) 替换全部接口的协议和host，如本地模拟服务http://127.0.0.1:8080
+            http2 (bool) 是否使用HTTP/2，需要安装h2
+            max_streams_per_connection (int) HTTP/2单连接最大并发stream数
+            timeouts (TimeoutController) 自适应超时控制，未设置时使用接口配置的固定超时
+            rate_limiter (RateLimiter) 按(secretId, businessId, 接口地址)限流，未设置时不限流
+            lazy_responses (bool) 是否返回按需解析的响应模型，适用于视频、音频回调等较大的响应
+        """
+        self.secret_id = secret_id
+        self.secret_key = secret_key
+        self.business_id = business_id
+        self.max_connections_per_host = max_connections_per_host
+        self.signature_method = signature_method
+        self.base_url = base_url
+        self.http2 = http2
+        self.max_streams_per_connection = max_streams_per_connection
+        self.timeouts = timeouts
+        self.rate_limiter = rate_limiter
+        self.lazy_responses = lazy_responses
+        self._pools = {}
+
+    def pool(self, scheme, host, port):
+        """获取host对应的连接池，需要在事件循环中调用"""
+        key = (scheme, host, port)
+        pool = self._pools.get(key)
+        if pool is None:
+            if self.http2:
+                from common.h2_transport import H2ConnectionPool
+                # HTTP/2连接数按并发上限折算，回退为HTTP/1.1时仍按max_connections_per_host限制
+                max_connections = -(-self.max_connections_per_host // self.max_streams_per_connection)
+                pool = H2ConnectionPool(scheme, host, port, max_connections, self.max_streams_per_connection,
+                                        self.max_connections_per_host)
+            else:
+                pool = AsyncConnectionPool(scheme, host, port, self.max_connections_per_host)
+            self._pools[key] = pool
+        return pool
+
+    def endpoint(self, name):
+        """获取绑定到本客户端的接口
+        Args:
+            name (str) 接口名称，如text_check
+        Returns:
+            AsyncEndpoint
+        """
+        return AsyncEndpoint(self, get_endpoint(name))
+
+    async def request(self, endpoint, params, timeout=None):
+        """签名并发送请求，请求失败时抛出异常
+        Args:
+            endpoint (Endpoint) 接口描述
+            params (dict) 请求参数
+            timeout (tuple) (连接超时, 读超时)秒，默认使用接口配置
+        Returns:
+            请求结果，json格式，lazy_responses=True时为common.responses.Response
+        """
+        business_id = self.business_id if endpoint.business else None
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire_async(self.secret_id, business_id, endpoint.url)
+        sign_params(params, self.secret_id, self.secret_key, endpoint.version, business_id, self.signature_method)
+        if any(is_streaming(value) for value in params.values()):
+            encoded_params = iter_form_body(params)
+            payload_bytes = form_body_size(params)
+        else:
+            encoded_params = urlencode(params).encode("utf8")
+            payload_bytes = len(encoded_params)
+        if self.base_url:
+            endpoint = endpoint._replace(url=self.base_url.rstrip("/") + urlsplit(endpoint.url).path)
+        if timeout is None and self.timeouts is not None:
+            timeout = self.timeouts.timeout(endpoint.url, endpoint.timeout, payload_bytes)
+        start = time.perf_counter()
+        try:
+            response = await self.pool(*endpoint_host(endpoint)).request(
+                "POST",
+                urlsplit(endpoint.url).path,
+                encoded_params,
+                {"Content-Type": "application/x-www-form-urlencoded"},
+                timeout or endpoint.timeout
+            )
+        except asyncio.TimeoutError:
+            if self.timeouts is not None:
+                self.timeouts.observe(endpoint.url, payload_bytes, time.perf_counter() - start)
+            raise
+        if self.timeouts is not None:
+            self.timeouts.observe(endpoint.url, payload_bytes, time.perf_counter() - start)
+        if response.status >= 500:
+            raise HttpStatusError(response.status, response.data)
+        try:
+            if self.lazy_responses:
+                return parse_response(response.data, endpoint.name)
+            return json_codec.loads(response.data)
+        except ValueError as ex:
+            raise ResponseDecodeError("invalid response body: %s" % (str(ex) or type(ex).__name__)) from ex
+
+    async def check(self, name, params, timeout=None):
+        """请求易盾接口
+        Args:
+            name (str) 接口名称，如text_check
+            params (dict) 请求参数
+            timeout (tuple) (连接超时, 读超时)秒，默认使用接口配置
+        Returns:
+            请求结果，json格式，失败时返回None
+        """
+        try:
+            return await self.request(get_endpoint(name), params, timeout)
+        except asyncio.CancelledError:
+            raise
+        except Exception as ex:
+            print("调用API接口失败:", str(ex) or type(ex).__name__)
+
+    async def close(self):
+        """关闭全部连接池"""
+        for pool in self._pools.values():
+            pool.close()
+        self._pools.clear()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+
+class AsyncEndpoint(object):
+    """绑定到客户端的单个接口，check/query与同名示例代码方法对应"""
+
+    def __init__(self, client, endpoint):
+        self.client = client
+        self.endpoint = endpoint
+
+    async def check(self, params=None, timeout=None):
+        """请求易盾接口
+        Args:
+            params (dict) 请求参数，结果获取类接口无需传入
+            timeout (tuple) (连接超时, 读超时)秒，默认使用接口配置
+        Returns:
+            请求结果，json格式，失败时返回None
+        """
+        return await self.client.check(self.endpoint.name, {} if params is None else params, timeout)
+
+    query = check
+
+
+async def main():
+    SECRET_ID = "your_secret_id"  # 产品密钥ID，产品标识
+    SECRET_KEY = "your_secret_key"  # 产品私有密钥，服务端生成签名信息使用，请严格保管，避免泄露
+    BUSINESS_ID = "your_business_id"  # 业务ID，易盾根据产品业务特点分配
+    async with AsyncAPIClient(SECRET_ID, SECRET_KEY, BUSINESS_ID, max_connections_per_host=32) as client:
+        text_check = client.endpoint("text_check")
+        contents = ["易盾测试内容！v5接口! %d" % i for i in range(100)]
+        results = await asyncio.gather(*[
+            text_check.check({"dataId": "ebfcad1c-dba1-490c-b4de-e784c2691768", "content": content})
+            for content in contents
+        ])
+        for content, ret in zip(contents, results):
+            if ret is None:
+                continue
+            if ret["code"] == 200:
+                antispam: dict = ret["result"]["antispam"]
+                print("content: %s, taskId: %s, suggestion: %s"
+                      % (content, antispam["taskId"], antispam["suggestion"]))
+            else:
+                print("ERROR: code=%s, msg=%s" % (ret["code"], ret["msg"]))
+
+
+if __name__ == "__main__":
+    """示例代码入口"""
+    asyncio.run(main())
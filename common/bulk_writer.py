@@ -0,0 +1,369 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+易盾反垃圾云服务名单、敏感词、图片名单批量写入组件
+用于从业务系统批量导入或删除大量名单，单条接口逐个调用时请求数过多:
+    1. 写入前通过对应的pageQuery类接口(common.page_query)查询远端现有数据，新增时跳过已存在的条目，
+       删除时跳过远端不存在的条目；输入中重复的条目只写入一次
+    2. 支持批量的接口按batch_size打包为尽量大的批次，list_update、imagelist_update、imagelist_delete
+       每次请求一条，条目为该接口的请求参数dict
+    3. 最多concurrency个请求同时进行，按common.resilience.retry_request重试；提交类接口不幂等，
+       只在连接失败或返回RETRYABLE_CODES时重试，读超时等请求可能已被处理时整批记为失败
+    4. 设置journal时每个条目的结果逐行写入日志文件，中断后使用相同的接口和参数重新运行即跳过已成功的条目，
+       失败的条目重新写入；imagelist_submit只返回成功、失败条数，部分失败时整批记为失败，
+       重新运行时已写入的图片由远端去重跳过
+支持list_submit、list_delete、list_update、keyword_submit、keyword_delete、imagelist_submit、
+imagelist_update、imagelist_delete
+python版本：python3.7
+运行:
+    1. 修改 SECRET_ID,SECRET_KEY,BUSINESS_ID 为对应申请到的值
+    2. $ python -m common.bulk_writer import list_submit blacklist.txt --params '{"listType": 2, "entityType": 1}'
+    3. $ python -m common.bulk_writer export list_query blacklist.txt --params '{"listType": 2, "entityType": 1}'
+"""
+__author__ = 'yidun-dev'
+__date__ = '2026/10/18'
+__version__ = '0.2-dev'
+
+import argparse
+import asyncio
+import hashlib
+import itertools
+import os
+import time
+from collections import namedtuple
+
+from common import json_codec
+from common.async_client import AsyncAPIClient
+from common.endpoints import get_endpoint
+from common.page_query import TIME_RANGE_QUERIES, PageQuery
+from common.resilience import retry_request
+
+# field 批量条目的参数名，None表示每次请求一条、条目为请求参数dict
+# separator 批量条目的编码方式，None表示json数组，否则按separator拼接
+# max_batch 单次请求最多携带的条目数
+# query 远端去重使用的查询接口，key 查询结果中与条目对应的字段，delete 是否为删除操作
+Operation = namedtuple("Operation", ["field", "separator", "max_batch", "query", "key", "delete"])
+
+OPERATIONS = {
+    "list_submit": Operation("entities", None, 100, "list_query", "entity", False),
+    "list_delete": Operation("entities", None, 100, "list_query", "entity", True),
+    "list_update": Operation(None, None, 1, None, None, False),
+    "keyword_submit": Operation("keywords", ",", 100, "keyword_query", "word", False),
+    "keyword_delete": Operation("ids", ",", 100, "keyword_query", "id", True),
+    "imagelist_submit": Operation("images", None, 100, "imagelist_query", "url", False),
+    "imagelist_update": Operation(None, None, 1, None, None, False),
+    "imagelist_delete": Operation(None, None, 1, None, None, False),
+}
+# 查询接口 -> 从写入参数中沿用的过滤参数
+QUERY_FILTERS = {
+    "list_query": ("listType", "entityType"),
+    "keyword_query": ("category",),
+    "imagelist_query": ("listType", "type"),
+}
+# 导出时每行写出的字段
+EXPORT_KEYS = {
+    "list_query": "entity",
+    "keyword_query": "word",
+    "imagelist_query": "url",
+}
+
+STATUS_OK = "ok"  # 写入成功
+STATUS_EXIST = "exist"  # 接口返回已存在
+STATUS_SKIP = "skip"  # 远端去重跳过
+STATUS_FAIL = "fail"  # 写入失败，重新运行时重试
+DONE_STATUSES = frozenset([STATUS_OK, STATUS_EXIST, STATUS_SKIP])
+
+
+class BulkReport(object):
+    """批量写入统计"""
+
+    def __init__(self):
+        self.total = 0  # 读取的条目数
+        self.resumed = 0  # 日志中已完成而跳过的条目数
+        self.duplicated = 0  # 输入中重复的条目数
+        self.skipped = 0  # 远端去重跳过的条目数
+        self.succeeded = 0
+        self.existed = 0
+        self.failed = 0
+        self.requests = 0  # 请求次数，含重试
+
+    def stats(self):
+        """Returns: 统计信息"""
+        return dict(self.__dict__)
+
+
+def _entry_key(entry):
+    """Returns: 条目在日志及去重中的标识，dict条目优先使用uuid"""
+    if isinstance(entry, dict):
+        return str(entry["uuid"]) if "uuid" in entry else json_codec.dumps(sorted(entry.items()))
+    return str(entry)
+
+
+async def remote_keys(client, name, params=None, key=None, windows=8, **kwargs):
+    """查询远端现有数据
+    Args:
+        client (AsyncAPIClient) 对应产品的异步客户端
+        name (str) 查询接口名称，list_query、keyword_query或imagelist_query
+        params (dict) 查询参数，list_query、imagelist_query未设置startTime、endTime时查询全部时间
+        key (str) 返回的字段，默认为EXPORT_KEYS中的字段
+        windows (int) list_query、imagelist_query并行查询的时间窗口数
+        kwargs 传给PageQuery的其他参数
+    Returns:
+        字段值的字符串集合
+    """
+    params = dict(params or {})
+    if name in TIME_RANGE_QUERIES:
+        params.setdefault("startTime", 0)
+        params.setdefault("endTime", int(time.time() * 1000))
+    else:
+        windows = 1
+    key = key or EXPORT_KEYS[name]
+    kwargs["windows"] = windows
+    return {str(row[key]) async for row in PageQuery(client, name, params, **kwargs).rows()}
+
+
+class BulkWriter(object):
+    """名单、敏感词、图片名单批量写入"""
+
+    def __init__(self, client, name, params=None, batch_size=None, concurrency=8, retries=2, dedup=True,
+                 journal=None):
+        """
+        Args:
+            client (AsyncAPIClient) 对应产品的异步客户端
+            name (str) 接口名称，如list_submit
+            params (dict) 每个批次共用的请求参数，如listType、entityType
+            batch_size (int) 单次请求携带的条目数，默认为该接口允许的最大值
+            concurrency (int) 最大并发请求数
+            retries (int) 单次请求失败后的重试次数
+            dedup (bool) 是否在写入前查询远端现有数据去重
+            journal (str) 结果日志文件路径，None表示不记录
+        """
+        if name not in OPERATIONS:
+            raise ValueError("unsupported bulk endpoint: %s" % name)
+        self.operation = OPERATIONS[name]
+        batch_size = batch_size or self.operation.max_batch
+        if not 0 < batch_size <= self.operation.max_batch:
+            raise ValueError("batch_size must be in 1..%d" % self.operation.max_batch)
+        self.client = client
+        self.endpoint = get_endpoint(name)
+        self.params = dict(params or {})
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.retries = retries
+        self.dedup = dedup and self.operation.query is not None
+        self.journal = journal
+        self.report = BulkReport()
+        self._journal = None
+
+    def _journal_key(self):
+        raw = json_codec.dumps([self.endpoint.name, sorted((str(k), str(v)) for k, v in self.params.items())])
+        return hashlib.sha1(raw.encode("utf8")).hexdigest()
+
+    def _open_journal(self):
+        """读取已完成的条目并打开日志，Returns: 已完成条目的标识集合"""
+        done = set()
+        if not self.journal:
+            return done
+        key = self._journal_key()
+        if os.path.exists(self.journal) and os.path.getsize(self.journal):
+            with open(self.journal, "rb") as f:
+                header = f.readline()
+                if json_codec.loads(header).get("key") != key:
+                    raise ValueError("journal %s was written by another endpoint or params" % self.journal)
+                valid = len(header)
+                for line in f:
+                    if not line.endswith(b"\n"):  # 写入中断的最后一行
+                        break
+                    valid += len(line)
+                    entry_key, status = json_codec.loads(line)[:2]
+                    if status in DONE_STATUSES:
+                        done.add(entry_key)
+                    else:
+                        done.discard(entry_key)
+            # 截掉不完整的行，避免与之后追加的内容拼在一起
+            if valid < os.path.getsize(self.journal):
+                os.truncate(self.journal, valid)
+            self._journal = open(self.journal, "a", encoding="utf8")
+        else:
+            self._journal = open(self.journal, "w", encoding="utf8")
+            self._journal.write(json_codec.dumps({"name": self.endpoint.name, "key": key}) + "\n")
+        return done
+
+    def _record(self, results, flush=True):
+        """统计并记录单批结果，results为[(条目标识, 状态, 说明)]"""
+        report = self.report
+        for _, status, _ in results:
+            if status == STATUS_OK:
+                report.succeeded += 1
+            elif status == STATUS_EXIST:
+                report.existed += 1
+            elif status == STATUS_SKIP:
+                report.skipped += 1
+            else:
+                report.failed += 1
+        if self._journal is not None:
+            self._journal.write("".join(json_codec.dumps(list(item)) + "\n" for item in results))
+            if flush:
+                self._journal.flush()
+
+    async def _pending(self, entries):
+        """Returns: 需要写入的条目生成器，读取前完成远端查询"""
+        done = self._open_journal()
+        remote = None
+        if self.dedup:
+            params = dict((k, self.params[k]) for k in QUERY_FILTERS[self.operation.query] if k in self.params)
+            remote = await remote_keys(self.client, self.operation.query, params, key=self.operation.key)
+
+        separator = self.operation.separator
+
+        def pending():
+            report = self.report
+            seen = set()
+            for entry in entries:
+                report.total += 1
+                key = _entry_key(entry)
+                if key in done:
+                    report.resumed += 1
+                    continue
+                if key in seen:
+                    report.duplicated += 1
+                    continue
+                seen.add(key)
+                if separator is not None and separator in key:
+                    self._record([(key, STATUS_FAIL, "contains %r" % separator)], flush=False)
+                    continue
+                if remote is not None and (key in remote) != self.operation.delete:
+                    self._record([(key, STATUS_SKIP, None)], flush=False)
+                    continue
+                yield key, entry
+
+        return pending()
+
+    def _batch_params(self, batch):
+        if self.operation.field is None:
+            return dict(self.params, **batch[0][1])
+        items = [key for key, _ in batch]
+        separator = self.operation.separator
+        value = json_codec.dumps(items) if separator is None else separator.join(items)
+        return dict(self.params, **{self.operation.field: value})
+
+    async def _send(self, batch):
+        """发送一批条目，Returns: 响应，重试后仍失败时返回错误信息"""
+        params = self._batch_params(batch)
+
+        async def send():
+            self.report.requests += 1
+            return await self.client.request(self.endpoint, dict(params))
+
+        # list_submit等非幂等接口读超时后不重试，记为失败，由日志重跑时按远端去重补写
+        ret, error = await retry_request(send, self.retries, self.endpoint.idempotent)
+        return ret if ret is not None else error
+
+    def _results(self, batch, ret):
+        """按条目拆分单批响应，Returns: [(条目标识, 状态, 说明)]"""
+        keys = [key for key, _ in batch]
+        if not isinstance(ret, dict):
+            return [(key, STATUS_FAIL, ret) for key in keys]
+        result = ret.get("result")
+        name = self.endpoint.name
+        if name in ("list_submit", "keyword_submit"):
+            # 返回成功写入的条目，未出现在响应中的条目记为失败
+            field = "entity" if name == "list_submit" else "keyword"
+            items = dict((str(item.get(field)), item) for item in result or ())
+            results = []
+            for key in keys:
+                item = items.get(key)
+                if item is None:
+                    results.append((key, STATUS_FAIL, "missing in response"))
+                elif item.get("exist"):
+                    results.append((key, STATUS_EXIST, item.get("uuid")))
+                else:
+                    results.append((key, STATUS_OK, item.get("uuid", item.get("id"))))
+            return results
+        if name == "imagelist_submit":
+            # 只返回成功、失败条数，部分失败时无法区分具体条目
+            fail = (result or {}).get("fail") or 0
+            if fail:
+                return [(key, STATUS_FAIL, "success=%s, fail=%s" % (result.get("success"), fail)) for key in keys]
+            return [(key, STATUS_OK, None) for key in keys]
+        if result is False:
+            return [(key, STATUS_FAIL, "result=false") for key in keys]
+        return [(key, STATUS_OK, None) for key in keys]
+
+    async def run(self, entries):
+        """写入全部条目
+        Args:
+            entries (iterable) 条目迭代器，长度不限；批量接口为字符串，每次一条的接口为请求参数dict
+        Returns:
+            BulkReport
+        """
+        running = {}
+        try:
+            pending = await self._pending(entries)
+            while True:
+                while len(running) < self.concurrency:
+                    batch = list(itertools.islice(pending, self.batch_size))
+                    if not batch:
+                        break
+                    running[asyncio.ensure_future(self._send(batch))] = batch
+                if not running:
+                    break
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    batch = running.pop(future)
+                    self._record(self._results(batch, future.result()))
+        finally:
+            for future in running:
+                future.cancel()
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+        return self.report
+
+
+def failed_entries(journal):
+    """Returns: 日志中最终状态为失败的条目标识列表"""
+    statuses = {}
+    with open(journal, encoding="utf8") as f:
+        f.readline()
+        for line in f:
+            if line.endswith("\n"):
+                entry_key, status = json_codec.loads(line)[:2]
+                statuses[entry_key] = status
+    return [key for key, status in statuses.items() if status == STATUS_FAIL]
+
+
+async def main(args):
+    SECRET_ID = "your_secret_id"  # 产品密钥ID，产品标识
+    SECRET_KEY = "your_secret_key"  # 产品私有密钥，服务端生成签名信息使用，请严格保管，避免泄露
+    BUSINESS_ID = "your_business_id"  # 业务ID，易盾根据产品业务特点分配
+    params = json_codec.loads(args.params)
+    async with AsyncAPIClient(SECRET_ID, SECRET_KEY, BUSINESS_ID) as client:
+        if args.command == "export":
+            with open(args.file, "w", encoding="utf8") as f:
+                for key in await remote_keys(client, args.name, params):
+                    f.write(key + "\n")
+            return
+        single = OPERATIONS[args.name].field is None
+        with open(args.file, encoding="utf8") as f:
+            # 批量接口每行一个条目，每次一条的接口每行一个json格式的请求参数
+            entries = (json_codec.loads(line) if single else line.strip() for line in f if line.strip())
+            writer = BulkWriter(client, args.name, params, concurrency=args.concurrency, dedup=not args.no_dedup,
+                                journal=args.journal or args.file + ".journal")
+            report = await writer.run(entries)
+        print("统计: %s" % report.stats())
+        if report.failed:
+            print("失败条目见日志: %s" % writer.journal)
+
+
+if __name__ == "__main__":
+    """示例代码入口"""
+    parser = argparse.ArgumentParser(description="名单、敏感词、图片名单批量导入导出")
+    parser.add_argument("command", choices=["import", "export"])
+    parser.add_argument("name", help="import为写入接口名称，如list_submit；export为查询接口名称，如list_query")
+    parser.add_argument("file", help="每行一个条目")
+    parser.add_argument("--params", default="{}", help="json格式的公共请求参数")
+    parser.add_argument("--concurrency", type=int, default=8, help="最大并发请求数")
+    parser.add_argument("--journal", help="结果日志文件，默认为file.journal")
+    parser.add_argument("--no-dedup", action="store_true", help="不查询远端现有数据去重")
+    asyncio.run(main(parser.parse_args()))
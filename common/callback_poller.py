@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+易盾反垃圾云服务检测结果获取轮询组件
+并发轮询多个结果获取(*_callback)接口，并根据返回情况自适应调整轮询间隔:
+    1. 没有结果或请求失败时，轮询间隔按backoff倍数指数增长，直到max_interval
+    2. 有结果时轮询间隔减半，直到min_interval；单次返回结果数达到full_batch时认为仍有积压，立即继续获取
+获取到的结果逐条交给handler处理，handler可以是普通函数或协程函数
+python版本：python3.7
+运行:
+    1. 修改 SECRET_ID,SECRET_KEY,BUSINESS_ID 为对应申请到的值
+    2. $ python -m common.callback_poller
+"""
+__author__ = 'yidun-dev'
+__date__ = '2026/10/18'
+__version__ = '0.2-dev'
+
+import asyncio
+import random
+
+from common.async_client import AsyncAPIClient
+from common.endpoints import ENDPOINTS
+
+
+class PollState(object):
+    """单个结果获取接口的轮询状态"""
+
+    def __init__(self, client, name, interval):
+        self.client = client
+        self.name = name
+        self.interval = interval  # 当前轮询间隔，秒
+        self.polls = 0  # 累计轮询次数
+        self.empty_polls = 0  # 累计无结果次数
+        self.errors = 0  # 累计失败次数
+        self.results = 0  # 累计获取结果数
+
+
+class CallbackPoller(object):
+    """检测结果获取轮询"""
+
+    def __init__(self, handler, min_interval=1.0, max_interval=60.0, backoff=2.0, full_batch=100):
+        """
+        Args:
+            handler (callable) 结果处理函数，参数为(接口名称, 单条结果)
+            min_interval (float) 最小轮询间隔，秒
+            max_interval (float) 最大轮询间隔，秒
+            backoff (float) 无结果时轮询间隔的增长倍数
+            full_batch (int) 单次返回结果数达到该值时立即继续获取
+        """
+        self.handler = handler
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.full_batch = full_batch
+        self.states = []
+        self._tasks = []
+        self._stopped = None
+
+    def add(self, client, name):
+        """添加需要轮询的结果获取接口
+        Args:
+            client (AsyncAPIClient) 对应产品的异步客户端
+            name (str) 接口名称，如text_callback
+        """
+        self.states.append(PollState(client, name, self.min_interval))
+
+    def add_all(self, client):
+        """添加全部结果获取接口，适用于各产品共用一套密钥的情况"""
+        for name in ENDPOINTS:
+            if name.endswith("_callback"):
+                self.add(client, name)
+
+    def stats(self):
+        """Returns: 各接口的轮询统计信息"""
+        return dict((state.name, {
+            "interval": state.interval,
+            "polls": state.polls,
+            "empty_polls": state.empty_polls,
+            "errors": state.errors,
+            "results": state.results,
+        }) for state in self.states)
+
+    async def run(self):
+        """开始轮询，直到调用stop"""
+        self._stopped = asyncio.Event()
+        self._tasks = [asyncio.ensure_future(self._poll(state)) for state in self.states]
+        try:
+            await self._stopped.wait()
+        finally:
+            for task in self._tasks:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stop(self):
+        """停止轮询"""
+        if self._stopped is not None:
+            self._stopped.set()
+
+    async def _poll(self, state):
+        # 随机错开各接口的首次轮询时间
+        await asyncio.sleep(random.uniform(0, self.min_interval))
+        while True:
+            state.polls += 1
+            ret = await state.client.check(state.name, {})
+            if ret is None or ret["code"] != 200:
+                state.errors += 1
+                if ret is not None:
+                    print("ERROR: %s code=%s, msg=%s" % (state.name, ret["code"], ret["msg"]))
+                results = []
+            else:
+                results = ret["result"] or []
+            if results:
+                state.results += len(results)
+                for result in results:
+                    try:
+                        handled = self.handler(state.name, result)
+                        if asyncio.iscoroutine(handled):
+                            await handled
+                    except Exception as ex:
+                        print("处理检测结果失败:", state.name, str(ex))
+                state.interval = max(self.min_interval, state.interval / 2)
+                if len(results) >= self.full_batch:
+                    continue
+            else:
+                if ret is not None and ret["code"] == 200:
+                    state.empty_polls += 1
+                state.interval = min(self.max_interval, state.interval * self.backoff)
+            await asyncio.sleep(state.interval * random.uniform(0.9, 1.1))
+
+
+async def main():
+    SECRET_ID = "your_secret_id"  # 产品密钥ID，产品标识
+    SECRET_KEY = "your_secret_key"  # 产品私有密钥，服务端生成签名信息使用，请严格保管，避免泄露
+    BUSINESS_ID = "your_business_id"  # 业务ID，易盾根据产品业务特点分配
+
+    def handle(name, result):
+        antispam: dict = result.get("antispam", {})
+        print("%s taskId: %s, suggestion: %s" % (name, antispam.get("taskId"), antispam.get("suggestion")))
+
+    async with AsyncAPIClient(SECRET_ID, SECRET_KEY, BUSINESS_ID) as client:
+        poller = CallbackPoller(handle, min_interval=1.0, max_interval=30.0)
+        poller.add(client, "text_callback")
+        poller.add(client, "image_callback")
+        poller.add(client, "video_callback")
+        poller.add(client, "liveaudio_callback")
+        asyncio.get_event_loop().call_later(60, poller.stop)
+        await poller.run()
+        print(poller.stats())
+
+
+if __name__ == "__main__":
+    """示例代码入口"""
+    asyncio.run(main())
@@ -0,0 +1,230 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+易盾反垃圾云服务主动回调接收组件
+检测请求设置了callbackUrl时，易盾会将检测结果主动推送到该地址，本组件作为接收端:
+    1. 按/callback/{产品}区分产品，如callbackUrl设置为http://your-host/callback/text
+    2. 支持form表单和json两种请求体，按gen_signature相同算法校验签名，json请求体中非字符串的值(数字、布尔、对象等)
+       按json文本参与签名，callbackData自动按json解析
+    3. 校验通过的回调放入有界队列后立即应答，由固定数量的worker分发给对应产品的handler；
+       队列在enqueue_timeout内仍然满时返回503，由推送方稍后重试，实现背压
+本地压测可使用CallbackPusher模拟推送，见benchmark/bench_callback_receiver.py
+python版本：python3.7
+运行:
+    1. 修改 SECRET_ID,SECRET_KEY 为对应申请到的值
+    2. $ python -m common.callback_receiver
+"""
+__author__ = 'yidun-dev'
+__date__ = '2026/10/18'
+__version__ = '0.2-dev'
+
+import asyncio
+import hmac
+import random
+import time
+from urllib.parse import urlencode, urlsplit
+
+from common import json_codec
+from common.async_client import AsyncConnectionPool
+from common.http_server import HttpServer, HttpResponse
+from common.signature import gen_signature
+
+PRODUCTS = ("text", "image", "audio", "liveaudio", "video", "livevideo", "livewall", "file", "digital",
+            "report", "mediasolution", "videosolution", "livevideosolution", "crawler", "aigc")
+
+OK = HttpResponse(200, b'{"code":200,"msg":"ok"}')
+BUSY = HttpResponse(503, b'{"code":503,"msg":"busy"}')
+BAD_REQUEST = HttpResponse(400, b'{"code":400,"msg":"bad request"}')
+
+
+class CallbackReceiver(object):
+    """主动回调接收服务"""
+
+    def __init__(self, secret_keys, queue_size=10000, workers=8, enqueue_timeout=0.05):
+        """
+        Args:
+            secret_keys (dict) secretId到secretKey的映射，用于校验签名
+            queue_size (int) 待处理回调队列长度
+            workers (int) 处理回调的worker数量
+            enqueue_timeout (float) 队列满时的最长等待时间，秒，超时返回503
+        """
+        self.secret_keys = secret_keys
+        self.queue_size = queue_size
+        self.workers = workers
+        self.enqueue_timeout = enqueue_timeout
+        self.handlers = {}
+        self.received = 0  # 累计成功放入队列的回调数
+        self.rejected = 0  # 累计签名校验失败数
+        self.invalid = 0  # 累计请求体无法解析数
+        self.busy = 0  # 累计因队列满返回503次数
+        self.handled = 0  # 累计处理完成数
+        self._queue = None
+        self._tasks = []
+        self._server = None
+
+    def on(self, product, handler):
+        """注册产品回调处理函数
+        Args:
+            product (str) 产品，对应callbackUrl路径/callback/{产品}
+            handler (callable) 处理函数，参数为(产品, callbackData, 请求参数)，可以是协程函数
+        """
+        if product not in PRODUCTS:
+            raise ValueError("unknown product: %s" % product)
+        self.handlers[product] = handler
+
+    def verify(self, params, json_body=False):
+        """校验签名
+        Args:
+            params (dict) 回调请求参数
+            json_body (bool) 参数是否来自json请求体
+        Returns:
+            签名是否正确
+        """
+        secret_key = self.secret_keys.get(params.get("secretId"))
+        signature = params.get("signature")
+        if secret_key is None or not signature:
+            return False
+        if json_body:
+            # 与推送方签名时的文本一致，如true而不是str(True)的True
+            unsigned = dict((k, v if isinstance(v, str) else json_codec.dumps(v))
+                            for k, v in params.items() if k != "signature")
+        else:
+            unsigned = dict((k, v) for k, v in params.items() if k != "signature")
+        return hmac.compare_digest(str(signature), gen_signature(secret_key, unsigned))
+
+    async def handle(self, request):
+        """处理一个回调请求"""
+        product = request.path.rstrip("/").rsplit("/", 1)[-1]
+        if request.method != "POST" or product not in self.handlers:
+            return HttpResponse(404, b'{"code":404,"msg":"not found"}')
+        json_body = request.headers.get("content-type", "").startswith("application/json")
+        try:
+            if json_body:
+                params = json_codec.loads(request.body)
+            else:
+                params = request.form()
+        except ValueError:  # json格式错误、非utf8编码
+            params = None
+        if not isinstance(params, dict):
+            self.invalid += 1
+            return BAD_REQUEST
+        if not self.verify(params, json_body):
+            self.rejected += 1
+            return HttpResponse(401, b'{"code":401,"msg":"invalid signature"}')
+        try:
+            await asyncio.wait_for(self._queue.put((product, params)), self.enqueue_timeout)
+        except asyncio.TimeoutError:
+            self.busy += 1
+            return BUSY
+        self.received += 1
+        return OK
+
+    async def _work(self):
+        while True:
+            product, params = await self._queue.get()
+            data = params.get("callbackData")
+            if isinstance(data, str):
+                try:
+                    data = json_codec.loads(data)
+                except ValueError:
+                    pass
+            try:
+                handled = self.handlers[product](product, data, params)
+                if asyncio.iscoroutine(handled):
+                    await handled
+            except Exception as ex:
+                print("处理主动回调失败:", product, str(ex))
+            finally:
+                self.handled += 1
+                self._queue.task_done()
+
+    async def start(self, host="0.0.0.0", port=8080):
+        """启动接收服务
+        Returns:
+            实际监听端口
+        """
+        self._queue = asyncio.Queue(self.queue_size)
+        self._tasks = [asyncio.ensure_future(self._work()) for _ in range(self.workers)]
+        self._server = await HttpServer(self.handle, host, port).start()
+        return self._server.port
+
+    async def join(self):
+        """等待队列中的回调全部处理完成"""
+        await self._queue.join()
+
+    async def close(self):
+        """停止接收服务"""
+        await self._server.close()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+class CallbackPusher(object):
+    """本地模拟易盾主动推送，用于接收端的离线联调和压测"""
+
+    def __init__(self, callback_url, secret_id, secret_key, max_connections=64):
+        """
+        Args:
+            callback_url (str) 回调地址，如http://127.0.0.1:8080/callback/text
+            secret_id (str) 产品密钥ID
+            secret_key (str) 产品私有密钥
+            max_connections (int) 最大并发连接数
+        """
+        parts = urlsplit(callback_url)
+        self.path = parts.path
+        self.secret_id = secret_id
+        self.secret_key = secret_key
+        self.pool = AsyncConnectionPool(parts.scheme, parts.hostname, parts.port or 80, max_connections)
+
+    async def push(self, callback_data, timeout=(1.0, 5.0)):
+        """推送一条回调
+        Args:
+            callback_data (dict) 检测结果
+            timeout (tuple) (连接超时, 读超时)秒
+        Returns:
+            HTTP状态码
+        """
+        params = {
+            "secretId": self.secret_id,
+            "timestamp": int(time.time() * 1000),
+            "nonce": int(random.random() * 100000000),
+            "callbackData": json_codec.dumps(callback_data),
+        }
+        params["signature"] = gen_signature(self.secret_key, params)
+        response = await self.pool.request(
+            "POST", self.path, urlencode(params).encode("utf8"),
+            {"Content-Type": "application/x-www-form-urlencoded"}, timeout)
+        return response.status
+
+    def close(self):
+        self.pool.close()
+
+
+async def main():
+    SECRET_ID = "your_secret_id"  # 产品密钥ID，产品标识
+    SECRET_KEY = "your_secret_key"  # 产品私有密钥，服务端生成签名信息使用，请严格保管，避免泄露
+
+    def handle_text(product, data, params):
+        antispam: dict = data.get("antispam", {})
+        print("%s taskId: %s, suggestion: %s" % (product, antispam.get("taskId"), antispam.get("suggestion")))
+
+    def handle_image(product, data, params):
+        antispam: dict = data.get("antispam", {})
+        print("%s name: %s, suggestion: %s" % (product, antispam.get("name"), antispam.get("suggestion")))
+
+    receiver = CallbackReceiver({SECRET_ID: SECRET_KEY})
+    receiver.on("text", handle_text)
+    receiver.on("image", handle_image)
+    port = await receiver.start("0.0.0.0", 8080)
+    print("主动回调接收服务已启动, callbackUrl: http://your-host:%s/callback/{text|image}" % port)
+    try:
+        while True:
+            await asyncio.sleep(3600)
+    finally:
+        await receiver.close()
+
+
+if __name__ == "__main__":
+    """示例代码入口"""
+    asyncio.run(main())
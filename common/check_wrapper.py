@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+易盾反垃圾云服务接口check方法替换组件
+text_cache、image_dedup、keyword_filter等组件通过替换接口的check方法增加缓存、去重、预过滤，支持的接口对象:
+    1. 示例代码中的API类实例、AsyncAPIClient.endpoint(...)，直接替换实例属性check
+    2. APIClient.text_check等BoundApi，使用__slots__且每次访问描述符都生成新对象，无法设置属性，
+       返回转发其他属性的CheckProxy
+python版本：python3.7
+"""
+__author__ = 'yidun-dev'
+__date__ = '2026/10/18'
+__version__ = '0.2-dev'
+
+
+def replace_check(api, check):
+    """替换api的check方法
+    Args:
+        api (object) 接口对象
+        check (function) 新的check方法
+    Returns:
+        替换后的接口，可以直接设置属性时为api本身，否则为CheckProxy
+    """
+    try:
+        api.check = check
+    except AttributeError:  # __slots__对象，如APIClient.text_check
+        api = CheckProxy(api, check)
+    return api
+
+
+class CheckProxy(object):
+    """替换check方法后的接口，query与check相同，其他属性转发给原接口"""
+
+    def __init__(self, api, check):
+        self.api = api
+        self.check = check
+        self.query = check
+
+    def __getattr__(self, name):
+        return getattr(self.api, name)
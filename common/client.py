@@ -0,0 +1,205 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+易盾反垃圾云服务同步客户端
+同一进程使用多个产品接口时，用一个APIClient代替各示例代码的API类:
+    1. common.endpoints中的每个接口对应APIClient上的一个同名描述符Api，只保存接口地址、版本、超时配置，
+       响应模型在首次按需解析时才确定，如client.text_check.check(params)、client.video_query.query(params)
+    2. 签名与common.signature一致，SM3由common.sm3实现，不依赖gmssl；请求使用common.http_pool共享连接池
+    3. common.responses、common.image_stream等仅在lazy_responses=True或参数含流式图片时才导入
+    4. 设置rate_limiter时按common.rate_limit限流，等待令牌后再签名
+python版本：python3.7
+运行:
+    1. 修改 SECRET_ID,SECRET_KEY,BUSINESS_ID 为对应申请到的值
+    2. $ python -m common.client
+"""
+__author__ = 'yidun-dev'
+__date__ = '2026/10/18'
+__version__ = '0.2-dev'
+
+from urllib.parse import urlencode, urlsplit
+
+import urllib3
+
+from common import json_codec
+from common.endpoints import ENDPOINTS, get_endpoint
+from common.http_pool import shared_pool_manager
+from common.signature import sign_params
+
+# 相同(连接超时, 读超时)的接口共用同一个urllib3.Timeout
+_TIMEOUTS = {}
+
+
+def _timeout(value):
+    timeout = _TIMEOUTS.get(value)
+    if timeout is None:
+        timeout = _TIMEOUTS[value] = urllib3.Timeout(connect=value[0], read=value[1])
+    return timeout
+
+
+class Api(object):
+    """接口描述符，通过APIClient实例访问时返回绑定该客户端的BoundApi"""
+
+    __slots__ = ("endpoint", "timeout", "_model")
+
+    def __init__(self, endpoint):
+        """
+        Args:
+            endpoint (Endpoint) 接口描述
+        """
+        self.endpoint = endpoint
+        self.timeout = _timeout(endpoint.timeout)
+        self._model = None
+
+    @property
+    def name(self):
+        return self.endpoint.name
+
+    @property
+    def model(self):
+        """响应模型，common.responses.Response或其子类"""
+        if self._model is None:
+            from common.responses import response_model
+            self._model = response_model(self.endpoint.name)
+        return self._model
+
+    def __get__(self, client, owner=None):
+        if client is None:
+            return self
+        return BoundApi(client, self)
+
+    def __repr__(self):
+        return "Api(%r)" % self.endpoint.name
+
+
+class BoundApi(object):
+    """绑定到客户端的单个接口，check/query与同名示例代码方法对应"""
+
+    __slots__ = ("client", "api")
+
+    def __init__(self, client, api):
+        self.client = client
+        self.api = api
+
+    def check(self, params=None, timeout=None):
+        """请求易盾接口
+        Args:
+            params (dict) 请求参数，结果获取类接口无需传入
+            timeout (tuple) (连接超时, 读超时)秒，默认使用接口配置
+        Returns:
+            请求结果，json格式，失败时返回None
+        """
+        return self.client.check(self.api, {} if params is None else params, timeout)
+
+    query = check
+
+
+class APIClient(object):
+    """易盾反垃圾云服务同步客户端，全部接口共用一个实例"""
+
+    __slots__ = ("secret_id", "secret_key", "business_id", "signature_method", "base_url", "rate_limiter",
+                 "lazy_responses", "http")
+
+    def __init__(self, secret_id, secret_key, business_id=None, signature_method=None, base_url=None,
+                 rate_limiter=None, lazy_responses=False, http=None):
+        """
+        Args:
+            secret_id (str) 产品密钥ID，产品标识
+            secret_key (str) 产品私有密钥，服务端生成签名信息使用
+            business_id (str) 业务ID，易盾根据产品业务特点分配，解决方案类接口无需设置
+            signature_method (str) 签名方法，默认MD5，支持SM3
+            base_url (str) 替换全部接口的协议和host，如本地模拟服务http://127.0.0.1:8080
+            rate_limiter (RateLimiter) 按(secretId, businessId, 接口地址)限流，未设置时不限流
+            lazy_responses (bool) 是否返回按需解析的响应模型，适用于视频、音频回调等较大的响应
+            http (urllib3.PoolManager) 连接池，默认使用进程内共享连接池
+        """
+        self.secret_id = secret_id
+        self.secret_key = secret_key
+        self.business_id = business_id
+        self.signature_method = signature_method
+        self.base_url = base_url
+        self.rate_limiter = rate_limiter
+        self.lazy_responses = lazy_responses
+        self.http = http if http is not None else shared_pool_manager()
+
+    def endpoint(self, name):
+        """获取绑定到本客户端的接口
+        Args:
+            name (str) 接口名称，如text_check
+        Returns:
+            BoundApi
+        """
+        return BoundApi(self, APIS.get(name) or Api(get_endpoint(name)))
+
+    def request(self, api, params, timeout=None):
+        """签名并发送请求，请求失败时抛出异常
+        Args:
+            api (Api) 接口描述符
+            params (dict) 请求参数
+            timeout (tuple) (连接超时, 读超时)秒，默认使用接口配置
+        Returns:
+            请求结果，json格式，lazy_responses=True时为common.responses.Response
+        """
+        endpoint = api.endpoint
+        business_id = self.business_id if endpoint.business else None
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(self.secret_id, business_id, endpoint.url)
+        sign_params(params, self.secret_id, self.secret_key, endpoint.version, business_id, self.signature_method)
+        if any(hasattr(value, "iter_text") for value in params.values()):
+            from common.image_stream import iter_form_body
+            body, chunked = iter_form_body(params), True
+        else:
+            body, chunked = urlencode(params).encode("utf8"), False
+        url = endpoint.url
+        if self.base_url:
+            url = self.base_url.rstrip("/") + urlsplit(url).path
+        response = self.http.request(
+            "POST",
+            url,
+            body=body,
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+            timeout=_timeout(timeout) if timeout else api.timeout,
+            chunked=chunked
+        )
+        if self.lazy_responses:
+            from common.responses import parse
+            return parse(response.data, model=api.model)
+        return json_codec.loads(response.data)
+
+    def check(self, api, params, timeout=None):
+        """请求易盾接口
+        Args:
+            api (Api|str) 接口描述符或接口名称，如text_check
+            params (dict) 请求参数
+            timeout (tuple) (连接超时, 读超时)秒，默认使用接口配置
+        Returns:
+            请求结果，json格式，失败时返回None
+        """
+        try:
+            return self.request(api if isinstance(api, Api) else self.endpoint(api).api, params, timeout)
+        except Exception as ex:
+            print("调用API接口失败:", str(ex) or type(ex).__name__)
+
+
+APIS = {}
+for _name, _endpoint in ENDPOINTS.items():
+    APIS[_name] = Api(_endpoint)
+    setattr(APIClient, _name, APIS[_name])
+del _name, _endpoint
+
+
+if __name__ == "__main__":
+    """示例代码入口"""
+    SECRET_ID = "your_secret_id"  # 产品密钥ID，产品标识
+    SECRET_KEY = "your_secret_key"  # 产品私有密钥，服务端生成签名信息使用，请严格保管，避免泄露
+    BUSINESS_ID = "your_business_id"  # 业务ID，易盾根据产品业务特点分配
+    client = APIClient(SECRET_ID, SECRET_KEY, BUSINESS_ID)
+
+    ret = client.text_check.check({"dataId": "ebfcad1c-dba1-490c-b4de-e784c2691768", "content": "易盾测试内容！v5接口!"})
+    if ret is not None and ret["code"] == 200:
+        antispam: dict = ret["result"]["antispam"]
+        print("taskId: %s, suggestion: %s" % (antispam["taskId"], antispam["suggestion"]))
+        ret = client.text_query.query({"taskIds": [antispam["taskId"]]})
+        print(ret)
+    elif ret is not None:
+        print("ERROR: code=%s, msg=%s" % (ret["code"], ret["msg"]))
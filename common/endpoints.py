@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+易盾反垃圾云服务接口描述
+汇总各产品示例代码中的接口地址、接口版本、超时配置，以及公共参数中是否需要携带businessId
+名称与示例代码文件名一致，如text_check对应text/text_check.py
+python版本：python3.7
+"""
+__author__ = 'yidun-dev'
+__date__ = '2026/10/18'
+__version__ = '0.2-dev'
+
+from collections import namedtuple
+from urllib.parse import urlsplit
+
+# name 接口名称, url 接口地址, version 接口版本, timeout (连接超时, 读超时)秒, business 是否携带businessId,
+# idempotent 请求已发出后重复请求是否安全；提交类接口会重复创建检测任务，liveaudio_check会重复创建直播语音监测任务，
+# 结果获取类(callback)接口每次请求取走一批结果，均不能重试或对冲
+Endpoint = namedtuple("Endpoint", ["name", "url", "version", "timeout", "business", "idempotent"])
+
+SHORT_TIMEOUT = (1.0, 1.0)  # 在线检测、提交类接口
+LONG_TIMEOUT = (10.0, 10.0)  # 结果获取、查询类接口
+
+ENDPOINTS = dict((endpoint.name, endpoint) for endpoint in [
+    # aigc
+    Endpoint("aigc_stream_callback", "https://as.dun.163.com/v1/stream/callback/results", "v1", LONG_TIMEOUT, False, False),
+    Endpoint("aigc_stream_push", "https://as.dun.163.com/v1/stream/push", "v1", LONG_TIMEOUT, False, False),
+    # audio
+    Endpoint("audio_callback", "http://as.dun.163.com/v4/audio/callback/results", "v4", LONG_TIMEOUT, True, False),
+    Endpoint("audio_check", "http://as.dun.163.com/v2/audio/check", "v2.1", SHORT_TIMEOUT, True, True),
+    Endpoint("audio_query", "http://as.dun.163.com/v1/audio/query/task", "v1", LONG_TIMEOUT, True, True),
+    Endpoint("audio_submit", "http://as.dun.163.com/v4/audio/submit", "v4", SHORT_TIMEOUT, True, False),
+    Endpoint("liveaudio_callback", "http://as.dun.163.com/v4/liveaudio/callback/results", "v4", LONG_TIMEOUT, True, False),
+    Endpoint("liveaudio_check", "http://as.dun.163.com/v4/liveaudio/check", "v4", SHORT_TIMEOUT, True, False),
+    Endpoint("liveaudio_feedback", "http://as.dun.163.com/v1/liveaudio/feedback", "v1.0", LONG_TIMEOUT, True, False),
+    Endpoint("liveaudio_queryextra", "http://as.dun.163.com/v1/liveaudio/query/extra", "v1", LONG_TIMEOUT, True, True),
+    Endpoint("liveaudio_querymonitor", "http://as.dun.163.com/v1/liveaudio/query/monitor", "v1.0", LONG_TIMEOUT, True, True),
+    Endpoint("liveaudio_querytask", "http://as.dun.163.com/v1/liveaudio/query/task", "v1.0", LONG_TIMEOUT, True, True),
+    # crawler
+    Endpoint("crawler_callback", "http://as.dun.163.com/v3/crawler/callback/results", "v3.0", LONG_TIMEOUT, False, False),
+    Endpoint("crawler_job_submit", "http://as.dun.163.com/v1/crawler/job/submit", "v1.0", SHORT_TIMEOUT, False, False),
+    Endpoint("crawler_submit", "http://as.dun.163.com/v3/crawler/submit", "v3.0", SHORT_TIMEOUT, False, False),
+    # digital
+    Endpoint("digital_callback", "http://as.dun.163.com/v2/digital/callback/results", "v2", LONG_TIMEOUT, False, False),
+    Endpoint("digital_query", "http://as.dun.163.com/v2/digital/callback/query", "v2", LONG_TIMEOUT, True, True),
+    Endpoint("digital_submit", "http://as.dun.163.com/v2/digital/submit", "v2", SHORT_TIMEOUT, False, False),
+    # filesolution
+    Endpoint("filesolution_callback", "http://as-file.dun.163.com/v2/file/callback/results", "v2.0", LONG_TIMEOUT, False, False),
+    Endpoint("filesolution_query", "http://as-file.dun.163.com/v1/file/query", "v1.1", LONG_TIMEOUT, False, True),
+    Endpoint("filesolution_submit", "http://as-file.dun.163.com/v2/file/submit", "v2.0", SHORT_TIMEOUT, False, False),
+    # image
+    Endpoint("image_asynccheck", "http://as.dun.163.com/v5/image/asyncCheck", "v5", LONG_TIMEOUT, True, False),
+    Endpoint("image_callback", "http://as.dun.163.com/v5/image/callback/results", "v5", LONG_TIMEOUT, True, False),
+    Endpoint("image_check", "http://as.dun.163.com/v5/image/check", "v5.1", LONG_TIMEOUT, True, True),
+    Endpoint("image_query", "http://as.dun.163.com/v1/image/query/task", "v1", LONG_TIMEOUT, True, True),
+    Endpoint("image_submit", "http://as.dun.163.com/v5/image/submit", "v5", LONG_TIMEOUT, True, False),
+    Endpoint("imagelist_delete", "http://as.dun.163.com/v1/image/list/delete", "v1.0", LONG_TIMEOUT, True, True),
+    Endpoint("imagelist_query", "http://as.dun.163.com/v1/image/list/pageQuery", "v1.0", LONG_TIMEOUT, True, True),
+    Endpoint("imagelist_submit", "http://as.dun.163.com/v1/image/list/submit", "v1.0", LONG_TIMEOUT, True, False),
+    Endpoint("imagelist_update", "http://as.dun.163.com/v1/image/list/update", "v1.0", LONG_TIMEOUT, True, True),
+    # keyword
+    Endpoint("keyword_delete", "http://as.dun.163.com/v1/keyword/delete", "v1", SHORT_TIMEOUT, True, True),
+    Endpoint("keyword_query", "http://as.dun.163.com/v1/keyword/query", "v1", SHORT_TIMEOUT, True, True),
+    Endpoint("keyword_submit", "http://as.dun.163.com/v1/keyword/submit", "v1", SHORT_TIMEOUT, True, False),
+    # list
+    Endpoint("list_delete", "http://as.dun.163yun.com/v2/list/batchDelete", "v2", LONG_TIMEOUT, True, True),
+    Endpoint("list_query", "http://as.dun.163yun.com/v2/list/pageQuery", "v2", LONG_TIMEOUT, True, True),
+    Endpoint("list_submit", "http://as.dun.163.com/v2/list/submit", "v2", SHORT_TIMEOUT, False, False),
+    Endpoint("list_update", "http://as.dun.163.com/v2/list/update", "v2", LONG_TIMEOUT, True, True),
+    # livevideosolution
+    Endpoint("livevideosolution_callback", "http://as.dun.163.com/v2/livewallsolution/callback/results", "v2.1", LONG_TIMEOUT, False, False),
+    Endpoint("livevideosolution_feedback", "http://as.dun.163yun.com/v1/livewallsolution/feedback", "v1.0", SHORT_TIMEOUT, False, False),
+    Endpoint("livevideosolution_queryaudio", "http://as.dun.163yun.com/v1/livewallsolution/query/audio/task", "v1.0", SHORT_TIMEOUT, False, True),
+    Endpoint("livevideosolution_queryimage", "http://as.dun.163yun.com/v1/livewallsolution/query/image", "v1.0", SHORT_TIMEOUT, False, True),
+    Endpoint("livevideosolution_querymonitor", "http://as.dun.163.com/v1/livewallsolution/query/monitor", "v1.0", SHORT_TIMEOUT, False, True),
+    Endpoint("livevideosolution_submit", "http://as.dun.163.com/v2/livewallsolution/submit", "v2.1", SHORT_TIMEOUT, False, False),
+    # mediasolution
+    Endpoint("mediasolution_callback", "http://as.dun.163.com/v2/mediasolution/callback/results", "v2", LONG_TIMEOUT, False, False),
+    Endpoint("mediasolution_query", "http://as.dun.163.com/v2/mediasolution/callback/query", "v2", LONG_TIMEOUT, True, True),
+    Endpoint("mediasolution_submit", "http://as.dun.163.com/v2/mediasolution/submit", "v2.0", SHORT_TIMEOUT, False, False),
+    # report
+    Endpoint("report_callback", "http://as.dun.163.com/v1/report/callback/results", "v1", LONG_TIMEOUT, False, False),
+    Endpoint("report_query", "http://as.dun.163.com/v1/report/callback/query", "v1", LONG_TIMEOUT, True, True),
+    Endpoint("report_submit", "http://as.dun.163.com/v1/report/submit", "v1", SHORT_TIMEOUT, False, False),
+    # text
+    Endpoint("text_batch_check", "http://as.dun.163.com/v5/text/batch-check", "v5.2", SHORT_TIMEOUT, True, True),
+    Endpoint("text_callback", "http://as.dun.163.com/v5/text/callback/results", "v5.2", LONG_TIMEOUT, True, False),
+    Endpoint("text_check", "http://as.dun.163.com/v5/text/check", "v5.2", SHORT_TIMEOUT, True, True),
+    Endpoint("text_query", "http://as.dun.163.com/v1/text/query/task", "v1", LONG_TIMEOUT, True, True),
+    Endpoint("text_submit", "http://as.dun.163.com/v5/text/submit", "v5", SHORT_TIMEOUT, True, False),
+    # video
+    Endpoint("liveimage_query", "http://as.dun.163.com/v1/livevideo/query/image", "v1", LONG_TIMEOUT, True, True),
+    Endpoint("livevideo_callback", "http://as.dun.163.com/v4/livevideo/callback/results", "v4", LONG_TIMEOUT, True, False),
+    Endpoint("livevideo_feedback", "http://as.dun.163.com/v1/livevideo/feedback", "v1.0", SHORT_TIMEOUT, True, False),
+    Endpoint("livevideo_query", "http://as.dun.163.com/v1/livevideo/query/task", "v1", LONG_TIMEOUT, True, True),
+    Endpoint("livevideo_submit", "http://as.dun.163.com/v4/livevideo/submit", "v4", SHORT_TIMEOUT, True, False),
+    Endpoint("livewall_callback", "http://as.dun.163.com/v2/livewall/callback/results", "v2", LONG_TIMEOUT, True, False),
+    Endpoint("livewall_querymonitor", "http://as.dun.163.com/v1/livewall/query/monitor", "v1.0", SHORT_TIMEOUT, True, True),
+    Endpoint("livewall_submit", "http://as.dun.163.com/v3/livevideo/submit", "v3.1", SHORT_TIMEOUT, True, False),
+    Endpoint("video_callback", "http://as.dun.163.com/v4/video/callback/results", "v4", LONG_TIMEOUT, True, False),
+    Endpoint("video_query", "http://as.dun.163.com/v4/video/query/task", "v4", LONG_TIMEOUT, True, True),
+    Endpoint("video_submit", "http://as.dun.163.com/v4/video/submit", "v4", SHORT_TIMEOUT, True, False),
+    Endpoint("videoimage_query", "http://as.dun.163.com/v1/video/query/image", "v1", LONG_TIMEOUT, True, True),
+    # videosolution
+    Endpoint("videosolution_callback", "http://as.dun.163.com/v1/videosolution/callback/results", "v1.1", LONG_TIMEOUT, False, False),
+    Endpoint("videosolution_query", "http://as.dun.163.com/v2/videosolution/query/task", "v2", LONG_TIMEOUT, False, True),
+    Endpoint("videosolution_submit", "http://as.dun.163.com/v1/videosolution/submit", "v1.1", SHORT_TIMEOUT, False, False),
+])
+
+
+def get_endpoint(name):
+    """根据名称获取接口描述
+    Args:
+        name (str) 接口名称，如text_check
+    Returns:
+        Endpoint
+    """
+    try:
+        return ENDPOINTS[name]
+    except KeyError:
+        raise ValueError("unknown endpoint: %s" % name)
+
+
+def endpoint_host(endpoint):
+    """Returns: (scheme, host, port)"""
+    parts = urlsplit(endpoint.url)
+    return parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == "https" else 80)
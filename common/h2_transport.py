@@ -0,0 +1,321 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+易盾反垃圾云服务asyncio客户端的HTTP/2传输
+并发请求复用少量连接上的多个stream，接口与AsyncConnectionPool一致，AsyncAPIClient(http2=True)时使用
+    1. 单连接并发stream数不超过max_streams及服务端SETTINGS_MAX_CONCURRENT_STREAMS，已有连接用满时新建连接，
+       连接数达到max_connections后请求排队等待
+    2. https通过ALPN协商，http使用prior knowledge(h2c)；未协商出HTTP/2或未安装h2时回退为HTTP/1.1连接池
+    3. 请求超时或被取消时只重置对应stream，不影响同一连接上的其他请求
+依赖h2: pip install h2
+python版本：python3.7
+"""
+__author__ = 'yidun-dev'
+__date__ = '2026/10/18'
+__version__ = '0.2-dev'
+
+import asyncio
+import collections
+import ssl
+
+try:
+    import h2.config
+    import h2.connection
+    import h2.errors
+    import h2.events
+    import h2.exceptions
+except ImportError:  # 未安装h2时全部回退为HTTP/1.1
+    h2 = None
+
+from common.async_client import AsyncConnectionPool, HttpResponse, open_connection
+
+READ_SIZE = 64 << 10
+
+
+def available():
+    """Returns: 是否安装了h2"""
+    return h2 is not None
+
+
+class _Stream(object):
+    __slots__ = ("future", "status", "headers", "data")
+
+    def __init__(self, future):
+        self.future = future
+        self.status = None
+        self.headers = {}
+        self.data = []
+
+
+class H2Connection(object):
+    """单个HTTP/2连接"""
+
+    def __init__(self, reader, writer, max_streams, on_close=None):
+        self._reader = reader
+        self._writer = writer
+        self._conn = h2.connection.H2Connection(
+            config=h2.config.H2Configuration(client_side=True, header_encoding="utf-8"))
+        self._streams = {}
+        self._settings = asyncio.get_event_loop().create_future()
+        self._window_updated = asyncio.Event()
+        self._on_close = on_close
+        self.max_streams = max_streams
+        self.active = 0  # 已分配的stream数，由连接池在分配时增加
+        self.closed = False
+        self._conn.initiate_connection()
+        self._flush()
+        self._read_task = asyncio.ensure_future(self._read_loop())
+
+    @property
+    def capacity(self):
+        """还可以分配的stream数"""
+        return min(self.max_streams, self._conn.remote_settings.max_concurrent_streams) - self.active
+
+    async def handshake(self):
+        """等待服务端的SETTINGS帧，服务端不支持HTTP/2时抛出异常"""
+        await asyncio.shield(self._settings)
+
+    async def request(self, method, authority, scheme, path, body, headers, timeout):
+        """发送请求，参数同AsyncConnectionPool.request，timeout为读超时"""
+        if self.closed:
+            raise ConnectionError("connection closed")
+        streaming = not isinstance(body, (bytes, bytearray))
+        stream_id = self._conn.get_next_available_stream_id()
+        request_headers = [(":method", method), (":authority", authority), (":scheme", scheme), (":path", path)]
+        if not streaming:
+            request_headers.append(("content-length", str(len(body))))
+        request_headers.extend((name.lower(), value) for name, value in headers.items())
+        stream = self._streams[stream_id] = _Stream(asyncio.get_event_loop().create_future())
+        try:
+            self._conn.send_headers(stream_id, request_headers, end_stream=not streaming and not body)
+            self._flush()
+            if streaming or body:
+                await asyncio.wait_for(self._send_body(stream_id, [body] if not streaming else body), timeout)
+            return await asyncio.wait_for(asyncio.shield(stream.future), timeout)
+        except BaseException:
+            # 只重置当前stream，连接上的其他请求不受影响
+            if not self.closed:
+                try:
+                    self._conn.reset_stream(stream_id, h2.errors.ErrorCodes.CANCEL)
+                    self._flush()
+                except h2.exceptions.H2Error:
+                    pass
+            raise
+        finally:
+            self._streams.pop(stream_id, None)
+
+    async def _send_body(self, stream_id, chunks):
+        for chunk in chunks:
+            view = memoryview(chunk)
+            while view:
+                if self.closed:
+                    raise ConnectionError("connection closed")
+                size = min(self._conn.local_flow_control_window(stream_id), self._conn.max_outbound_frame_size,
+                           len(view))
+                if size <= 0:
+                    # 等待服务端WINDOW_UPDATE
+                    self._window_updated.clear()
+                    await self._window_updated.wait()
+                    continue
+                self._conn.send_data(stream_id, view[:size].tobytes())
+                view = view[size:]
+                self._flush()
+                await self._writer.drain()
+        self._conn.end_stream(stream_id)
+        self._flush()
+
+    def _flush(self):
+        data = self._conn.data_to_send()
+        if data:
+            self._writer.write(data)
+
+    async def _read_loop(self):
+        try:
+            while True:
+                data = await self._reader.read(READ_SIZE)
+                if not data:
+                    raise ConnectionError("connection closed by server")
+                for event in self._conn.receive_data(data):
+                    self._handle(event)
+                self._flush()
+        except asyncio.CancelledError:
+            self._fail(ConnectionError("connection closed"))
+            raise
+        except Exception as ex:
+            self._fail(ex)
+
+    def _handle(self, event):
+        if isinstance(event, h2.events.RemoteSettingsChanged):
+            if not self._settings.done():
+                self._settings.set_result(None)
+            self._window_updated.set()
+        elif isinstance(event, h2.events.WindowUpdated):
+            self._window_updated.set()
+        elif isinstance(event, h2.events.ConnectionTerminated):
+            raise ConnectionError("connection terminated by server, error_code=%s" % event.error_code)
+        elif isinstance(event, (h2.events.ResponseReceived, h2.events.DataReceived, h2.events.StreamEnded,
+                                h2.events.StreamReset)):
+            if isinstance(event, h2.events.DataReceived):
+                self._conn.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+            stream = self._streams.get(event.stream_id)
+            if stream is None or stream.future.done():
+                return
+            if isinstance(event, h2.events.ResponseReceived):
+                for name, value in event.headers:
+                    if name == ":status":
+                        stream.status = int(value)
+                    else:
+                        stream.headers[name] = value
+            elif isinstance(event, h2.events.DataReceived):
+                stream.data.append(event.data)
+            elif isinstance(event, h2.events.StreamEnded):
+                stream.future.set_result(HttpResponse(stream.status, stream.headers, b"".join(stream.data)))
+            else:
+                stream.future.set_exception(ConnectionError("stream reset by server, error_code=%s"
+                                                            % event.error_code))
+
+    def _fail(self, ex):
+        if self.closed:
+            return
+        self.closed = True
+        if not self._settings.done():
+            self._settings.set_exception(ex)
+        for stream in self._streams.values():
+            if not stream.future.done():
+                stream.future.set_exception(ex)
+        self._window_updated.set()
+        self._writer.close()
+        if self._on_close is not None:
+            self._on_close(self)
+
+    def close(self):
+        if not self.closed:
+            try:
+                self._conn.close_connection()
+                self._flush()
+            except h2.exceptions.H2Error:
+                pass
+        self._read_task.cancel()
+
+
+class H2ConnectionPool(object):
+    """单个host的HTTP/2连接池"""
+
+    def __init__(self, scheme, host, port, max_connections=2, max_streams=100, fallback_max_connections=64):
+        """
+        Args:
+            scheme (str) http或https
+            host (str) 主机名
+            port (int) 端口
+            max_connections (int) 最大HTTP/2连接数
+            max_streams (int) 单连接最大并发stream数
+            fallback_max_connections (int) 回退为HTTP/1.1时的最大并发连接数
+        """
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.max_connections = max_connections
+        self.max_streams = max_streams
+        self.http2 = None if available() else False  # None表示尚未协商
+        self._authority = host if port in (80, 443) else "%s:%d" % (host, port)
+        self._connections = []
+        self._connecting = 0
+        self._waiters = collections.deque()
+        self._fallback = AsyncConnectionPool(scheme, host, port, fallback_max_connections)
+        self._ssl = None
+        if scheme == "https":
+            self._ssl = ssl.create_default_context()
+            self._ssl.set_alpn_protocols(["h2", "http/1.1"])
+
+    @property
+    def connections(self):
+        """当前HTTP/2连接数"""
+        return len(self._connections)
+
+    @property
+    def in_use(self):
+        """当前正在处理的请求数"""
+        return sum(conn.active for conn in self._connections) + self._fallback.in_use
+
+    @property
+    def idle(self):
+        return self._fallback.idle
+
+    async def request(self, method, path, body, headers, timeout):
+        """发送请求，参数及返回值同AsyncConnectionPool.request"""
+        conn = await self._acquire(timeout[0])
+        if conn is None:
+            return await self._fallback.request(method, path, body, headers, timeout)
+        try:
+            return await conn.request(method, self._authority, self.scheme, path, body, headers, timeout[1])
+        finally:
+            conn.active -= 1
+            self._wake()
+
+    async def _acquire(self, connect_timeout):
+        while self.http2 is not False:
+            best = max(self._connections, key=lambda c: c.capacity, default=None)
+            if best is not None and best.capacity > 0:
+                best.active += 1
+                return best
+            if len(self._connections) + self._connecting < self.max_connections:
+                self._connecting += 1
+                try:
+                    conn = await self._connect(connect_timeout)
+                finally:
+                    self._connecting -= 1
+                    self._wake()
+                if conn is not None:
+                    self._connections.append(conn)
+                    # 新连接可以容纳多个stream，唤醒全部等待者重新分配
+                    self._wake(conn.capacity)
+                continue
+            waiter = asyncio.get_event_loop().create_future()
+            self._waiters.append(waiter)
+            await waiter
+        return None
+
+    async def _connect(self, connect_timeout):
+        reader, writer = await open_connection(self.host, self.port, self._ssl, connect_timeout)
+        if self._ssl is not None and writer.get_extra_info("ssl_object").selected_alpn_protocol() != "h2":
+            writer.close()
+            self._use_fallback()
+            return None
+        conn = H2Connection(reader, writer, self.max_streams, self._remove)
+        try:
+            await asyncio.wait_for(conn.handshake(), connect_timeout)
+        except (asyncio.TimeoutError, ConnectionError, h2.exceptions.H2Error):
+            conn.close()
+            if self.http2:
+                raise
+            # 服务端不支持h2c
+            self._use_fallback()
+            return None
+        self.http2 = True
+        return conn
+
+    def _use_fallback(self):
+        self.http2 = False
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def _remove(self, conn):
+        if conn in self._connections:
+            self._connections.remove(conn)
+        self._wake()
+
+    def _wake(self, count=1):
+        while self._waiters and count > 0:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                count -= 1
+
+    def close(self):
+        """关闭全部连接"""
+        for conn in list(self._connections):
+            conn.close()
+        self._connections = []
+        self._fallback.close()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+易盾反垃圾云服务进程内共享连接池
+各产品示例代码的API类默认共用同一个urllib3.PoolManager，按(scheme, host, port)区分连接池，
+同时创建多个API类实例时复用到as.dun.163.com、as-file.dun.163.com、as.dun.163yun.com的连接，
+避免重复建立连接及大量空闲连接
+    1. configure 在创建API类实例之前设置单个host的最大连接数maxsize及连接数用满时是否阻塞等待block
+    2. warm_up 启动时预先建立连接
+    3. stats 查看各host连接池的使用情况
+python版本：python3.7
+"""
+__author__ = 'yidun-dev'
+__date__ = '2026/10/18'
+__version__ = '0.2-dev'
+
+import threading
+import time
+
+import urllib3
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from common.endpoints import ENDPOINTS, endpoint_host
+
+
+class _PoolStatsMixin(object):
+    """记录连接借出、归还情况的连接池"""
+
+    def __init__(self, *args, **kwargs):
+        super(_PoolStatsMixin, self).__init__(*args, **kwargs)
+        self.in_use = 0  # 当前借出的连接数
+        self.peak_in_use = 0  # 借出连接数峰值
+        self.checkouts = 0  # 累计借出次数
+        self.wait_seconds = 0.0  # 累计等待空闲连接的时间，block为True时有意义
+        self._stats_lock = threading.Lock()
+
+    def _get_conn(self, timeout=None):
+        start = time.perf_counter()
+        conn = super(_PoolStatsMixin, self)._get_conn(timeout)
+        with self._stats_lock:
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+            self.checkouts += 1
+            self.wait_seconds += time.perf_counter() - start
+        return conn
+
+    def _put_conn(self, conn):
+        # 连接出错被丢弃时urllib3也会归还None占位，借出与归还总是成对出现
+        with self._stats_lock:
+            self.in_use -= 1
+        super(_PoolStatsMixin, self)._put_conn(conn)
+
+
+class StatsHTTPConnectionPool(_PoolStatsMixin, HTTPConnectionPool):
+    pass
+
+
+class StatsHTTPSConnectionPool(_PoolStatsMixin, HTTPSConnectionPool):
+    pass
+
+
+class PoolRegistry(object):
+    """按host共享的连接池注册表"""
+
+    def __init__(self, maxsize=10, block=False, **connection_pool_kw):
+        """
+        Args:
+            maxsize (int) 单个host保持的最大连接数
+            block (bool) 连接数达到maxsize时是否阻塞等待空闲连接，False时临时新建连接，用完后关闭
+            connection_pool_kw 其他传给urllib3连接池的参数，如retries、headers
+        """
+        self._lock = threading.Lock()
+        self._manager = None
+        self._kw = dict(connection_pool_kw, maxsize=maxsize, block=block)
+
+    def configure(self, maxsize=None, block=None, **connection_pool_kw):
+        """修改连接池参数，已创建的连接池会被关闭，之后的请求按新参数重新创建"""
+        with self._lock:
+            self._kw.update(connection_pool_kw)
+            if maxsize is not None:
+                self._kw["maxsize"] = maxsize
+            if block is not None:
+                self._kw["block"] = block
+            if self._manager is not None:
+                self._manager.clear()
+                self._manager = None
+
+    def pool_manager(self):
+        """Returns: 共享的urllib3.PoolManager"""
+        if self._manager is None:
+            with self._lock:
+                if self._manager is None:
+                    manager = urllib3.PoolManager(num_pools=16, **self._kw)
+                    manager.pool_classes_by_scheme = {
+                        "http": StatsHTTPConnectionPool,
+                        "https": StatsHTTPSConnectionPool,
+                    }
+                    self._manager = manager
+        return self._manager
+
+    def warm_up(self, urls=None, connections=1):
+        """预先建立连接
+        Args:
+            urls (list) 接口地址，默认为common.endpoints中全部接口涉及的host
+            connections (int) 每个host建立的连接数，不超过maxsize
+        Returns:
+            成功建立的连接数
+        """
+        if urls is None:
+            urls = sorted(set("%s://%s:%d" % endpoint_host(endpoint) for endpoint in ENDPOINTS.values()))
+        manager = self.pool_manager()
+        opened = 0
+        for url in urls:
+            pool = manager.connection_from_url(url)
+            conns = []
+            try:
+                for _ in range(min(connections, self._kw["maxsize"])):
+                    conn = pool._get_conn()
+                    conns.append(conn)
+                    if conn.sock is None:
+                        conn.connect()
+                        opened += 1
+            except Exception as ex:
+                print("连接预热失败:", url, str(ex))
+            finally:
+                for conn in conns:
+                    pool._put_conn(conn)
+        return opened
+
+    def stats(self):
+        """Returns: 各host连接池的使用情况"""
+        manager = self._manager
+        if manager is None:
+            return {}
+        result = {}
+        for key in list(manager.pools.keys()):
+            pool = manager.pools.get(key)
+            if pool is None:
+                continue
+            result["%s://%s:%s" % (pool.scheme, pool.host, pool.port)] = {
+                "maxsize": self._kw["maxsize"],
+                "block": self._kw["block"],
+                "connections_created": pool.num_connections,
+                "requests": pool.num_requests,
+                "checkouts": pool.checkouts,
+                "in_use": pool.in_use,
+                "peak_in_use": pool.peak_in_use,
+                "utilization": pool.in_use / float(self._kw["maxsize"]),
+                "wait_seconds": pool.wait_seconds,
+            }
+        return result
+
+    def clear(self):
+        """关闭全部连接"""
+        with self._lock:
+            if self._manager is not None:
+                self._manager.clear()
+
+
+_registry = PoolRegistry()
+
+
+def shared_pool_manager():
+    """Returns: 进程内共享的urllib3.PoolManager，供各产品示例代码的API类使用"""
+    return _registry.pool_manager()
+
+
+def configure(maxsize=None, block=None, **connection_pool_kw):
+    _registry.configure(maxsize, block, **connection_pool_kw)
+
+
+def warm_up(urls=None, connections=1):
+    return _registry.warm_up(urls, connections)
+
+
+def stats():
+    return _registry.stats()
+
+
+def clear():
+    _registry.clear()
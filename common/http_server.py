@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+易盾反垃圾云服务示例代码使用的轻量asyncio HTTP/1.1服务端
+仅用于接收主动回调、本地模拟服务等场景，支持keep-alive、Content-Length及chunked请求体
+python版本：python3.7
+"""
+__author__ = 'yidun-dev'
+__date__ = '2026/10/18'
+__version__ = '0.2-dev'
+
+import asyncio
+from urllib.parse import parse_qsl, urlsplit
+
+REASONS = {200: "OK", 400: "Bad Request", 401: "Unauthorized", 404: "Not Found",
+           413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class RequestTooLarge(ValueError):
+    """请求体超过max_body_bytes"""
+
+
+class HttpRequest(object):
+    """HTTP请求"""
+
+    __slots__ = ("method", "path", "query", "headers", "body")
+
+    def __init__(self, method, path, query, headers, body):
+        self.method = method
+        self.path = path
+        self.query = query
+        self.headers = headers
+        self.body = body
+
+    def form(self):
+        """Returns: 按application/x-www-form-urlencoded解析的请求参数"""
+        return dict(parse_qsl(self.body.decode("utf8"), keep_blank_values=True))
+
+
+class HttpResponse(object):
+    """HTTP响应"""
+
+    __slots__ = ("status", "body", "content_type")
+
+    def __init__(self, status=200, body=b"", content_type="application/json;charset=UTF-8"):
+        self.status = status
+        self.body = body
+        self.content_type = content_type
+
+
+async def read_request(reader, max_body_bytes):
+    """读取一个HTTP请求，连接关闭时返回None"""
+    request_line = await reader.readline()
+    if not request_line.strip():
+        return None
+    method, target, _ = request_line.decode("latin-1").split(" ", 2)
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        body = bytearray()
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            if size == 0:
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                break
+            if len(body) + size > max_body_bytes:
+                raise RequestTooLarge("request body too large")
+            body += await reader.readexactly(size)
+            await reader.readexactly(2)
+        body = bytes(body)
+    else:
+        length = int(headers.get("content-length", 0))
+        if length > max_body_bytes:
+            raise RequestTooLarge("request body too large")
+        body = await reader.readexactly(length) if length else b""
+    parts = urlsplit(target)
+    return HttpRequest(method, parts.path, parts.query, headers, body)
+
+
+class HttpServer(object):
+    """asyncio HTTP/1.1服务端"""
+
+    def __init__(self, handler, host="127.0.0.1", port=0, max_body_bytes=32 << 20, backlog=100):
+        """
+        Args:
+            handler (coroutine function) 请求处理函数，参数为HttpRequest，返回HttpResponse
+            host (str) 监听地址
+            port (int) 监听端口，0表示随机端口
+            max_body_bytes (int) 最大请求体字节数
+            backlog (int) 监听队列长度，需不小于同时建立的连接数
+        """
+        self.handler = handler
+        self.host = host
+        self.port = port
+        self.max_body_bytes = max_body_bytes
+        self.backlog = backlog
+        self._server = None
+        self._connections = {}
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._serve, self.host, self.port, backlog=self.backlog)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            # 关闭仍保持keep-alive的连接，并等待对应的连接处理协程退出
+            tasks = list(self._connections.values())
+            for writer in list(self._connections):
+                writer.close()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _serve(self, reader, writer):
+        self._connections[writer] = asyncio.current_task()
+        try:
+            while True:
+                try:
+                    request = await read_request(reader, self.max_body_bytes)
+                except RequestTooLarge:
+                    await self._write(writer, HttpResponse(413), False)
+                    break
+                except ValueError:
+                    await self._write(writer, HttpResponse(400), False)
+                    break
+                if request is None:
+                    break
+                try:
+                    response = await self.handler(request)
+                except Exception as ex:
+                    response = HttpResponse(500, str(ex).encode("utf8"), "text/plain;charset=UTF-8")
+                keep_alive = request.headers.get("connection", "").lower() != "close"
+                await self._write(writer, response, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._connections.pop(writer, None)
+            writer.close()
+
+    @staticmethod
+    async def _write(writer, response, keep_alive):
+        head = "HTTP/1.1 %d %s\r\nContent-Type: %s\r\nContent-Length: %d\r\nConnection: %s\r\n\r\n" % (
+            response.status, REASONS.get(response.status, "Unknown"), response.content_type,
+            len(response.body), "keep-alive" if keep_alive else "close")
+        writer.write(head.encode("latin-1") + response.body)
+        await writer.drain()
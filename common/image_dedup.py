@@ -0,0 +1,576 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+易盾反垃圾云服务图片检测去重缓存
+头像、表情包、重复上传等相同或近似图片直接使用本地保存的检测结果，减少计费调用和等待:
+    1. 内容哈希: base64图片按解码后的内容计算；url图片默认按url计算，fetch=True时下载后按内容计算，
+       下载失败或状态码不是200时不去重，交给接口检测；异步接口在线程池中下载，不阻塞事件循环
+    2. 感知哈希: 安装Pillow时计算64位dHash，海明距离不超过max_distance的图片视为近似图片
+    3. 磁盘索引: 每张图片一条28字节的定长记录；内容哈希按有序数组二分查找，感知哈希分为3段做多索引哈希
+       (海明距离不超过d的两张图片至少有一段的距离不超过d//3，只需枚举各段的近邻取值)，新增记录先写入内存增量索引，达到compact_threshold后
+       在后台子进程中重建磁盘索引，重建期间查找仍使用旧索引和增量索引，完成后由下一次add切换；千万级记录时单次查找只需访问少量候选记录，
+       在1毫秒以内，见benchmark/bench_image_dedup.py；记录文件使用os.pread/os.pwrite按偏移读写，仅支持Linux、macOS等Unix系统
+依赖Pillow(可选): pip install Pillow
+python版本：python3.7
+运行:
+    1. 修改 SECRET_ID,SECRET_KEY,BUSINESS_ID 为对应申请到的值
+    2. $ python -m common.image_dedup
+"""
+__author__ = 'yidun-dev'
+__date__ = '2026/10/18'
+__version__ = '0.2-dev'
+
+import asyncio
+import base64
+import bisect
+import functools
+import hashlib
+import io
+import json
+import mmap
+import multiprocessing
+import os
+import struct
+import time
+from array import array
+from itertools import accumulate, combinations
+
+from common import json_codec
+from common.check_wrapper import replace_check
+
+try:
+    from PIL import Image
+except ImportError:  # 未安装Pillow时只按内容哈希去重
+    Image = None
+
+RECORD = struct.Struct("<QQBBxxII")  # 感知哈希, 内容哈希, suggestion, 最高分类级别, 最高级别分类, 写入时间
+RECORD_HASHES = struct.Struct("<QQ%dx" % (RECORD.size - 16))  # 重建索引时只读取两个哈希
+# 感知哈希分段(起始位, 位数)，千万级记录时每段每个取值平均只有几条记录
+BLOCKS = ((0, 22), (22, 21), (43, 21))
+INDEX_FILES = ("content.keys", "content.ids") + tuple(
+    "block%d.%s" % (i, kind) for i in range(len(BLOCKS)) for kind in ("offsets", "ids"))
+
+
+def _index_file(name, generation):
+    """Returns: 第generation次重建的索引文件名，每次重建写入新文件，不影响正在映射的旧索引"""
+    return "%s.%d" % (name, generation) if generation else name
+
+
+def content_hash(data):
+    """Returns: 64位内容哈希，不为0"""
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little") or 1
+
+
+def perceptual_hash(data):
+    """计算64位dHash
+    Returns:
+        感知哈希，未安装Pillow或图片无法解码时返回0
+    """
+    if Image is None:
+        return 0
+    try:
+        image = Image.open(io.BytesIO(data)).convert("L").resize((9, 8))
+    except Exception:
+        return 0
+    pixels = list(image.getdata())
+    value = 0
+    for row in range(8):
+        for col in range(8):
+            value = (value << 1) | (pixels[row * 9 + col] > pixels[row * 9 + col + 1])
+    return value
+
+
+def hamming(a, b):
+    return bin(a ^ b).count("1")
+
+
+def _blocks(phash):
+    return [(phash >> shift) & ((1 << bits) - 1) for shift, bits in BLOCKS]
+
+
+def _neighbors(value, bits, radius):
+    """Returns: 与value海明距离不超过radius的全部bits位取值"""
+    result = [value]
+    for r in range(1, radius + 1):
+        for flips in combinations(range(bits), r):
+            flipped = value
+            for bit in flips:
+                flipped ^= 1 << bit
+            result.append(flipped)
+    return result
+
+
+def _remove_stale(path, generation):
+    """删除第generation次以外的索引文件，删除数百MB的文件需要数十毫秒，由下一次重建的子进程或重新打开时删除"""
+    current = set(_index_file(name, generation) for name in INDEX_FILES)
+    for name in os.listdir(path):
+        for base in INDEX_FILES:
+            if name != base and not (name.startswith(base + ".") and name[len(base) + 1:].isdigit()):
+                continue
+            if name not in current:
+                os.remove(os.path.join(path, name))
+            break
+
+
+def _write_index(path, name, values):
+    tmp = os.path.join(path, name + ".tmp")
+    with open(tmp, "wb") as f:
+        values.tofile(f)
+    os.replace(tmp, os.path.join(path, name))
+
+
+def _build_index(path, count, generation):
+    """在子进程中为前count条记录构建第generation次索引，只写入新文件，不修改正在使用的索引"""
+    if hasattr(os, "nice"):
+        os.nice(10)  # CPU核数较少时优先调度处理请求的进程
+    _remove_stale(path, generation - 1)  # 当前进程已不再映射更早版本的索引
+    with open(os.path.join(path, "records.bin"), "rb") as f:
+        data = f.read(count * RECORD.size)
+    phashes, keys = array("Q"), array("Q")
+    for phash, key in RECORD_HASHES.iter_unpack(data):
+        phashes.append(phash)
+        keys.append(key)
+    del data
+    order = sorted(range(count), key=keys.__getitem__)
+    _write_index(path, _index_file("content.keys", generation), array("Q", (keys[i] for i in order)))
+    _write_index(path, _index_file("content.ids", generation), array("I", order))
+    del keys, order
+    for block, (shift, bits) in enumerate(BLOCKS):
+        mask = (1 << bits) - 1
+        # 按分段取值计数排序
+        counts = array("I", bytes(4 * (mask + 2)))
+        for phash in phashes:
+            if phash:
+                counts[((phash >> shift) & mask) + 1] += 1
+        counts = array("I", accumulate(counts))
+        offsets = array("I", counts)
+        ids = array("I", bytes(4 * offsets[-1]))
+        for record_id, phash in enumerate(phashes):
+            if phash:
+                value = (phash >> shift) & mask
+                ids[counts[value]] = record_id
+                counts[value] += 1
+        _write_index(path, _index_file("block%d.offsets" % block, generation), offsets)
+        _write_index(path, _index_file("block%d.ids" % block, generation), ids)
+    tmp = os.path.join(path, "meta.json.tmp")
+    with open(tmp, "w") as f:
+        json.dump({"indexed": count, "generation": generation}, f)
+    os.replace(tmp, os.path.join(path, "meta.json"))
+
+
+class _Delta(object):
+    """尚未写入磁盘索引的记录"""
+
+    __slots__ = ("records", "content", "blocks")
+
+    def __init__(self):
+        self.records = {}  # 记录序号 -> 记录
+        self.content = {}  # 内容哈希 -> 记录序号
+        self.blocks = [{} for _ in BLOCKS]  # 感知哈希分段取值 -> 记录序号列表
+
+    def add(self, record_id, record):
+        self.records[record_id] = record
+        self.content[record[1]] = record_id
+        if record[0]:
+            for i, value in enumerate(_blocks(record[0])):
+                self.blocks[i].setdefault(value, []).append(record_id)
+
+
+class ImageDedupIndex(object):
+    """图片哈希到检测结果的磁盘索引"""
+
+    def __init__(self, path, compact_threshold=200000):
+        """
+        Args:
+            path (str) 索引目录
+            compact_threshold (int) 内存增量索引达到该条数时在后台重建磁盘索引
+        """
+        self.path = path
+        self.compact_threshold = compact_threshold
+        os.makedirs(path, exist_ok=True)
+        self._fd = os.open(self._file("records.bin"), os.O_RDWR | os.O_CREAT, 0o644)
+        self._count = os.fstat(self._fd).st_size // RECORD.size
+        self._maps = []
+        self._compactor = None  # 后台重建子进程
+        self._compacting = None  # 后台重建的(已索引条数, 索引版本)
+        self._frozen = None  # 后台重建中的增量记录，重建完成后丢弃
+        self._disposing = []  # 待逐步释放的增量索引表
+        self._load()
+
+    def _file(self, name):
+        return os.path.join(self.path, name)
+
+    def _map(self, name, typecode):
+        """Returns: 只读映射的文件内容，文件为空时返回空数组"""
+        with open(self._file(_index_file(name, self._generation)), "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return array(typecode)
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append(mapped)
+        return memoryview(mapped).cast(typecode)
+
+    def _map_index(self, indexed, generation):
+        """映射第generation次重建的磁盘索引"""
+        self._release()
+        self._indexed = indexed
+        self._generation = generation
+        if indexed:
+            self._content_keys = self._map("content.keys", "Q")
+            self._content_ids = self._map("content.ids", "I")
+            self._block_offsets = [self._map("block%d.offsets" % i, "I") for i in range(len(BLOCKS))]
+            self._block_ids = [self._map("block%d.ids" % i, "I") for i in range(len(BLOCKS))]
+            with open(self._file("records.bin"), "rb") as f:
+                self._records = mmap.mmap(f.fileno(), indexed * RECORD.size, access=mmap.ACCESS_READ)
+            self._maps.append(self._records)
+
+    def _load(self):
+        """加载磁盘索引，并把尚未合并的记录读入内存增量索引"""
+        meta = {"indexed": 0}
+        if os.path.exists(self._file("meta.json")):
+            with open(self._file("meta.json")) as f:
+                meta = json.load(f)
+        self._map_index(meta["indexed"], meta.get("generation", 0))
+        self._delta = _Delta()
+        for i in range(self._indexed, self._count):
+            self._delta.add(i, RECORD.unpack(os.pread(self._fd, RECORD.size, i * RECORD.size)))
+        _remove_stale(self.path, self._generation)
+
+    def _release(self):
+        self._content_keys = self._content_ids = self._records = None
+        self._block_offsets = self._block_ids = []
+        for mapped in self._maps:
+            if isinstance(mapped, memoryview):
+                mapped.release()
+        for mapped in self._maps:
+            if isinstance(mapped, mmap.mmap):
+                mapped.close()
+        self._maps = []
+
+    def __len__(self):
+        return self._count
+
+    def _deltas(self):
+        """Returns: 按新旧顺序排列的增量索引"""
+        return (self._delta,) if self._frozen is None else (self._delta, self._frozen)
+
+    def record(self, record_id):
+        """Returns: (感知哈希, 内容哈希, suggestion, level, label, 写入时间)"""
+        for delta in self._deltas():
+            record = delta.records.get(record_id)
+            if record is not None:
+                return record
+        return RECORD.unpack_from(self._records, record_id * RECORD.size)
+
+    def find_content(self, key):
+        """Returns: 内容哈希对应的记录序号，不存在时返回None"""
+        for delta in self._deltas():
+            record_id = delta.content.get(key)
+            if record_id is not None:
+                return record_id
+        if self._indexed:
+            pos = bisect.bisect_left(self._content_keys, key)
+            if pos < self._indexed and self._content_keys[pos] == key:
+                return self._content_ids[pos]
+        return None
+
+    def find_similar(self, phash, max_distance):
+        """Returns: (记录序号, 海明距离)，没有近似图片时返回None"""
+        if not phash:
+            return None
+        best = None
+        radius = max_distance // len(BLOCKS)
+        seen = set()
+        deltas = self._deltas()
+        for i, value in enumerate(_blocks(phash)):
+            for candidate in _neighbors(value, BLOCKS[i][1], radius):
+                ids = []
+                for delta in deltas:
+                    ids.extend(delta.blocks[i].get(candidate, ()))
+                if self._indexed:
+                    offsets = self._block_offsets[i]
+                    ids.extend(self._block_ids[i][offsets[candidate]:offsets[candidate + 1]])
+                for record_id in ids:
+                    if record_id in seen:
+                        continue
+                    seen.add(record_id)
+                    distance = hamming(phash, self.record(record_id)[0])
+                    if distance <= max_distance and (best is None or distance < best[1]):
+                        best = (record_id, distance)
+                        if distance == 0:
+                            return best
+        return best
+
+    def add(self, phash, key, suggestion, level, label, created=None):
+        """新增或更新记录
+        Returns:
+            记录序号
+        """
+        record_id = self.find_content(key)
+        if record_id is None:
+            record_id = self._count
+            self._count += 1
+        record = (phash, key, suggestion, level, label, int(created or time.time()))
+        os.pwrite(self._fd, RECORD.pack(*record), record_id * RECORD.size)
+        # 更新已有记录时分段索引中可能残留旧的感知哈希，查找时按记录重新计算海明距离，不影响结果
+        self._delta.add(record_id, record)
+        self._dispose()
+        if self._compactor is not None and not self._compactor.is_alive():
+            self._swap()
+        if len(self._delta.records) >= self.compact_threshold and self._compactor is None:
+            self.compact(wait=False)
+        return record_id
+
+    def compact(self, wait=True):
+        """将全部记录重建为磁盘索引
+        Args:
+            wait (bool) 是否等待重建完成；False时在后台子进程中重建，完成后由下一次add切换到新索引
+        """
+        if self._compactor is None:
+            # 当前增量记录全部在前count条中，由新索引覆盖；重建期间新增或更新的记录写入新的增量索引
+            self._frozen, self._delta = self._delta, _Delta()
+            # 重建在子进程中进行，排序等耗时计算不占用当前进程的GIL，不阻塞事件循环
+            self._compacting = (self._count, self._generation + 1)
+            self._compactor = multiprocessing.Process(target=_build_index, args=(self.path,) + self._compacting,
+                                                      name="image-dedup-compact", daemon=True)
+            self._compactor.start()
+        if wait:
+            self._compactor.join()
+            if self._swap() and self._delta.records:  # 已在后台进行的重建不包含之后新增或更新的记录
+                self.compact()
+
+    def _swap(self):
+        """切换到后台重建完成的索引，丢弃已被新索引覆盖的增量记录
+        Returns:
+            重建是否成功
+        """
+        compactor, self._compactor = self._compactor, None
+        if compactor.exitcode != 0:
+            # 保留旧索引，重建期间的增量记录并回当前增量索引，下次达到阈值时重试
+            print("重建图片去重索引失败: exitcode=%s" % compactor.exitcode)
+            frozen, self._frozen = self._frozen, None
+            for record_id, record in frozen.records.items():
+                if record_id not in self._delta.records:
+                    self._delta.add(record_id, record)
+            return False
+        self._map_index(*self._compacting)
+        frozen, self._frozen = self._frozen, None
+        self._disposing.extend([frozen.records, frozen.content] + frozen.blocks)
+        return True
+
+    def _dispose(self, limit=256):
+        """逐步释放已被新索引覆盖的增量记录，一次释放数十万个对象需要数十毫秒，会阻塞事件循环"""
+        while self._disposing and limit > 0:
+            table = self._disposing[-1]
+            if table:
+                table.popitem()
+                limit -= 1
+            else:
+                self._disposing.pop()
+
+    def close(self):
+        if self._compactor is not None:
+            # 等待后台重建写完，下次打开时直接加载新索引
+            self._compactor.join()
+            self._compactor = None
+        self._release()
+        os.close(self._fd)
+
+
+class ImageDedupCache(object):
+    """图片检测去重缓存"""
+
+    def __init__(self, path, max_distance=4, max_age=None, fetch=False, compact_threshold=200000):
+        """
+        Args:
+            path (str) 索引目录
+            max_distance (int) 近似图片的最大海明距离，0表示只按内容去重
+            max_age (float) 检测结果有效期，秒，None表示一直有效
+            fetch (bool) url图片是否下载后按内容计算哈希
+            compact_threshold (int) 内存增量索引达到该条数时在后台重建磁盘索引
+        """
+        self.index = ImageDedupIndex(path, compact_threshold)
+        self.max_distance = max_distance
+        self.max_age = max_age
+        self.fetch = fetch
+        self.hits = 0
+        self.similar_hits = 0  # 其中按感知哈希命中的次数
+        self.misses = 0
+
+    def hashes(self, image):
+        """计算图片哈希
+        Args:
+            image (dict) images参数中的单张图片，包含name、type、data
+        Returns:
+            (内容哈希, 感知哈希)，fetch=True时下载失败返回None
+        """
+        data = image.get("data", "")
+        if image.get("type") == 2:
+            raw = base64.b64decode(data)
+        elif self.fetch:
+            from common.http_pool import shared_pool_manager
+            try:
+                response = shared_pool_manager().request("GET", data, timeout=5.0)
+            except Exception:
+                return None
+            if response.status != 200:
+                # 不按错误页面的内容去重
+                return None
+            raw = response.data
+        else:
+            return content_hash(("url:" + data).encode("utf8")), 0
+        return content_hash(raw), perceptual_hash(raw) if self.max_distance else 0
+
+    def lookup(self, key, phash=0):
+        """Returns: 缓存的检测结果，dict，包含suggestion、label、level、distance，未命中时返回None"""
+        record_id, distance = self.index.find_content(key), 0
+        if record_id is None and self.max_distance:
+            found = self.index.find_similar(phash, self.max_distance)
+            if found is not None:
+                record_id, distance = found
+        if record_id is not None:
+            _, _, suggestion, level, label, created = self.index.record(record_id)
+            if self.max_age is None or time.time() - created <= self.max_age:
+                self.hits += 1
+                if distance:
+                    self.similar_hits += 1
+                return {"suggestion": suggestion, "label": label, "level": level, "distance": distance}
+        self.misses += 1
+        return None
+
+    def store(self, hashes, antispam):
+        """保存检测结果
+        Args:
+            hashes (tuple) hashes返回的(内容哈希, 感知哈希)
+            antispam (dict) 检测结果中的antispam，只保存检测成功的结果
+        """
+        if antispam.get("status", 2) != 2 or antispam.get("suggestion") is None:
+            return
+        labels = antispam.get("labels") or []
+        top = max(labels, key=lambda item: item.get("level") or 0) if labels else {}
+        self.index.add(hashes[1], hashes[0], antispam["suggestion"], top.get("level") or 0, top.get("label") or 0)
+
+    def hash_images(self, images):
+        """Returns: name->(内容哈希, 感知哈希)，不含下载失败的图片"""
+        keys = {}
+        for image in images:
+            hashes = self.hashes(image)
+            if hashes is not None:
+                keys[image["name"]] = hashes
+        return keys
+
+    def split(self, images, keys=None):
+        """按缓存拆分待检测图片
+        Args:
+            images (list) images参数
+            keys (dict) hash_images的结果，None表示在此计算
+        Returns:
+            (命中的结果 name->result_item, 未命中的图片列表, name->(内容哈希, 感知哈希))
+        """
+        if keys is None:
+            keys = self.hash_images(images)
+        hits, misses = {}, []
+        for image in images:
+            hashes = keys.get(image["name"])
+            if hashes is None:
+                self.misses += 1
+                misses.append(image)
+                continue
+            verdict = self.lookup(*hashes)
+            if verdict is None:
+                misses.append(image)
+                continue
+            labels = [{"label": verdict["label"], "level": verdict["level"]}] if verdict["label"] else []
+            hits[image["name"]] = {"antispam": {
+                "name": image["name"], "status": 2, "suggestion": verdict["suggestion"], "labels": labels,
+                "cached": True, "distance": verdict["distance"]}}
+        return hits, misses, keys
+
+    def merge(self, images, hits, keys, ret):
+        """保存接口返回的结果，并按原始顺序合并缓存命中的结果"""
+        if ret is None or ret.get("code") != 200:
+            return ret
+        for item in ret.get("result") or []:
+            antispam = item.get("antispam") or {}
+            if antispam.get("name") in keys:
+                self.store(keys[antispam["name"]], antispam)
+        results = dict((item.get("antispam", {}).get("name"), item) for item in ret.get("result") or [])
+        results.update(hits)
+        ret["result"] = [results[image["name"]] for image in images if image["name"] in results]
+        return ret
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.index),
+            "hits": self.hits,
+            "similar_hits": self.similar_hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / float(lookups) if lookups else 0.0,
+        }
+
+    def wrap(self, api):
+        """为图片在线检测接口增加去重
+        Args:
+            api (object) ImageCheckAPIDemo实例、APIClient.image_check或AsyncAPIClient.endpoint("image_check")
+        Returns:
+            替换check后的接口，见common.check_wrapper.replace_check
+        """
+        check = api.check
+
+        def prepare(params, images, keys=None):
+            hits, misses, keys = self.split(images, keys)
+            return hits, misses, keys, dict(params, images=json_codec.dumps(misses))
+
+        def cached_only(hits, images):
+            return {"code": 200, "msg": "ok", "result": [hits[image["name"]] for image in images]}
+
+        if asyncio.iscoroutinefunction(check):
+            @functools.wraps(check)
+            async def deduped(params=None, *args, **kwargs):
+                images, keys = json_codec.loads(params["images"]), None
+                if self.fetch:
+                    # 下载图片是阻塞调用，放到线程池；索引只在事件循环线程中访问
+                    keys = await asyncio.get_event_loop().run_in_executor(None, self.hash_images, images)
+                hits, misses, keys, params = prepare(params, images, keys)
+                if not misses:
+                    return cached_only(hits, images)
+                return self.merge(images, hits, keys, await check(params, *args, **kwargs))
+        else:
+            @functools.wraps(check)
+            def deduped(params, *args, **kwargs):
+                images = json_codec.loads(params["images"])
+                hits, misses, keys, params = prepare(params, images)
+                if not misses:
+                    return cached_only(hits, images)
+                return self.merge(images, hits, keys, check(params, *args, **kwargs))
+        return replace_check(api, deduped)
+
+    def close(self):
+        self.index.close()
+
+
+async def main():
+    from common.async_client import AsyncAPIClient
+
+    SECRET_ID = "your_secret_id"  # 产品密钥ID，产品标识
+    SECRET_KEY = "your_secret_key"  # 产品私有密钥，服务端生成签名信息使用，请严格保管，避免泄露
+    BUSINESS_ID = "your_business_id"  # 业务ID，易盾根据产品业务特点分配
+    cache = ImageDedupCache("image_dedup_index", max_distance=4, max_age=7 * 86400)
+    images = [{"name": "avatar-%d" % i, "type": 1,
+               "data": "https://nos.netease.com/yidun/2-0-0-a6133509763d4d6eac881a58f1791976.jpg"} for i in range(3)]
+    async with AsyncAPIClient(SECRET_ID, SECRET_KEY, BUSINESS_ID) as client:
+        image_check = cache.wrap(client.endpoint("image_check"))
+        for image in images:
+            ret = await image_check.check({"images": json_codec.dumps([image])})
+            if ret is not None and ret["code"] == 200:
+                for item in ret["result"]:
+                    antispam: dict = item["antispam"]
+                    print("name: %s, suggestion: %s, cached: %s"
+                          % (antispam["name"], antispam.get("suggestion"), antispam.get("cached", False)))
+    print(cache.stats())
+    cache.close()
+
+
+if __name__ == "__main__":
+    """示例代码入口"""
+    asyncio.run(main())
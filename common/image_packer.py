@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+易盾反垃圾云服务图片批量打包检测组件
+将图片流按接口的单次图片数量上限和请求体大小上限装箱为多次图片在线检测(image_check)请求，并发发送后按name回填
+antispam/ocr/face/quality等检测结果，同时统计装箱率和单次请求字节数
+请求体大小按urlencode后的字节数计算，base64图片按编码后的大小计入
+python版本：python3.7
+运行:
+    1. 修改 SECRET_ID,SECRET_KEY,BUSINESS_ID 为对应申请到的值
+    2. $ python -m common.image_packer
+"""
+__author__ = 'yidun-dev'
+__date__ = '2026/10/18'
+__version__ = '0.2-dev'
+
+import asyncio
+from urllib.parse import quote_plus
+
+from common import json_codec
+from common.async_client import AsyncAPIClient
+
+MAX_ITEMS = 32  # 单次请求最大图片数，以接口文档为准
+MAX_BODY_BYTES = 10 << 20  # 单次请求体大小上限，以接口文档为准
+
+
+def encoded_size(image):
+    """估算单张图片在images参数中urlencode后的字节数
+    Args:
+        image (dict) 图片参数，包含name、type、data
+    Returns:
+        字节数
+    """
+    data = image.get("data", "")
+    meta = dict(image, data="")
+    size = len(quote_plus(json_codec.dumps(meta))) + 3  # 加上分隔符","
+    if image.get("type") == 2:
+        # base64字符中只有+/=会被转义为三个字符
+        size += len(data) + 2 * (data.count("+") + data.count("/") + data.count("="))
+    else:
+        size += len(quote_plus(json_codec.dumps(data))) - 6
+    return size
+
+
+def pack(images, max_items=MAX_ITEMS, max_body_bytes=MAX_BODY_BYTES):
+    """将图片流装箱
+    Args:
+        images (iterable) 图片参数流
+        max_items (int) 单批最大图片数
+        max_body_bytes (int) 单批images参数最大字节数，单张超出上限的图片单独成批
+    Returns:
+        生成器，每次产出(图片列表, images参数字节数)
+    """
+    batch, names, batch_bytes = [], set(), 0
+    for image in images:
+        size = encoded_size(image)
+        if batch and (len(batch) >= max_items or batch_bytes + size > max_body_bytes or image["name"] in names):
+            yield batch, batch_bytes
+            batch, names, batch_bytes = [], set(), 0
+        batch.append(image)
+        names.add(image["name"])
+        batch_bytes += size
+    if batch:
+        yield batch, batch_bytes
+
+
+class ImageBatchPacker(object):
+    """图片批量打包检测"""
+
+    def __init__(self, client, max_items=MAX_ITEMS, max_body_bytes=MAX_BODY_BYTES, concurrency=8):
+        """
+        Args:
+            client (AsyncAPIClient) 异步客户端
+            max_items (int) 单批最大图片数
+            max_body_bytes (int) 单批images参数最大字节数
+            concurrency (int) 最大并发请求数
+        """
+        self.client = client
+        self.max_items = max_items
+        self.max_body_bytes = max_body_bytes
+        self.concurrency = concurrency
+        self.images = 0  # 累计图片数
+        self.batches = 0  # 累计请求数
+        self.body_bytes = 0  # 累计images参数字节数
+
+    def stats(self):
+        """Returns: 装箱统计信息"""
+        batches = self.batches or 1
+        return {
+            "images": self.images,
+            "batches": self.batches,
+            "item_fill_ratio": self.images / batches / self.max_items,
+            "byte_fill_ratio": self.body_bytes / batches / self.max_body_bytes,
+            "bytes_per_request": self.body_bytes / batches,
+        }
+
+    async def check(self, images, params=None):
+        """批量检测图片
+        Args:
+            images (iterable) 图片参数流，name需唯一
+            params (dict) images以外的其他请求参数
+        Returns:
+            dict，name到检测结果的映射，检测结果包含antispam、ocr、face、quality等，请求失败的图片为None
+        """
+        results = {}
+        semaphore = asyncio.Semaphore(self.concurrency)
+        tasks = []
+        for batch, batch_bytes in pack(images, self.max_items, self.max_body_bytes):
+            await semaphore.acquire()
+            self.images += len(batch)
+            self.batches += 1
+            self.body_bytes += batch_bytes
+            task = asyncio.ensure_future(self._send(batch, params, results))
+            task.add_done_callback(lambda _: semaphore.release())
+            tasks.append(task)
+        if tasks:
+            await asyncio.gather(*tasks)
+        return results
+
+    async def _send(self, batch, params, results):
+        request_params = dict(params or {})
+        request_params["images"] = json_codec.dumps(batch)
+        for image in batch:
+            results[image["name"]] = None
+        ret = await self.client.check("image_check", request_params)
+        if ret is None or ret["code"] != 200:
+            if ret is not None:
+                print("ERROR: code=%s, msg=%s" % (ret["code"], ret["msg"]))
+            return
+        for result_item in ret["result"]:
+            for value in result_item.values():
+                if isinstance(value, dict) and value.get("name") in results:
+                    results[value["name"]] = result_item
+                    break
+
+
+async def main():
+    SECRET_ID = "your_secret_id"  # 产品密钥ID，产品标识
+    SECRET_KEY = "your_secret_key"  # 产品私有密钥，服务端生成签名信息使用，请严格保管，避免泄露
+    BUSINESS_ID = "your_business_id"  # 业务ID，易盾根据产品业务特点分配
+    async with AsyncAPIClient(SECRET_ID, SECRET_KEY, BUSINESS_ID) as client:
+        packer = ImageBatchPacker(client)
+        images = ({
+            "name": "image-%d" % i,
+            "type": 1,
+            "data": "https://nos.netease.com/yidun/2-0-0-a6133509763d4d6eac881a58f1791976.jpg"
+        } for i in range(100))
+        results = await packer.check(images)
+        for name, result_item in results.items():
+            if result_item is not None:
+                antispam: dict = result_item["antispam"]
+                print("name: %s, taskId: %s, suggestion: %s"
+                      % (name, antispam["taskId"], antispam.get("suggestion")))
+        print(packer.stats())
+
+
+if __name__ == "__main__":
+    """示例代码入口"""
+    asyncio.run(main())
@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+易盾反垃圾云服务本地图片流式提交组件
+图片可以是文件路径、bytes、memoryview或mmap，文件通过mmap映射读取，按块完成base64编码、JSON拼接和表单编码，
+签名计算和请求体均逐块生成，通过chunked方式发送，内存峰值与分块大小相关，而不是图片大小的数倍
+适用于图片在线检测(image_check)、图片批量提交(image_submit)等接受images参数的接口
+python版本：python3.7
+运行:
+    1. 修改 SECRET_ID,SECRET_KEY,BUSINESS_ID 为对应申请到的值
+    2. $ python -m common.image_stream image1.jpg image2.png
+"""
+__author__ = 'yidun-dev'
+__date__ = '2026/10/18'
+__version__ = '0.2-dev'
+
+import asyncio
+import base64
+import json
+import mmap
+import os
+import sys
+from contextlib import contextmanager
+from urllib.parse import quote_plus
+
+CHUNK_SIZE = 48 << 10  # 每块原始字节数，须为3的倍数以保证分块base64编码结果与整体编码一致
+
+
+class ImageSource(object):
+    """单张base64方式提交的图片"""
+
+    def __init__(self, name, source, **extra):
+        """
+        Args:
+            name (str) 图片名称，检测结果按name回填
+            source (str|bytes|memoryview|mmap) 图片文件路径或图片内容
+            extra 其他图片参数，如callbackUrl
+        """
+        self.name = name
+        self.source = source
+        self.extra = extra
+
+    @contextmanager
+    def open(self):
+        """Returns: 图片内容的memoryview，文件通过mmap映射，不读入内存"""
+        if isinstance(self.source, (str, os.PathLike)):
+            with open(self.source, "rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    yield memoryview(b"")
+                    return
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    view = memoryview(mapped)
+                    try:
+                        yield view
+                    finally:
+                        view.release()
+        else:
+            yield memoryview(self.source)
+
+    def size(self):
+        """Returns: 图片原始字节数"""
+        if isinstance(self.source, (str, os.PathLike)):
+            return os.path.getsize(self.source)
+        return memoryview(self.source).nbytes
+
+    def iter_text(self, chunk_size=CHUNK_SIZE):
+        """逐块生成该图片的JSON文本"""
+        meta = {"name": self.name, "type": 2}
+        meta.update(self.extra)
+        yield json.dumps(meta)[:-1] + ', "data": "'
+        with self.open() as view:
+            for i in range(0, len(view), chunk_size):
+                yield base64.b64encode(view[i:i + chunk_size]).decode("ascii")
+        yield '"}'
+
+
+class StreamingImages(object):
+    """images参数的流式表示，可直接作为请求参数值使用
+    签名和请求体编码通过iter_text逐块获取内容，str()会生成完整JSON，兼容原有示例代码
+    """
+
+    def __init__(self, images, chunk_size=CHUNK_SIZE):
+        """
+        Args:
+            images (list) 图片列表，元素为ImageSource或URL方式提交的图片参数dict
+            chunk_size (int) 每块原始字节数，须为3的倍数
+        """
+        if chunk_size % 3:
+            raise ValueError("chunk_size must be a multiple of 3")
+        self.images = images
+        self.chunk_size = chunk_size
+
+    def iter_text(self):
+        """逐块生成与json.dumps(images)等价的JSON文本"""
+        yield "["
+        for i, image in enumerate(self.images):
+            if i:
+                yield ", "
+            if isinstance(image, ImageSource):
+                for chunk in image.iter_text(self.chunk_size):
+                    yield chunk
+            else:
+                yield json.dumps(image)
+        yield "]"
+
+    def encoded_size(self):
+        """估算urlencode后的字节数，不读取图片内容"""
+        size = 0
+        for image in self.images:
+            if isinstance(image, ImageSource):
+                # base64字符中+/=转义后变为三个字符，按均匀分布估算
+                size += int(4 * ((image.size() + 2) // 3) * 1.07) + len(quote_plus(json.dumps(image.extra))) + 64
+            else:
+                size += len(quote_plus(json.dumps(image))) + 6
+        return size
+
+    def __str__(self):
+        return "".join(self.iter_text())
+
+
+def is_streaming(value):
+    """Returns: 参数值是否支持逐块读取"""
+    return hasattr(value, "iter_text")
+
+
+def form_body_size(params):
+    """估算urlencode(params)的字节数，StreamingImages不读取图片内容"""
+    size = 0
+    for k, v in params.items():
+        size += len(quote_plus(str(k))) + 2
+        size += v.encoded_size() if is_streaming(v) else len(quote_plus(str(v)))
+    return size
+
+
+def iter_form_body(params):
+    """逐块生成application/x-www-form-urlencoded请求体，结果与urlencode(params)一致
+    Args:
+        params (dict) 请求参数，值可以是StreamingImages
+    Returns:
+        bytes生成器
+    """
+    for i, (k, v) in enumerate(params.items()):
+        prefix = ("&" if i else "") + quote_plus(str(k)) + "="
+        if is_streaming(v):
+            yield prefix.encode("ascii")
+            for chunk in v.iter_text():
+                yield quote_plus(chunk).encode("ascii")
+        else:
+            yield (prefix + quote_plus(str(v))).encode("ascii")
+
+
+async def main():
+    from common.async_client import AsyncAPIClient
+
+    SECRET_ID = "your_secret_id"  # 产品密钥ID，产品标识
+    SECRET_KEY = "your_secret_key"  # 产品私有密钥，服务端生成签名信息使用，请严格保管，避免泄露
+    BUSINESS_ID = "your_business_id"  # 业务ID，易盾根据产品业务特点分配
+    paths = sys.argv[1:]
+    async with AsyncAPIClient(SECRET_ID, SECRET_KEY, BUSINESS_ID) as client:
+        params = {
+            "images": StreamingImages([ImageSource(os.path.basename(path), path) for path in paths])
+        }
+        ret = await client.check("image_check", params)
+        if ret is None:
+            return
+        if ret["code"] == 200:
+            for resultItem in ret["result"]:
+                antispam: dict = resultItem["antispam"]
+                print("name: %s, taskId: %s, suggestion: %s"
+                      % (antispam["name"], antispam["taskId"], antispam.get("suggestion")))
+        else:
+            print("ERROR: code=%s, msg=%s" % (ret["code"], ret["msg"]))
+
+
+if __name__ == "__main__":
+    """示例代码入口"""
+    asyncio.run(main())
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+易盾反垃圾云服务JSON编解码
+安装orjson时使用orjson编解码，否则使用标准库json，可通过set_backend切换:
+    1. dumps 用于images、texts、content等参与签名的嵌套参数，输出固定为紧凑格式(separators=(",", ":"),
+       ensure_ascii=False)；orjson只处理由dict/list/tuple/str/int/bool/None组成且整数在64位范围内的对象，
+       其余对象(如含float，orjson与标准库的指数格式不同)使用标准库，保证两种实现输出的字符串逐字节一致，
+       同一参数无论是否安装orjson签名都相同
+    2. loads 用于解析响应，orjson不支持的输入(如NaN)回退为标准库；注意orjson将超过64位的整数解析为float，
+       易盾接口响应中的taskId等长数字均为字符串，不受影响
+    3. dumpb 输出utf8编码的bytes，用于本地模拟服务等不参与签名的场景
+依赖orjson(可选): pip install orjson
+python版本：python3.7
+"""
+__author__ = 'yidun-dev'
+__date__ = '2026/10/18'
+__version__ = '0.2-dev'
+
+import json
+
+try:
+    import orjson
+except ImportError:  # 未安装orjson时使用标准库
+    orjson = None
+
+SEPARATORS = (",", ":")
+
+_SCALARS = frozenset([str, int, bool, type(None)])
+_INT_MIN = -(1 << 63)
+_INT_MAX = (1 << 64) - 1
+
+_backend = "orjson" if orjson is not None else "json"
+
+
+def backend():
+    """Returns: 当前使用的实现，orjson或json"""
+    return _backend
+
+
+def set_backend(name):
+    """切换实现
+    Args:
+        name (str) orjson或json
+    """
+    global _backend
+    if name not in ("orjson", "json"):
+        raise ValueError("unknown json backend: %s" % name)
+    if name == "orjson" and orjson is None:
+        raise ValueError("orjson is not installed")
+    _backend = name
+
+
+def _native(obj):
+    """Returns: orjson的输出是否与标准库一致，即只包含dict/list/tuple/str/int/bool/None且整数在64位范围内"""
+    stack = [obj]
+    pop, extend = stack.pop, stack.extend
+    while stack:
+        value = pop()
+        kind = type(value)
+        if kind is dict:
+            extend(value.values())
+        elif kind is list or kind is tuple:
+            extend(value)
+        elif kind not in _SCALARS or (kind is int and not _INT_MIN <= value <= _INT_MAX):
+            return False
+    return True
+
+
+def dumps(obj):
+    """编码参与签名的参数，两种实现输出一致
+    Returns:
+        str
+    """
+    if _backend == "orjson" and _native(obj):
+        try:
+            return orjson.dumps(obj).decode("utf8")
+        except TypeError:  # 非str的key等
+            pass
+    return json.dumps(obj, separators=SEPARATORS, ensure_ascii=False)
+
+
+def dumpb(obj):
+    """编码不参与签名的内容，不保证两种实现输出一致
+    Returns:
+        utf8编码的bytes
+    """
+    if _backend == "orjson":
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            pass
+    return json.dumps(obj, separators=SEPARATORS, ensure_ascii=False).encode("utf8")
+
+
+def loads(data):
+    """解码响应
+    Args:
+        data (bytes|str) json文本
+    Returns:
+        解码结果
+    """
+    if _backend == "orjson":
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
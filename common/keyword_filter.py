@@ -0,0 +1,396 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+易盾反垃圾云服务自定义敏感词本地预过滤
+按分类分页同步keyword/query中的自定义敏感词，构建Aho-Corasick自动机，文本在线检测前先在本地匹配:
+    1. 命中自定义敏感词的内容直接返回不通过，不再请求/v5/text/check；未命中时照常请求
+    2. 只同步status为1(启用)的敏感词；内容与敏感词均按common.text_cache.normalize归一化(NFKC、忽略大小写、合并空白)后匹配
+    3. wrap_submit/wrap_delete包装keyword/submit、keyword/delete接口，提交、删除成功后立即更新本地词表:
+       新增的词放入单独的小自动机，删除的词只做标记并在匹配时跳过，变更数超过rebuild_threshold时合并重建
+需要显式开启: KeywordFilter().wrap(api)，api可以是TextCheckAPIDemo实例、APIClient.text_check或
+AsyncAPIClient.endpoint("text_check")
+本地命中时返回的antispam包含dataId、suggestion=2、labels、keyword，以及prefiltered=True
+python版本：python3.7
+运行:
+    1. 修改 SECRET_ID,SECRET_KEY,BUSINESS_ID 为对应申请到的值
+    2. $ python -m common.keyword_filter
+"""
+__author__ = 'yidun-dev'
+__date__ = '2026/10/18'
+__version__ = '0.2-dev'
+
+import asyncio
+import collections
+import functools
+import threading
+
+from common.check_wrapper import replace_check
+from common.text_cache import normalize
+
+# 100: 色情，110: 性感，200: 广告，210: 二维码，300: 暴恐，400: 违禁，500: 涉政，600: 谩骂，700: 灌水
+CATEGORIES = ("100", "110", "200", "210", "300", "400", "500", "600", "700")
+PAGE_SIZE = 100
+KEYWORD_ENABLED = 1  # keyword/query返回的status，1: 启用
+
+# id 敏感词id, word 敏感词, category 分类
+Keyword = collections.namedtuple("Keyword", ["id", "word", "category"])
+
+_SHIFT = 21  # unicode码位不超过21位，转移表key为(状态 << 21) | 码位
+
+
+class Automaton(object):
+    """Aho-Corasick自动机，构建后只读"""
+
+    __slots__ = ("keywords", "_goto", "_root", "_fail", "_out", "_same", "_hit", "_link")
+
+    def __init__(self, keywords):
+        """
+        Args:
+            keywords (list) Keyword列表，word须已归一化
+        """
+        self.keywords = keywords
+        goto = {}
+        out = [-1]  # 状态对应的敏感词下标，-1表示不是词尾
+        same = [-1] * len(keywords)  # 同一个词(不同id)的下一个敏感词下标
+        for index, keyword in enumerate(keywords):
+            state = 0
+            for ch in keyword.word:
+                key = (state << _SHIFT) | ord(ch)
+                nxt = goto.get(key)
+                if nxt is None:
+                    nxt = goto[key] = len(out)
+                    out.append(-1)
+                state = nxt
+            same[index] = out[state]
+            out[state] = index
+        children = collections.defaultdict(list)
+        for key, nxt in goto.items():
+            children[key >> _SHIFT].append((key & ((1 << _SHIFT) - 1), nxt))
+        fail = [0] * len(out)
+        link = [0] * len(out)  # 最近的词尾后缀状态，用于遍历全部命中
+        queue = collections.deque(nxt for _, nxt in children[0])
+        while queue:
+            state = queue.popleft()
+            for code, nxt in children[state]:
+                f = fail[state]
+                while True:
+                    target = goto.get((f << _SHIFT) | code)
+                    if target is not None or f == 0:
+                        break
+                    f = fail[f]
+                fail[nxt] = target if target is not None and target != nxt else 0
+                link[nxt] = fail[nxt] if out[fail[nxt]] >= 0 else link[fail[nxt]]
+                queue.append(nxt)
+        self._goto = goto
+        self._root = frozenset(code for code, _ in children[0])
+        self._fail = fail
+        self._out = out
+        self._same = same
+        # 状态本身是词尾时为自身，否则为link，0表示无命中
+        self._hit = [state if out[state] >= 0 else link[state] for state in range(len(out))]
+        self._link = link
+
+    def __len__(self):
+        return len(self.keywords)
+
+    def scan(self, text, skip=None):
+        """按出现顺序返回命中的敏感词
+        Args:
+            text (str) 归一化后的文本
+            skip (set) 需要跳过的Keyword
+        Returns:
+            (结束位置, Keyword)生成器
+        """
+        goto, root, fail, out, same, hit, link, keywords = (self._goto, self._root, self._fail, self._out,
+                                                             self._same, self._hit, self._link, self.keywords)
+        state = 0
+        for pos, ch in enumerate(text):
+            code = ord(ch)
+            if state == 0:
+                if code not in root:
+                    continue
+                state = goto[code]
+            else:
+                while True:
+                    nxt = goto.get((state << _SHIFT) | code)
+                    if nxt is not None:
+                        state = nxt
+                        break
+                    state = fail[state]
+                    if state == 0:
+                        state = goto[code] if code in root else 0
+                        break
+            node = hit[state]
+            while node:
+                index = out[node]
+                if skip:
+                    while index >= 0 and keywords[index] in skip:
+                        index = same[index]
+                if index >= 0:
+                    yield pos + 1, keywords[index]
+                node = link[node]
+
+
+class KeywordFilter(object):
+    """自定义敏感词本地预过滤"""
+
+    def __init__(self, rebuild_threshold=1000):
+        """
+        Args:
+            rebuild_threshold (int) 增量新增、删除的词数超过该值时重建主自动机
+        """
+        self.rebuild_threshold = rebuild_threshold
+        self.hits = 0  # 本地命中次数
+        self.misses = 0  # 未命中、请求接口次数
+        self.rebuilds = 0
+        self._keywords = {}  # id -> Keyword，当前有效的全部敏感词
+        self._base = Automaton([])
+        self._delta = Automaton([])
+        self._base_set = set()
+        self._removed = set()  # 已删除但仍在主自动机中的Keyword
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._keywords)
+
+    def load(self, api, categories=CATEGORIES, page_size=PAGE_SIZE):
+        """按分类分页同步全部自定义敏感词，替换当前词表
+        Args:
+            api (object) 敏感词查询接口，如keyword/keyword_query.py中的示例类实例或APIClient.keyword_query，
+                check(params)返回json格式结果
+            categories (iterable) 需要同步的分类
+            page_size (int) 每页条数
+        Returns:
+            同步的敏感词数
+        """
+        keywords = {}
+        for category in categories:
+            page = 1
+            while True:
+                ret = api.check({"category": str(category), "orderType": "1", "pageNum": str(page),
+                                 "pageSize": str(page_size)})
+                if ret is None or ret["code"] != 200:
+                    raise RuntimeError("sync keywords failed, category: %s, page: %s, ret: %s" % (category, page, ret))
+                words = ret["result"]["words"]
+                rows = words.get("rows") or []
+                for row in rows:
+                    if row.get("status", KEYWORD_ENABLED) != KEYWORD_ENABLED:  # 已停用的敏感词不再命中
+                        continue
+                    keyword = self._keyword(row["id"], row["word"], row.get("category", category))
+                    if keyword is not None:
+                        keywords[keyword.id] = keyword
+                if len(rows) < page_size or page * page_size >= words.get("count", 0):
+                    break
+                page += 1
+        with self._lock:
+            self._keywords = keywords
+            self._rebuild()
+        return len(keywords)
+
+    @staticmethod
+    def _keyword(keyword_id, word, category):
+        word = normalize(word)
+        if not word:
+            return None
+        return Keyword(str(keyword_id), word, int(category))
+
+    def _rebuild(self):
+        self._base = Automaton(list(self._keywords.values()))
+        self._base_set = set(self._base.keywords)
+        self._delta = Automaton([])
+        self._removed = set()
+        self.rebuilds += 1
+
+    def _set(self, keyword, delta):
+        if keyword in self._base_set:
+            self._removed.discard(keyword)
+        else:
+            delta.append(keyword)
+
+    def _unset(self, keyword, delta):
+        if keyword in self._base_set:
+            self._removed.add(keyword)
+        else:
+            delta.remove(keyword)
+
+    def _changed(self, delta):
+        if len(delta) + len(self._removed) > self.rebuild_threshold:
+            self._rebuild()
+        else:
+            self._delta = Automaton(delta)
+
+    def add(self, keyword_id, word, category):
+        """新增敏感词，keyword/submit成功后调用"""
+        keyword = self._keyword(keyword_id, word, category)
+        if keyword is None:
+            return
+        with self._lock:
+            old = self._keywords.get(keyword.id)
+            if old == keyword:
+                return
+            delta = list(self._delta.keywords)
+            if old is not None:
+                self._unset(old, delta)
+            self._keywords[keyword.id] = keyword
+            self._set(keyword, delta)
+            self._changed(delta)
+
+    def remove(self, keyword_ids):
+        """删除敏感词，keyword/delete成功后调用
+        Args:
+            keyword_ids (iterable) 敏感词id
+        """
+        with self._lock:
+            delta = list(self._delta.keywords)
+            changed = False
+            for keyword_id in keyword_ids:
+                keyword = self._keywords.pop(str(keyword_id).strip(), None)
+                if keyword is not None:
+                    self._unset(keyword, delta)
+                    changed = True
+            if changed:
+                self._changed(delta)
+
+    def find_all(self, content):
+        """Returns: 内容命中的全部敏感词，Keyword列表，按出现位置排序"""
+        text = normalize(content)
+        base, delta, removed = self._base, self._delta, self._removed
+        hits = list(base.scan(text, removed))
+        if len(delta):
+            hits.extend(delta.scan(text, removed))
+            hits.sort(key=lambda hit: hit[0])
+        return [keyword for _, keyword in hits]
+
+    def match(self, content):
+        """Returns: 内容命中的第一个敏感词，未命中时返回None"""
+        text = normalize(content)
+        base, delta, removed = self._base, self._delta, self._removed
+        for _, keyword in base.scan(text, removed):
+            return keyword
+        if len(delta):
+            for _, keyword in delta.scan(text, removed):
+                return keyword
+        return None
+
+    def stats(self):
+        """Returns: 词表规模及命中情况"""
+        lookups = self.hits + self.misses
+        return {
+            "keywords": len(self._keywords),
+            "delta": len(self._delta),
+            "removed": len(self._removed),
+            "rebuilds": self.rebuilds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / float(lookups) if lookups else 0.0,
+        }
+
+    def response(self, keyword, params):
+        """Returns: 本地命中时构造的text_check响应"""
+        antispam = {
+            "dataId": params.get("dataId"),
+            "suggestion": 2,
+            "labels": [{"label": keyword.category, "level": 2, "rate": 1.0, "subLabels": []}],
+            "keyword": {"id": keyword.id, "word": keyword.word},
+            "prefiltered": True,
+        }
+        return {"code": 200, "msg": "ok", "result": {"antispam": antispam}}
+
+    def wrap(self, api):
+        """为文本在线检测接口增加本地预过滤
+        Args:
+            api (object) TextCheckAPIDemo实例、APIClient.text_check或AsyncAPIClient.endpoint("text_check")
+        Returns:
+            替换check后的接口，见common.check_wrapper.replace_check
+        """
+        check = api.check
+
+        def prefilter(params):
+            keyword = self.match(params.get("content", ""))
+            if keyword is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return self.response(keyword, params)
+
+        if asyncio.iscoroutinefunction(check):
+            @functools.wraps(check)
+            async def filtered(params=None, *args, **kwargs):
+                return prefilter(params) or await check(params, *args, **kwargs)
+        else:
+            @functools.wraps(check)
+            def filtered(params, *args, **kwargs):
+                return prefilter(params) or check(params, *args, **kwargs)
+        return replace_check(api, filtered)
+
+    def _after_submit(self, params, ret):
+        if ret is not None and ret.get("code") == 200:
+            for row in ret.get("result") or []:
+                self.add(row["id"], row["keyword"], params["category"])
+
+    def _after_delete(self, params, ret):
+        if ret is not None and ret.get("code") == 200 and ret.get("result"):
+            self.remove(str(params["ids"]).split(","))
+
+    def wrap_submit(self, api):
+        """提交敏感词成功后同步更新本地词表
+        Args:
+            api (object) keyword/keyword_submit.py中的示例类实例、APIClient.keyword_submit或
+                AsyncAPIClient.endpoint("keyword_submit")
+        Returns:
+            替换check后的接口，见common.check_wrapper.replace_check
+        """
+        return replace_check(api, _after(api.check, self._after_submit))
+
+    def wrap_delete(self, api):
+        """删除敏感词成功后同步更新本地词表
+        Args:
+            api (object) keyword/keyword_delete.py中的示例类实例、APIClient.keyword_delete或
+                AsyncAPIClient.endpoint("keyword_delete")
+        Returns:
+            替换check后的接口，见common.check_wrapper.replace_check
+        """
+        return replace_check(api, _after(api.check, self._after_delete))
+
+
+def _after(check, callback):
+    """Returns: 调用check后将(参数, 结果)交给callback的函数"""
+    if asyncio.iscoroutinefunction(check):
+        @functools.wraps(check)
+        async def wrapped(params=None, *args, **kwargs):
+            ret = await check(params, *args, **kwargs)
+            callback(params, ret)
+            return ret
+    else:
+        @functools.wraps(check)
+        def wrapped(params, *args, **kwargs):
+            ret = check(params, *args, **kwargs)
+            callback(params, ret)
+            return ret
+    return wrapped
+
+
+def main():
+    from common.client import APIClient
+
+    SECRET_ID = "your_secret_id"  # 产品密钥ID，产品标识
+    SECRET_KEY = "your_secret_key"  # 产品私有密钥，服务端生成签名信息使用，请严格保管，避免泄露
+    BUSINESS_ID = "your_business_id"  # 业务ID，易盾根据产品业务特点分配
+    client = APIClient(SECRET_ID, SECRET_KEY, BUSINESS_ID)
+    keyword_filter = KeywordFilter()
+    print("同步敏感词: %s" % keyword_filter.load(client.keyword_query))
+    keyword_submit = keyword_filter.wrap_submit(client.keyword_submit)
+    keyword_submit.check({"category": "100", "keywords": "色情敏感词1,色情敏感词2"})
+    text_check = keyword_filter.wrap(client.text_check)
+    for content in ["易盾测试内容！", "这是色情敏感词1"]:
+        ret = text_check.check({"dataId": "ebfcad1c-dba1-490c-b4de-e784c2691768", "content": content})
+        if ret is not None and ret["code"] == 200:
+            antispam: dict = ret["result"]["antispam"]
+            print("content: %s, suggestion: %s, prefiltered: %s"
+                  % (content, antispam["suggestion"], antispam.get("prefiltered", False)))
+    print(keyword_filter.stats())
+
+
+if __name__ == "__main__":
+    """示例代码入口"""
+    main()
@@ -0,0 +1,402 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+易盾反垃圾云服务名单本地镜像
+在网关等入口处本地判断用户、IP是否在名单中，命中黑名单时无需再请求检测接口:
+    1. full_sync 通过list/pageQuery(common.page_query)按时间窗口并行全量同步，替换本地名单
+    2. sync 增量同步，查询范围为上次同步的endTime减去overlap至当前时间；
+       list/batchDelete删除的名单不会出现在pageQuery中，需要定期full_sync，或在删除成功后调用remove
+    3. 名单的releaseTime(毫秒，0表示永久)为到期释放时间，按到期时间保存在小顶堆中，contains、is_blacklisted
+       查询前先移除已到期的名单，同步到的已到期名单按删除处理
+    4. 每个(listType, entityType)一个哈希集合，contains为一次集合查找；IP名单中的CIDR网段
+       (如10.0.0.0/8)按前缀长度分组保存网段号，查询时每个前缀长度一次集合查找，支持IPv4、IPv6
+    5. 持久化为快照文件snapshot.bin和追加写的变更日志journal.log，启动时mmap快照按名单整块解码，
+       不需要重新全量同步；日志超过compact_threshold行时重写快照
+python版本：python3.7
+运行:
+    1. 修改 SECRET_ID,SECRET_KEY,BUSINESS_ID 为对应申请到的值
+    2. $ python -m common.list_mirror
+"""
+__author__ = 'yidun-dev'
+__date__ = '2026/10/18'
+__version__ = '0.2-dev'
+
+import asyncio
+import heapq
+import ipaddress
+import mmap
+import os
+import socket
+import time
+
+from common import json_codec
+from common.async_client import AsyncAPIClient
+from common.page_query import PageQuery
+
+# listType
+LIST_WHITE = 1  # 白名单
+LIST_BLACK = 2  # 黑名单
+LIST_MUST_REVIEW = 4  # 必审名单
+LIST_PRE_REVIEW = 8  # 预审名单
+# entityType
+ENTITY_USER = 1  # 用户名单
+ENTITY_IP = 2  # IP名单
+
+DEFAULT_LISTS = ((LIST_BLACK, ENTITY_USER), (LIST_BLACK, ENTITY_IP))
+
+
+class IpNetworks(object):
+    """CIDR网段集合，按IP版本和前缀长度分组保存网段号
+    10.0.0.0/8与10.1.0.0/8等不同写法对应同一网段，按网段号记录引用次数，删除其中一条不影响另一条
+    """
+
+    def __init__(self):
+        self._prefixes = {4: {}, 6: {}}  # 版本 -> {前缀长度: {网段号: 引用次数}}
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    @staticmethod
+    def _parse(entry):
+        network = ipaddress.ip_network(entry, strict=False)
+        return network.version, network.prefixlen, int(network.network_address) >> (
+            network.max_prefixlen - network.prefixlen)
+
+    def add(self, entry):
+        """添加网段，同一条目只应添加一次，由调用方去重"""
+        version, prefixlen, value = self._parse(entry)
+        networks = self._prefixes[version].setdefault(prefixlen, {})
+        networks[value] = networks.get(value, 0) + 1
+        self._count += 1
+
+    def remove(self, entry):
+        version, prefixlen, value = self._parse(entry)
+        networks = self._prefixes[version].get(prefixlen)
+        if networks is None or value not in networks:
+            return
+        self._count -= 1
+        if networks[value] > 1:
+            networks[value] -= 1
+            return
+        del networks[value]
+        if not networks:
+            del self._prefixes[version][prefixlen]
+
+    def contains(self, ip):
+        """Returns: ip是否在任一网段内，ip不合法时返回False"""
+        version, bits, family = (6, 128, socket.AF_INET6) if ":" in ip else (4, 32, socket.AF_INET)
+        try:
+            value = int.from_bytes(socket.inet_pton(family, ip), "big")
+        except OSError:
+            return False
+        for prefixlen, networks in self._prefixes[version].items():
+            if (value >> (bits - prefixlen)) in networks:
+                return True
+        return False
+
+
+def _is_network(entity):
+    """Returns: IP名单条目是否需要按网段匹配，CIDR及IPv6(存在多种写法)"""
+    return "/" in entity or ":" in entity
+
+
+class ListMirror(object):
+    """名单本地镜像"""
+
+    def __init__(self, path, lists=DEFAULT_LISTS, overlap=60.0, compact_threshold=100000):
+        """
+        Args:
+            path (str) 持久化目录
+            lists (iterable) 需要镜像的(listType, entityType)
+            overlap (float) 增量同步时向前多查询的时间，秒，覆盖提交时间相近但较晚可见的名单
+            compact_threshold (int) 变更日志超过该行数时重写快照
+        """
+        self.path = path
+        self.lists = tuple((int(list_type), int(entity_type)) for list_type, entity_type in lists)
+        self.overlap = overlap
+        self.compact_threshold = compact_threshold
+        self.release_time = 0  # 已同步到的时间，即上次同步的endTime，毫秒
+        self.synced_rows = 0
+        os.makedirs(path, exist_ok=True)
+        self._entries = dict((key, set()) for key in self.lists)
+        self._networks = dict((key, IpNetworks()) for key in self.lists if key[1] == ENTITY_IP)
+        self._expires = dict((key, {}) for key in self.lists)  # 有到期时间的名单 entity -> releaseTime
+        self._expiry = []  # (releaseTime, listType, entityType, entity)小顶堆，更新或删除后的旧项在出堆时跳过
+        self._journal_lines = 0
+        self._load()
+        self._journal = open(self._file("journal.log"), "a", encoding="utf8")
+
+    def _file(self, name):
+        return os.path.join(self.path, name)
+
+    def __len__(self):
+        self._expire()
+        return sum(len(entries) for entries in self._entries.values())
+
+    def _expire(self):
+        """移除已到期的名单，不写变更日志，重放日志时到期的名单同样会被跳过"""
+        expiry = self._expiry
+        if not expiry:
+            return
+        now = time.time() * 1000
+        while expiry and expiry[0][0] <= now:
+            release_time, list_type, entity_type, entity = heapq.heappop(expiry)
+            if self._expires[(list_type, entity_type)].get(entity) == release_time:
+                self._apply(list_type, entity_type, entity, False, journal=False)
+
+    def contains(self, entity, entity_type=ENTITY_USER, list_type=LIST_BLACK):
+        """判断是否在名单中
+        Args:
+            entity (str) 用户名单为账号，IP名单为IP地址
+            entity_type (int) 1: 用户名单，2: IP名单
+            list_type (int) 1: 白名单，2: 黑名单，4: 必审名单，8: 预审名单
+        Returns:
+            bool
+        """
+        self._expire()
+        key = (list_type, entity_type)
+        if entity in self._entries.get(key, ()):
+            return True
+        networks = self._networks.get(key)
+        return bool(networks) and networks.contains(entity)
+
+    def is_blacklisted(self, account=None, ip=None):
+        """Returns: 账号或IP是否命中黑名单，未镜像的名单视为未命中"""
+        self._expire()
+        if account is not None and account in self._entries.get((LIST_BLACK, ENTITY_USER), ()):
+            return True
+        if ip is not None and (LIST_BLACK, ENTITY_IP) in self._entries:
+            return self.contains(ip, ENTITY_IP, LIST_BLACK)
+        return False
+
+    def _apply(self, list_type, entity_type, entity, add, journal=True, release_time=0):
+        key = (list_type, entity_type)
+        entries = self._entries.get(key)
+        if entries is None or not entity or "\n" in entity:
+            return False
+        if add and release_time and release_time <= time.time() * 1000:
+            add = False  # 已到期
+        expires = self._expires[key]
+        if add == (entity in entries) and (not add or expires.get(entity, 0) == release_time):
+            return False
+        if add != (entity in entries):
+            if add:
+                entries.add(entity)
+            else:
+                entries.discard(entity)
+            if entity_type == ENTITY_IP and _is_network(entity):
+                try:
+                    (self._networks[key].add if add else self._networks[key].remove)(entity)
+                except ValueError:  # 不合法的IP，只做精确匹配
+                    pass
+        if add and release_time:
+            expires[entity] = release_time
+            heapq.heappush(self._expiry, (release_time, list_type, entity_type, entity))
+        else:
+            expires.pop(entity, None)
+        if journal:
+            if add and release_time:
+                self._journal.write("*\t%d\t%d\t%d\t%s\n" % (list_type, entity_type, release_time, entity))
+            else:
+                self._journal.write("%s\t%d\t%d\t%s\n" % ("+" if add else "-", list_type, entity_type, entity))
+            self._journal_lines += 1
+        return True
+
+    def add(self, list_type, entity_type, entity, release_time=0):
+        """新增名单，如list/submit成功后调用，release_time为到期时间，毫秒，0表示永久"""
+        self._apply(int(list_type), int(entity_type), str(entity), True, release_time=int(release_time))
+        self._journal.flush()
+
+    def remove(self, list_type, entity_type, entity):
+        """删除名单，如list/batchDelete成功后调用"""
+        self._apply(int(list_type), int(entity_type), str(entity), False)
+        self._journal.flush()
+
+    async def sync(self, client, **kwargs):
+        """增量同步
+        Args:
+            client (AsyncAPIClient) 名单产品的异步客户端
+            kwargs 传给PageQuery的参数，如windows、prefetch
+        Returns:
+            本次查询到的名单条数
+        """
+        start = max(0, self.release_time - int(self.overlap * 1000))
+        end = int(time.time() * 1000)
+        rows = 0
+        for list_type, entity_type in self.lists:
+            query = PageQuery(client, "list_query", {"listType": list_type, "entityType": entity_type,
+                                                     "startTime": start, "endTime": end}, **kwargs)
+            async for row in query.rows():
+                # status为0表示名单已失效
+                self._apply(list_type, entity_type, str(row["entity"]), row.get("status", 1) != 0,
+                            release_time=int(row.get("releaseTime") or 0))
+                rows += 1
+        self.release_time = max(self.release_time, end)
+        self._journal.write("@\t%d\n" % self.release_time)
+        self._journal.flush()
+        self.synced_rows += rows
+        if self._journal_lines > self.compact_threshold:
+            self.compact()
+        return rows
+
+    async def full_sync(self, client, start_time=0, windows=8, **kwargs):
+        """全量同步，替换本地名单并重写快照
+        Args:
+            client (AsyncAPIClient) 名单产品的异步客户端
+            start_time (int) 查询的起始时间，毫秒
+            windows (int) 并行查询的时间窗口数
+            kwargs 传给PageQuery的其他参数
+        Returns:
+            名单条数
+        """
+        end = int(time.time() * 1000)
+        entries = dict((key, set()) for key in self.lists)
+        networks = dict((key, IpNetworks()) for key in self.lists if key[1] == ENTITY_IP)
+        expires = dict((key, {}) for key in self.lists)
+        for list_type, entity_type in self.lists:
+            key = (list_type, entity_type)
+            query = PageQuery(client, "list_query", {"listType": list_type, "entityType": entity_type,
+                                                     "startTime": start_time, "endTime": end}, windows=windows,
+                              **kwargs)
+            async for row in query.rows():
+                entity = str(row["entity"])
+                release_time = int(row.get("releaseTime") or 0)
+                if row.get("status", 1) == 0 or not entity or "\n" in entity or 0 < release_time <= end:
+                    continue
+                entries[key].add(entity)
+                if release_time:
+                    expires[key][entity] = release_time
+                else:
+                    expires[key].pop(entity, None)
+        for key, ip_networks in networks.items():
+            for entity in entries[key]:
+                if _is_network(entity):
+                    try:
+                        ip_networks.add(entity)
+                    except ValueError:
+                        pass
+        self._entries, self._networks = entries, networks
+        self._set_expires(expires)
+        self.release_time = end
+        self.compact()
+        return len(self)
+
+    def _set_expires(self, expires):
+        self._expires = expires
+        self._expiry = [(release_time, list_type, entity_type, entity)
+                        for (list_type, entity_type), items in expires.items()
+                        for entity, release_time in items.items()]
+        heapq.heapify(self._expiry)
+
+    def compact(self):
+        """将当前名单写入快照并清空变更日志"""
+        self._expire()
+        parts, lists, offset = [], [], 0
+        for (list_type, entity_type), entries in self._entries.items():
+            # IP名单中需按网段匹配的条目写在最前面，加载时不需要逐条判断
+            networks = [entity for entity in entries if _is_network(entity)] if entity_type == ENTITY_IP else []
+            if networks:
+                skip = set(networks)
+                entries = networks + [entity for entity in entries if entity not in skip]
+            blob = "\n".join(entries).encode("utf8")
+            lists.append([list_type, entity_type, offset, len(blob), len(entries), len(networks)])
+            parts.append(blob)
+            offset += len(blob)
+        expires = [[list_type, entity_type, items]
+                   for (list_type, entity_type), items in self._expires.items() if items]
+        header = json_codec.dumpb({"releaseTime": self.release_time, "lists": lists, "expires": expires}) + b"\n"
+        tmp = self._file("snapshot.bin.tmp")
+        with open(tmp, "wb") as f:
+            f.write(header)
+            for blob in parts:
+                f.write(blob)
+        os.replace(tmp, self._file("snapshot.bin"))
+        self._journal.close()
+        self._journal = open(self._file("journal.log"), "w", encoding="utf8")
+        self._journal_lines = 0
+
+    def _load(self):
+        """加载快照并重放变更日志"""
+        snapshot = self._file("snapshot.bin")
+        if os.path.exists(snapshot) and os.path.getsize(snapshot):
+            with open(snapshot, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            with mapped:
+                header = json_codec.loads(mapped.readline())
+                base = mapped.tell()
+                self.release_time = header["releaseTime"]
+                for list_type, entity_type, offset, length, count, networks in header["lists"]:
+                    key = (list_type, entity_type)
+                    if key not in self._entries or not length:
+                        continue
+                    entries = mapped[base + offset:base + offset + length].decode("utf8").split("\n")
+                    self._entries[key] = set(entries)
+                    for entity in entries[:networks]:
+                        try:
+                            self._networks[key].add(entity)
+                        except ValueError:
+                            pass
+                expires = dict((key, {}) for key in self.lists)
+                for list_type, entity_type, items in header.get("expires", ()):
+                    if (list_type, entity_type) in expires:
+                        expires[(list_type, entity_type)] = items
+                self._set_expires(expires)
+        journal = self._file("journal.log")
+        if os.path.exists(journal):
+            valid = 0
+            with open(journal, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):  # 写入中断的最后一行
+                        break
+                    valid += len(line)
+                    op, fields = line[:-1].decode("utf8").split("\t", 1)
+                    if op == "@":
+                        self.release_time = max(self.release_time, int(fields))
+                    elif op == "*":
+                        list_type, entity_type, release_time, entity = fields.split("\t", 3)
+                        self._apply(int(list_type), int(entity_type), entity, True, journal=False,
+                                    release_time=int(release_time))
+                    else:
+                        list_type, entity_type, entity = fields.split("\t", 2)
+                        self._apply(int(list_type), int(entity_type), entity, op == "+", journal=False)
+                    self._journal_lines += 1
+            # 截掉不完整的行，避免与之后追加的内容拼在一起
+            if valid < os.path.getsize(journal):
+                os.truncate(journal, valid)
+
+    def stats(self):
+        """Returns: 各名单条数及同步进度"""
+        self._expire()
+        return {
+            "lists": dict(("%d-%d" % key, len(entries)) for key, entries in self._entries.items()),
+            "networks": dict(("%d-%d" % key, len(networks)) for key, networks in self._networks.items()),
+            "expiring": dict(("%d-%d" % key, len(expires)) for key, expires in self._expires.items()),
+            "release_time": self.release_time,
+            "synced_rows": self.synced_rows,
+            "journal_lines": self._journal_lines,
+        }
+
+    def close(self):
+        self._journal.close()
+
+
+async def main():
+    SECRET_ID = "your_secret_id"  # 产品密钥ID，产品标识
+    SECRET_KEY = "your_secret_key"  # 产品私有密钥，服务端生成签名信息使用，请严格保管，避免泄露
+    BUSINESS_ID = "your_business_id"  # 业务ID，易盾根据产品业务特点分配
+    mirror = ListMirror("list_mirror")
+    async with AsyncAPIClient(SECRET_ID, SECRET_KEY, BUSINESS_ID) as client:
+        if not len(mirror):
+            print("全量同步: %s" % await mirror.full_sync(client))
+        for _ in range(3):
+            print("增量同步: %s" % await mirror.sync(client))
+            print("account: %s, ip: %s" % (mirror.contains("yidun_test"), mirror.contains("10.1.2.3", ENTITY_IP)))
+            await asyncio.sleep(60)
+    print(mirror.stats())
+    mirror.close()
+
+
+if __name__ == "__main__":
+    """示例代码入口"""
+    asyncio.run(main())
@@ -0,0 +1,376 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+易盾反垃圾云服务本地模拟服务
+用于离线联调、吞吐和长尾延迟压测:
+    1. 提供common.endpoints中全部接口路径，按gen_signature相同算法校验签名
+    2. 响应结构由各示例代码__main__中解析的字段自动推导，与示例代码的解析逻辑保持一致；
+       texts/images/taskIds等批量参数按输入逐条返回，dataId、name、taskId与请求对应
+    3. 可按接口配置延迟、错误率、列表长度和额外填充字节数
+python版本：python3.7
+运行:
+    $ python -m common.mock_server --port 8080 --latency 0.02 --jitter 0.01 --error-rate 0.01
+    客户端使用AsyncAPIClient(..., base_url="http://127.0.0.1:8080")，或将示例代码的API_URL改为本地地址
+"""
+__author__ = 'yidun-dev'
+__date__ = '2026/10/18'
+__version__ = '0.2-dev'
+
+import argparse
+import ast
+import asyncio
+import hmac
+import os
+import random
+import uuid
+from urllib.parse import urlsplit
+
+from common import json_codec
+from common.endpoints import ENDPOINTS
+from common.http_server import HttpServer, HttpResponse
+from common.signature import gen_signature
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_TYPES = {"int": int, "float": float, "str": str, "bool": bool, "list": list, "dict": dict}
+
+
+class MockConfig(object):
+    """模拟行为配置"""
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, list_size=1, pad_bytes=0):
+        """
+        Args:
+            latency (float) 固定延迟，秒
+            jitter (float) 额外延迟的均值，按指数分布随机，秒，用于模拟长尾
+            error_rate (float) 返回HTTP 500的概率
+            list_size (int) 非批量场景下响应中每个列表的元素个数
+            pad_bytes (int) 响应中额外填充的字节数，用于模拟大响应
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.list_size = list_size
+        self.pad_bytes = pad_bytes
+
+    def delay(self):
+        """Returns: 本次请求的模拟延迟，秒"""
+        return self.latency + (random.expovariate(1.0 / self.jitter) if self.jitter > 0 else 0.0)
+
+
+def _new_node():
+    return {"type": None, "fields": {}, "item": None}
+
+
+class _SchemaBuilder(object):
+    """从示例代码__main__中推导响应结构"""
+
+    def __init__(self, tree):
+        self.root = _new_node()
+        self.methods = {}
+        for node in ast.walk(tree):
+            if isinstance(node, ast.ClassDef):
+                for item in node.body:
+                    if isinstance(item, ast.FunctionDef):
+                        self.methods[item.name] = item
+        self.depth = 0
+
+    def resolve(self, expr, env):
+        """解析形如ret["result"]["antispam"]、antispam.get("taskId")的表达式"""
+        if isinstance(expr, ast.Name):
+            return env.get(expr.id)
+        if isinstance(expr, ast.Subscript):
+            base = self.resolve(expr.value, env)
+            # python3.8及以下下标表达式包装在ast.Index中
+            key = expr.slice.value if isinstance(expr.slice, getattr(ast, "Index", ())) else expr.slice
+            return self._child(base, key)
+        if isinstance(expr, ast.Call) and isinstance(expr.func, ast.Attribute):
+            if expr.func.attr == "get" and expr.args:
+                return self._child(self.resolve(expr.func.value, env), expr.args[0])
+            if expr.func.attr in ("check", "query") and isinstance(expr.func.value, ast.Name):
+                return self.root
+        return None
+
+    @staticmethod
+    def _child(base, key):
+        if base is None:
+            return None
+        try:
+            value = ast.literal_eval(key)
+        except ValueError:
+            return None
+        if isinstance(value, str):
+            base["type"] = base["type"] or dict
+            return base["fields"].setdefault(value, _new_node())
+        if isinstance(value, int):
+            base["type"] = list
+            base["item"] = base["item"] or _new_node()
+            return base["item"]
+        return None
+
+    def visit_block(self, body, env):
+        for stmt in body:
+            self.visit(stmt, env)
+
+    def visit(self, stmt, env):
+        if isinstance(stmt, (ast.Assign, ast.AnnAssign)):
+            target = stmt.targets[0] if isinstance(stmt, ast.Assign) else stmt.target
+            self._walk(stmt.value, env)
+            node = self.resolve(stmt.value, env) if stmt.value is not None else None
+            if isinstance(target, ast.Name) and node is not None:
+                env[target.id] = node
+                annotation = getattr(stmt, "annotation", None)
+                if isinstance(annotation, ast.Name) and annotation.id in _TYPES and node["type"] is None:
+                    node["type"] = _TYPES[annotation.id]
+        elif isinstance(stmt, ast.For):
+            self._walk(stmt.iter, env)
+            node = self.resolve(stmt.iter, env)
+            if node is not None and isinstance(stmt.target, ast.Name):
+                node["type"] = list
+                node["item"] = node["item"] or _new_node()
+                env[stmt.target.id] = node["item"]
+            self.visit_block(stmt.body, env)
+            self.visit_block(stmt.orelse, env)
+        elif isinstance(stmt, (ast.If, ast.While)):
+            self._walk(stmt.test, env)
+            self.visit_block(stmt.body, env)
+            self.visit_block(stmt.orelse, env)
+        elif isinstance(stmt, ast.Try):
+            for block in [stmt.body, stmt.orelse, stmt.finalbody] + [h.body for h in stmt.handlers]:
+                self.visit_block(block, env)
+        elif isinstance(stmt, ast.With):
+            self.visit_block(stmt.body, env)
+        else:
+            self._walk(stmt, env)
+
+    def _walk(self, expr, env):
+        if expr is None:
+            return
+        for node in ast.walk(expr):
+            if isinstance(node, (ast.Subscript, ast.Call)):
+                self.resolve(node, env)
+            if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute):
+                self._call_method(node, env)
+
+    def _call_method(self, call, env):
+        """示例代码中api.parse_xxx(evidences, ...)形式的解析方法，将实参结构绑定到形参继续推导"""
+        method = self.methods.get(call.func.attr)
+        if method is None or method.name in ("__init__", "gen_signature", "check", "query") or self.depth > 3:
+            return
+        params = [arg.arg for arg in method.args.args[1:]]
+        method_env = {}
+        for name, arg in zip(params, call.args):
+            node = self.resolve(arg, env)
+            if node is not None:
+                method_env[name] = node
+        if method_env:
+            self.depth += 1
+            self.visit_block(method.body, method_env)
+            self.depth -= 1
+
+
+def _main_block(tree):
+    for stmt in tree.body:
+        if isinstance(stmt, ast.If) and "__main__" in ast.dump(stmt.test):
+            return stmt.body
+    return []
+
+
+def build_schema(path):
+    """从示例代码推导响应结构
+    Args:
+        path (str) 示例代码文件路径
+    Returns:
+        结构树，节点为{"type": 类型, "fields": 字段, "item": 列表元素}
+    """
+    with open(path, encoding="utf8") as f:
+        try:
+            tree = ast.parse(f.read())
+        except SyntaxError as ex:
+            print("解析示例代码失败:", path, str(ex))
+            return _new_node()
+    builder = _SchemaBuilder(tree)
+    builder.visit_block(_main_block(tree), {})
+    return builder.root
+
+
+def _demo_path(name):
+    for directory in os.listdir(ROOT_DIR):
+        path = os.path.join(ROOT_DIR, directory, name + ".py")
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def sample(node, list_size, key=None):
+    """按结构树生成示例数据"""
+    kind = node["type"] or (dict if node["fields"] else list if node["item"] else None)
+    if kind is dict:
+        return dict((k, sample(child, list_size, k)) for k, child in node["fields"].items())
+    if kind is list:
+        return [sample(node["item"], list_size, key) for _ in range(list_size)] if node["item"] else []
+    if kind is int:
+        return 0
+    if kind is float:
+        return 0.0
+    if kind is bool:
+        return False
+    if key == "taskId":
+        return uuid.uuid4().hex
+    return ""
+
+
+def _fill(obj, values):
+    """将values中的字段值写入obj中所有同名字段"""
+    if isinstance(obj, dict):
+        for k in obj:
+            if k in values and not isinstance(obj[k], (dict, list)):
+                obj[k] = values[k]
+            else:
+                _fill(obj[k], values)
+    elif isinstance(obj, list):
+        for item in obj:
+            _fill(item, values)
+
+
+def _batch_inputs(params):
+    """Returns: 批量参数中每条数据需要回填的字段列表"""
+    for key in ("texts", "images"):
+        if key in params:
+            try:
+                items = json_codec.loads(params[key])
+            except ValueError:
+                return None
+            return [dict((k, item[k]) for k in ("dataId", "name") if k in item) for item in items]
+    if "taskIds" in params:
+        try:
+            task_ids = ast.literal_eval(params["taskIds"])
+        except (ValueError, SyntaxError):
+            task_ids = params["taskIds"].split(",")
+        return [{"taskId": task_id} for task_id in task_ids]
+    return None
+
+
+class MockServer(object):
+    """本地模拟服务"""
+
+    def __init__(self, secret_keys=None, config=None, endpoint_configs=None):
+        """
+        Args:
+            secret_keys (dict) secretId到secretKey的映射，为None时不校验签名
+            config (MockConfig) 默认模拟行为配置
+            endpoint_configs (dict) 接口名称到MockConfig的映射，覆盖默认配置
+        """
+        self.secret_keys = secret_keys
+        self.config = config or MockConfig()
+        self.endpoint_configs = endpoint_configs or {}
+        self.routes = dict((urlsplit(endpoint.url).path, endpoint) for endpoint in ENDPOINTS.values())
+        self.requests = {}  # 接口名称到请求次数的映射
+        self.errors = 0  # 注入错误次数
+        self.signature_errors = 0  # 签名校验失败次数
+        self._schemas = {}
+        self._server = None
+
+    def schema(self, name):
+        """Returns: 接口响应结构树"""
+        if name not in self._schemas:
+            path = _demo_path(name)
+            self._schemas[name] = build_schema(path) if path else _new_node()
+        return self._schemas[name]
+
+    def response(self, name, params, config):
+        """生成接口响应
+        Args:
+            name (str) 接口名称
+            params (dict) 请求参数
+            config (MockConfig) 模拟行为配置
+        Returns:
+            响应数据
+        """
+        schema = self.schema(name)
+        inputs = _batch_inputs(params)
+        result_node = schema["fields"].get("result")
+        if inputs is not None and result_node is not None and result_node["type"] is list:
+            data = sample(schema, 1)
+            data["result"] = []
+            for values in inputs:
+                item = sample(result_node["item"], config.list_size) if result_node["item"] else {}
+                _fill(item, values)
+                data["result"].append(item)
+        else:
+            data = sample(schema, config.list_size)
+            if "dataId" in params:
+                _fill(data, {"dataId": params["dataId"]})
+        data["code"] = 200
+        data["msg"] = "ok"
+        if config.pad_bytes:
+            data["padding"] = "x" * config.pad_bytes
+        return data
+
+    def verify(self, params):
+        """Returns: 签名是否正确"""
+        if self.secret_keys is None:
+            return True
+        secret_key = self.secret_keys.get(params.get("secretId"))
+        signature = params.get("signature")
+        if secret_key is None or not signature:
+            return False
+        unsigned = dict((k, v) for k, v in params.items() if k != "signature")
+        return hmac.compare_digest(signature, gen_signature(secret_key, unsigned))
+
+    async def handle(self, request):
+        endpoint = self.routes.get(request.path)
+        if endpoint is None:
+            return HttpResponse(404, b'{"code":404,"msg":"not found"}')
+        self.requests[endpoint.name] = self.requests.get(endpoint.name, 0) + 1
+        config = self.endpoint_configs.get(endpoint.name, self.config)
+        delay = config.delay()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if config.error_rate and random.random() < config.error_rate:
+            self.errors += 1
+            return HttpResponse(500, b'{"code":500,"msg":"mock error"}')
+        params = request.form()
+        if not self.verify(params):
+            self.signature_errors += 1
+            return HttpResponse(200, b'{"code":401,"msg":"signature error"}')
+        data = self.response(endpoint.name, params, config)
+        return HttpResponse(200, json_codec.dumpb(data))
+
+    async def start(self, host="127.0.0.1", port=0):
+        """启动模拟服务
+        Returns:
+            实际监听端口
+        """
+        self._server = await HttpServer(self.handle, host, port).start()
+        return self._server.port
+
+    async def close(self):
+        await self._server.close()
+
+
+async def main(args):
+    secret_keys = {args.secret_id: args.secret_key} if args.secret_id else None
+    config = MockConfig(args.latency, args.jitter, args.error_rate, args.list_size, args.pad_bytes)
+    server = MockServer(secret_keys, config)
+    port = await server.start(args.host, args.port)
+    print("模拟服务已启动: http://%s:%s, 接口数: %s" % (args.host, port, len(server.routes)))
+    try:
+        while True:
+            await asyncio.sleep(3600)
+    finally:
+        await server.close()
+
+
+if __name__ == "__main__":
+    """示例代码入口"""
+    parser = argparse.ArgumentParser(description="易盾反垃圾云服务本地模拟服务")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--secret-id", help="校验签名使用的secretId，不设置时不校验签名")
+    parser.add_argument("--secret-key", default="")
+    parser.add_argument("--latency", type=float, default=0.0, help="固定延迟，秒")
+    parser.add_argument("--jitter", type=float, default=0.0, help="指数分布额外延迟的均值，秒")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="返回HTTP 500的概率")
+    parser.add_argument("--list-size", type=int, default=1, help="响应中每个列表的元素个数")
+    parser.add_argument("--pad-bytes", type=int, default=0, help="响应额外填充字节数")
+    asyncio.run(main(parser.parse_args()))
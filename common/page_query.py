@@ -0,0 +1,316 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+易盾反垃圾云服务分页查询组件
+逐条遍历pageQuery类接口(按pageNum/pageSize返回count/rows)的全部结果，用于名单、敏感词等全量导出:
+    1. 每个查询预先并发请求后续prefetch页，结果仍按页顺序返回
+    2. 页大小在min_page_size~max_page_size之间按单页耗时自适应调整，超过target_latency时减半，
+       明显低于target_latency时加倍；页大小只在当前偏移量能被新页大小整除时变化，保证pageNum换算后不重不漏；
+       按count判断是否还有后续页，未到count却返回不足一页时视为服务端限制了页大小，缩小页大小后重新请求该页
+    3. 设置checkpoint时每返回完一页记录已返回的偏移量，请求多次失败抛出PageQueryError后，
+       使用相同参数重新创建PageQuery即从检查点继续，全部返回后删除检查点文件；中断所在页的数据可能重复返回；
+       startTime/endTime按当前时间生成时，用checkpoint_params取回检查点中的查询参数
+    4. list_query、imagelist_query设置windows时按startTime~endTime均分为多个时间窗口并行查询，
+       不同窗口的结果交错返回
+遍历过程中名单有新增或删除时，按偏移量分页可能出现重复或遗漏，全量导出建议设置endTime
+python版本：python3.7
+运行:
+    1. 修改 SECRET_ID,SECRET_KEY,BUSINESS_ID 为对应申请到的值
+    2. $ python -m common.page_query
+"""
+__author__ = 'yidun-dev'
+__date__ = '2026/10/18'
+__version__ = '0.2-dev'
+
+import asyncio
+import collections
+import hashlib
+import os
+import time
+
+from common import json_codec
+from common.async_client import AsyncAPIClient
+from common.endpoints import get_endpoint
+from common.resilience import retry_request
+
+# 接口名称 -> 响应中count/rows所在的路径
+PAGE_QUERIES = {
+    "imagelist_query": ("result",),
+    "keyword_query": ("result", "words"),
+    "list_query": ("result",),
+    "liveimage_query": ("result", "images"),
+    "livevideosolution_queryimage": ("result", "images"),
+    "videoimage_query": ("result", "images"),
+}
+# 支持按startTime/endTime切分时间窗口的接口
+TIME_RANGE_QUERIES = frozenset(["imagelist_query", "list_query"])
+
+
+class PageQueryError(Exception):
+    """分页请求重试后仍失败"""
+
+
+class _Cursor(object):
+    """单个时间窗口的分页状态"""
+
+    def __init__(self, key, params, offset, page_size):
+        self.key = key  # 检查点中的窗口标识
+        self.params = params
+        self.offset = offset  # 下一页的起始偏移量
+        self.delivered = offset  # 已返回给调用方的偏移量
+        self.page_size = page_size
+        self.count = None  # 总条数，首页返回后确定
+        self.done = False
+
+
+def checkpoint_params(checkpoint):
+    """读取检查点中的查询参数
+    Args:
+        checkpoint (str) 检查点文件路径
+    Returns:
+        创建PageQuery时的params，不含pageNum、pageSize，没有检查点时返回None
+    """
+    if not os.path.exists(checkpoint):
+        return None
+    with open(checkpoint, "rb") as f:
+        return json_codec.loads(f.read()).get("params")
+
+
+def _aligned_size(offset, page_size, min_page_size):
+    """Returns: 不超过page_size且能整除offset的页大小"""
+    size = page_size
+    while size > min_page_size and offset % size:
+        size //= 2
+    return size
+
+
+class PageQuery(object):
+    """pageQuery类接口的分页遍历"""
+
+    def __init__(self, client, name, params=None, page_size=100, min_page_size=20, max_page_size=1000, prefetch=2,
+                 windows=1, concurrency=8, target_latency=1.0, retries=3, checkpoint=None):
+        """
+        Args:
+            client (AsyncAPIClient) 对应产品的异步客户端
+            name (str) 接口名称，如list_query
+            params (dict) 除pageNum、pageSize外的查询参数
+            page_size (int) 初始页大小，按min_page_size的2的幂次倍取整
+            min_page_size (int) 最小页大小
+            max_page_size (int) 最大页大小，不超过接口允许的上限，按min_page_size的2的幂次倍向下取整
+            prefetch (int) 每个时间窗口预先请求的页数
+            windows (int) 时间窗口数，仅list_query、imagelist_query且设置了startTime、endTime时可用
+            concurrency (int) 全部窗口合计的最大并发请求数
+            target_latency (float) 单页目标耗时，秒
+            retries (int) 单页请求失败后的重试次数
+            checkpoint (str) 检查点文件路径，None表示不记录
+        """
+        if name not in PAGE_QUERIES:
+            raise ValueError("unsupported page query endpoint: %s" % name)
+        params = dict(params or {})
+        params.pop("pageNum", None)
+        params.pop("pageSize", None)
+        if windows > 1 and (name not in TIME_RANGE_QUERIES or "startTime" not in params or "endTime" not in params):
+            raise ValueError("windows requires list_query or imagelist_query with startTime and endTime")
+        self.client = client
+        self.endpoint = get_endpoint(name)
+        self.params = params
+        self.min_page_size = min_page_size
+        # 页大小只取min_page_size的2的幂次倍，任意偏移量减半若干次后总能找到可整除的页大小
+        size = min_page_size
+        while size * 2 <= max_page_size:
+            size *= 2
+        self.max_page_size = size
+        while size > min_page_size and size > page_size:
+            size //= 2
+        self.page_size = size
+        self.prefetch = prefetch
+        self.windows = windows
+        self.target_latency = target_latency
+        self.retries = retries
+        self.checkpoint = checkpoint
+        self.requests = 0  # 请求次数，含重试
+        self.rows_returned = 0
+        self.concurrency = concurrency
+        self._semaphore = None
+        self._cursors = self._load_cursors()
+
+    def _query_key(self):
+        raw = json_codec.dumps([self.endpoint.name, sorted((str(k), str(v)) for k, v in self.params.items()),
+                                self.windows])
+        return hashlib.sha1(raw.encode("utf8")).hexdigest()
+
+    def _split(self):
+        """Returns: [(窗口标识, 窗口查询参数)]"""
+        if self.windows <= 1:
+            return [("all", self.params)]
+        start, end = int(self.params["startTime"]), int(self.params["endTime"])
+        span = (end - start + 1) / float(self.windows)
+        bounds = [start + int(span * i) for i in range(self.windows)] + [end + 1]
+        return [("%d-%d" % (lo, hi - 1), dict(self.params, startTime=lo, endTime=hi - 1))
+                for lo, hi in zip(bounds, bounds[1:]) if hi > lo]
+
+    def _load_cursors(self):
+        offsets = {}
+        if self.checkpoint and os.path.exists(self.checkpoint):
+            with open(self.checkpoint, "rb") as f:
+                state = json_codec.loads(f.read())
+            if state.get("key") == self._query_key():
+                offsets = state["offsets"]
+        cursors = []
+        for key, params in self._split():
+            offset = offsets.get(key, 0)
+            if offset is None:  # 该窗口已全部返回
+                continue
+            # 检查点偏移量按最小页大小对齐，中断所在页可能重复返回
+            offset -= offset % self.min_page_size
+            cursors.append(_Cursor(key, params, offset, _aligned_size(offset, self.page_size, self.min_page_size)))
+        return cursors
+
+    def _save(self):
+        if not self.checkpoint:
+            return
+        offsets = dict((key, None) for key, _ in self._split())
+        offsets.update((cursor.key, None if cursor.done else cursor.delivered) for cursor in self._cursors)
+        tmp = "%s.tmp" % self.checkpoint
+        with open(tmp, "wb") as f:
+            f.write(json_codec.dumpb({"key": self._query_key(), "params": self.params, "offsets": offsets}))
+        os.replace(tmp, self.checkpoint)
+
+    def _page(self, ret):
+        """Returns: (count, rows)"""
+        container = ret
+        for key in PAGE_QUERIES[self.endpoint.name]:
+            container = container.get(key) if container is not None else None
+        if container is None:  # 如videoimage_query的taskId不存在
+            return 0, []
+        return container.get("count") or 0, list(container.get("rows") or [])
+
+    async def _fetch(self, cursor, offset, size):
+        """请求一页，Returns: (count, rows, 页大小, 耗时)"""
+        params = dict(cursor.params, pageNum=offset // size + 1, pageSize=size)
+        elapsed = 0.0
+
+        async def send():
+            nonlocal elapsed
+            async with self._semaphore:
+                self.requests += 1
+                start = time.perf_counter()
+                try:
+                    return await self.client.request(self.endpoint, params)
+                finally:
+                    elapsed = time.perf_counter() - start
+
+        def shrink(ex):
+            # 超时等异常时后续页使用较小的页大小，本页已按size换算pageNum，仍按原大小重试
+            cursor.page_size = max(self.min_page_size, min(cursor.page_size, size // 2))
+
+        ret, error = await retry_request(send, self.retries, on_exception=shrink)
+        if ret is None:
+            raise PageQueryError("%s failed at offset %d: %s" % (self.endpoint.name, offset, error))
+        count, rows = self._page(ret)
+        return count, rows, size, elapsed
+
+    def _limit(self, cursor, rows):
+        """服务端单页最多返回rows条时，将页大小上限缩小到不超过rows的min_page_size的2的幂次倍"""
+        size = self.min_page_size
+        while size * 2 <= rows:
+            size *= 2
+        self.max_page_size = min(self.max_page_size, size)
+        cursor.page_size = min(cursor.page_size, size)
+
+    def _adapt(self, cursor, size, elapsed, full):
+        if elapsed > self.target_latency and size > self.min_page_size:
+            cursor.page_size = max(self.min_page_size, min(cursor.page_size, size // 2))
+        elif full and elapsed < self.target_latency / 2 and size >= cursor.page_size:
+            cursor.page_size = min(self.max_page_size, size * 2)
+
+    async def _walk(self, cursor, queue):
+        """按页顺序请求单个窗口的数据，每页放入queue，结束时放入(cursor, None)"""
+        pending = collections.deque()
+        try:
+            while True:
+                # 首页返回count之前只请求一页
+                while (cursor.count is not None or not pending) and len(pending) <= self.prefetch \
+                        and (cursor.count is None or cursor.offset < cursor.count):
+                    size = _aligned_size(cursor.offset, cursor.page_size, self.min_page_size)
+                    pending.append((cursor.offset, asyncio.ensure_future(self._fetch(cursor, cursor.offset, size))))
+                    cursor.offset += size
+                if not pending:
+                    break
+                offset, future = pending.popleft()
+                count, rows, size, elapsed = await future
+                if cursor.count is None:
+                    cursor.count = count
+                if len(rows) < size and offset + len(rows) != cursor.count and size > self.min_page_size:
+                    # 不足一页却不是最后一页，服务端限制了页大小，按size换算的pageNum与实际偏移量不符，
+                    # 丢弃本页及已预取的页，缩小页大小后重新请求
+                    self._limit(cursor, len(rows))
+                    for _, prefetched in pending:
+                        prefetched.cancel()
+                    pending.clear()
+                    cursor.offset = offset
+                    continue
+                self._adapt(cursor, size, elapsed, len(rows) >= size)
+                # 是否还有后续页由count判断，不足一页不代表已到最后一页
+                await queue.put((cursor, offset + size, rows))
+            await queue.put((cursor, None, None))
+        except asyncio.CancelledError:
+            raise
+        except Exception as ex:
+            await queue.put((cursor, ex, None))
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+    async def rows(self):
+        """遍历全部结果
+        Returns:
+            单条结果的异步生成器
+        """
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        queue = asyncio.Queue(maxsize=max(1, len(self._cursors)) * (self.prefetch + 1))
+        walkers = [asyncio.ensure_future(self._walk(cursor, queue)) for cursor in self._cursors]
+        running = len(walkers)
+        try:
+            while running:
+                cursor, end, rows = await queue.get()
+                if rows is None:
+                    if isinstance(end, Exception):
+                        raise end
+                    running -= 1
+                    cursor.done = True
+                    self._save()
+                    continue
+                for row in rows:
+                    yield row
+                self.rows_returned += len(rows)
+                cursor.delivered = end
+                self._save()
+            if self.checkpoint and os.path.exists(self.checkpoint):
+                os.remove(self.checkpoint)
+        finally:
+            for walker in walkers:
+                walker.cancel()
+
+
+async def main():
+    SECRET_ID = "your_secret_id"  # 产品密钥ID，产品标识
+    SECRET_KEY = "your_secret_key"  # 产品私有密钥，服务端生成签名信息使用，请严格保管，避免泄露
+    BUSINESS_ID = "your_business_id"  # 业务ID，易盾根据产品业务特点分配
+    checkpoint = "list_export.checkpoint"
+    # 从检查点继续时沿用上次的时间范围，否则endTime每次不同，检查点无法匹配
+    params = checkpoint_params(checkpoint)
+    if params is None:
+        end_time = int(time.time() * 1000)
+        params = {"listType": 2, "entityType": 1, "startTime": end_time - 365 * 86400 * 1000, "endTime": end_time}
+    async with AsyncAPIClient(SECRET_ID, SECRET_KEY, BUSINESS_ID) as client:
+        query = PageQuery(client, "list_query", params, windows=8, checkpoint=checkpoint)
+        with open("list_export.txt", "a") as f:
+            async for row in query.rows():
+                f.write("%s\t%s\n" % (row["entity"], row["releaseTime"]))
+        print("导出: %s 条, 请求: %s 次" % (query.rows_returned, query.requests))
+
+
+if __name__ == "__main__":
+    """示例代码入口"""
+    asyncio.run(main())
@@ -0,0 +1,251 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+易盾反垃圾云服务客户端令牌桶限流
+按(secretId, businessId, API_URL)分别限流，令牌不足时预约令牌并等待，把突发请求平滑为稳定速率，而不是直接失败:
+    1. LocalTokenStore 进程内共享，适用于单进程多线程/协程
+    2. FileTokenStore 通过mmap映射的本地文件在多个进程之间共享令牌桶，更新时使用文件锁(仅支持类Unix系统)
+    3. RateLimiter.wrap 为各产品示例代码的API类实例增加限流，AsyncAPIClient(rate_limiter=...)用于异步客户端
+python版本：python3.7
+运行:
+    $ python -m common.rate_limit
+"""
+__author__ = 'yidun-dev'
+__date__ = '2026/10/18'
+__version__ = '0.2-dev'
+
+import asyncio
+import functools
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+
+SLOT = struct.Struct("<Qdd")  # key哈希, 剩余令牌数, 更新时间
+
+
+class RateLimitExceeded(Exception):
+    """需要等待的时间超过max_wait"""
+
+    def __init__(self, key, wait):
+        super(RateLimitExceeded, self).__init__("rate limit exceeded: %s, wait %.3fs" % (key, wait))
+        self.key = key
+        self.wait = wait
+
+
+def _reserve(tokens, updated, now, rate, burst, count, max_wait):
+    """令牌桶预约，Returns: (剩余令牌数, 更新时间, 需要等待的时间)，超过max_wait时不预约，等待时间为负数"""
+    tokens = min(burst, tokens + (now - updated) * rate)
+    wait = max(0.0, (count - tokens) / rate)
+    if max_wait is not None and wait > max_wait:
+        return tokens, now, -wait
+    return tokens - count, now, wait
+
+
+class LocalTokenStore(object):
+    """进程内令牌桶存储"""
+
+    def __init__(self):
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, key, rate, burst, count=1, max_wait=None):
+        """预约count个令牌
+        Returns:
+            需要等待的时间，秒；超过max_wait时返回负数，且不消耗令牌
+        """
+        now = time.time()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (burst, now))
+            tokens, updated, wait = _reserve(tokens, updated, now, rate, burst, count, max_wait)
+            self._buckets[key] = (tokens, updated)
+        return wait
+
+
+class FileTokenStore(object):
+    """多进程共享的令牌桶存储，桶状态保存在mmap映射的文件中，按key哈希开放寻址"""
+
+    def __init__(self, path, slots=1024):
+        """
+        Args:
+            path (str) 共享文件路径，各进程使用同一路径，建议放在/dev/shm等内存文件系统
+            slots (int) 最多容纳的key数量，各进程须一致
+        """
+        import fcntl
+        self._fcntl = fcntl
+        self.path = path
+        self.slots = slots
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        size = slots * SLOT.size
+        with self._locked():
+            if os.fstat(self._fd).st_size < size:
+                os.ftruncate(self._fd, size)
+        self._mmap = mmap.mmap(self._fd, size)
+        self._thread_lock = threading.Lock()
+        self._index = {}
+
+    @contextmanager
+    def _locked(self):
+        self._fcntl.flock(self._fd, self._fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            self._fcntl.flock(self._fd, self._fcntl.LOCK_UN)
+
+    @staticmethod
+    def _hash(key):
+        return struct.unpack("<Q", hashlib.md5(key.encode("utf8")).digest()[:8])[0] or 1
+
+    def _slot(self, key_hash):
+        start = key_hash % self.slots
+        for i in range(self.slots):
+            offset = ((start + i) % self.slots) * SLOT.size
+            slot_hash = SLOT.unpack_from(self._mmap, offset)[0]
+            if slot_hash in (key_hash, 0):
+                return offset, slot_hash == 0
+        raise ValueError("token store is full: %s" % self.path)
+
+    def reserve(self, key, rate, burst, count=1, max_wait=None):
+        """预约count个令牌，参数及返回值同LocalTokenStore.reserve"""
+        key_hash = self._hash(key)
+        with self._thread_lock, self._locked():
+            now = time.time()
+            offset = self._index.get(key_hash)
+            if offset is None:
+                offset, empty = self._slot(key_hash)
+                if empty:
+                    SLOT.pack_into(self._mmap, offset, key_hash, burst, now)
+                self._index[key_hash] = offset
+            _, tokens, updated = SLOT.unpack_from(self._mmap, offset)
+            tokens, updated, wait = _reserve(tokens, updated, now, rate, burst, count, max_wait)
+            SLOT.pack_into(self._mmap, offset, key_hash, tokens, updated)
+        return wait
+
+    def close(self):
+        self._mmap.close()
+        os.close(self._fd)
+
+
+class RateLimiter(object):
+    """按(secretId, businessId, API_URL)限流"""
+
+    def __init__(self, rate, burst=None, store=None, max_wait=None):
+        """
+        Args:
+            rate (float) 默认每秒请求数
+            burst (float) 默认令牌桶容量，即允许的突发请求数，默认与rate相同
+            store (LocalTokenStore|FileTokenStore) 令牌桶存储，默认进程内存储
+            max_wait (float) 最长等待时间，秒，超过时抛出RateLimitExceeded，None表示一直等待
+        """
+        self.rate = rate
+        self.burst = burst or rate
+        self.store = store or LocalTokenStore()
+        self.max_wait = max_wait
+        self._limits = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(secret_id, business_id, url):
+        return "%s|%s|%s" % (secret_id, business_id or "", url)
+
+    def set_rate(self, secret_id, business_id, url, rate, burst=None):
+        """单独设置某个业务、接口的限流速率，与易盾分配的QPS配额保持一致"""
+        self._limits[self.key(secret_id, business_id, url)] = (rate, burst or rate)
+
+    def reserve(self, secret_id, business_id, url, count=1):
+        """预约令牌
+        Returns:
+            需要等待的时间，秒
+        Raises:
+            RateLimitExceeded 需要等待的时间超过max_wait
+        """
+        key = self.key(secret_id, business_id, url)
+        rate, burst = self._limits.get(key, (self.rate, self.burst))
+        wait = self.store.reserve(key, rate, burst, count, self.max_wait)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = {"requests": 0, "waited": 0, "rejected": 0,
+                                            "wait_seconds": 0.0, "max_wait_seconds": 0.0}
+            if wait < 0:
+                stats["rejected"] += 1
+            else:
+                stats["requests"] += 1
+                if wait > 0:
+                    stats["waited"] += 1
+                    stats["wait_seconds"] += wait
+                    stats["max_wait_seconds"] = max(stats["max_wait_seconds"], wait)
+        if wait < 0:
+            raise RateLimitExceeded(key, -wait)
+        return wait
+
+    def acquire(self, secret_id, business_id, url, count=1):
+        """阻塞直到获得令牌，Returns: 等待时间，秒"""
+        wait = self.reserve(secret_id, business_id, url, count)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, secret_id, business_id, url, count=1):
+        """协程版本的acquire"""
+        wait = self.reserve(secret_id, business_id, url, count)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def stats(self):
+        """Returns: 各key的请求数、等待次数、累计及最长等待时间"""
+        with self._lock:
+            return dict((key, dict(stats)) for key, stats in self._stats.items())
+
+    def wrap(self, api):
+        """为示例代码API类实例的check/query方法增加限流
+        Args:
+            api (object) 如TextCheckAPIDemo实例
+        Returns:
+            api本身
+        """
+        for name in ("check", "query"):
+            method = getattr(api, name, None)
+            if method is not None:
+                setattr(api, name, self._limited(api, method))
+        return api
+
+    def _limited(self, api, method):
+        @functools.wraps(method)
+        def limited(*args, **kwargs):
+            self.acquire(api.secret_id, getattr(api, "business_id", None), api.API_URL)
+            return method(*args, **kwargs)
+
+        return limited
+
+
+def _demo_worker(path, url, index):
+    limiter = RateLimiter(rate=50, burst=5, store=FileTokenStore(path))
+    for _ in range(50):
+        limiter.acquire("your_secret_id", "your_business_id", url)
+    print("worker %d: %s" % (index, limiter.stats()))
+
+
+def main():
+    import multiprocessing
+    import tempfile
+
+    path = os.path.join(tempfile.gettempdir(), "yidun_rate_limit.bin")
+    url = "http://as.dun.163.com/v5/text/check"
+    start = time.time()
+    workers = [multiprocessing.Process(target=_demo_worker, args=(path, url, i)) for i in range(4)]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join()
+    print("4个进程共200次请求, 限流50次/秒, 耗时: %.2fs" % (time.time() - start))
+
+
+if __name__ == "__main__":
+    """示例代码入口"""
+    main()
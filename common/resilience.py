@@ -0,0 +1,335 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+易盾反垃圾云服务asyncio客户端的重试、对冲请求及熔断
+ResilientClient包装AsyncAPIClient，请求失败时抛出APIError子类而不是返回None:
+    1. 重试: 每次重试都重新填充timestamp、nonce并重新签名，按指数退避加随机抖动等待；
+       连接未建立时总是可以重试，请求已发出后的超时、5xx只对幂等接口(Endpoint.idempotent)重试，避免重复提交检测任务；
+       响应体无法解析时抛出APIDecodeError，不重试
+    2. 对冲: 幂等接口在hedge_delay内没有响应时再发出一个请求，取先成功的结果并取消另一个，用于削减长尾延迟
+    3. 熔断: 每个接口独立计数，连续失败failure_threshold次后打开熔断器，reset_timeout内直接抛出CircuitOpenError，
+       之后放行一个探测请求，成功则关闭
+python版本：python3.7
+运行:
+    1. 修改 SECRET_ID,SECRET_KEY,BUSINESS_ID 为对应申请到的值
+    2. $ python -m common.resilience
+"""
+__author__ = 'yidun-dev'
+__date__ = '2026/10/18'
+__version__ = '0.2-dev'
+
+import asyncio
+import random
+import time
+
+from common.async_client import AsyncAPIClient, ConnectError, HttpStatusError, ResponseDecodeError
+from common.endpoints import get_endpoint
+
+# 响应中表示服务端暂时不可用、可以重试的code
+RETRYABLE_CODES = frozenset([503])
+
+
+class APIError(Exception):
+    """调用易盾接口失败"""
+
+    retryable = False  # 请求已发出时是否可以重试
+
+    def __init__(self, name, message, code=None):
+        super(APIError, self).__init__("%s: %s" % (name, message))
+        self.name = name
+        self.code = code
+
+
+class APIConnectionError(APIError):
+    """连接失败或连接被中断"""
+
+    retryable = True
+
+    def __init__(self, name, message, sent=True):
+        super(APIConnectionError, self).__init__(name, message)
+        self.sent = sent  # 请求是否可能已经发出
+
+
+class APITimeoutError(APIError):
+    """读超时"""
+
+    retryable = True
+
+
+class APIServerError(APIError):
+    """服务端返回HTTP 5xx或暂时不可用"""
+
+    retryable = True
+
+
+class APIDecodeError(APIError):
+    """响应体不是合法的json，请求已被服务端处理，重试无意义"""
+
+
+class APIResponseError(APIError):
+    """接口返回code不为200，如参数错误、签名错误，重试无意义"""
+
+    def __init__(self, name, code, msg):
+        super(APIResponseError, self).__init__(name, "code=%s, msg=%s" % (code, msg), code)
+        self.msg = msg
+
+
+class CircuitOpenError(APIError):
+    """熔断器打开，请求未发出"""
+
+
+def is_idempotent(name):
+    """Returns: 接口重复请求是否安全"""
+    return get_endpoint(name).idempotent
+
+
+async def retry_request(send, retries, idempotent=True, on_exception=None):
+    """按统一规则重试单个请求，供批量写入、分页查询等不经过ResilientClient的组件使用
+    Args:
+        send (function) 无参数的协程函数，发送一次请求并返回响应json
+        retries (int) 失败后的重试次数
+        idempotent (bool) 接口是否幂等；非幂等接口只在连接失败(请求未发出)或返回RETRYABLE_CODES时重试，
+            读超时等请求可能已被处理的错误直接返回失败，避免重复写入
+        on_exception (function) 每次请求抛出异常时以异常为参数调用
+    Returns:
+        (code为200的响应, None)，重试后仍失败时返回(None, 错误信息)
+    """
+    error = None
+    for attempt in range(retries + 1):
+        try:
+            ret = await send()
+        except asyncio.CancelledError:
+            raise
+        except Exception as ex:
+            error = str(ex) or type(ex).__name__
+            if on_exception is not None:
+                on_exception(ex)
+            if not idempotent and not isinstance(ex, ConnectError):
+                break
+        else:
+            if ret["code"] == 200:
+                return ret, None
+            error = "code=%s, msg=%s" % (ret["code"], ret.get("msg"))
+            if ret["code"] not in RETRYABLE_CODES:  # 参数错误、签名错误等，重试无意义
+                break
+        if attempt < retries:
+            await asyncio.sleep(min(0.1 * 2 ** attempt, 2.0))
+    return None, error
+
+
+class CircuitBreaker(object):
+    """单个接口的熔断器"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        """
+        Args:
+            failure_threshold (int) 连续失败多少次后打开
+            reset_timeout (float) 打开后多久放行探测请求，秒
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0  # 当前连续失败次数
+        self.opened = 0  # 累计打开次数
+        self._opened_at = 0.0
+        self._probing = False
+
+    def allow(self):
+        """Returns: 是否放行请求"""
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self.state = self.HALF_OPEN
+        if self.state == self.HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.failures = 0
+        self._probing = False
+
+    def record_cancel(self):
+        """请求被取消，不计入成功或失败"""
+        self._probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        self._probing = False
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self.opened += 1
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+
+
+class ResilientClient(object):
+    """带重试、对冲及熔断的易盾异步客户端"""
+
+    def __init__(self, client, retries=2, backoff=0.1, max_backoff=2.0, hedge_delay=None,
+                 failure_threshold=5, reset_timeout=30.0):
+        """
+        Args:
+            client (AsyncAPIClient) 异步客户端
+            retries (int) 最大重试次数
+            backoff (float) 首次重试前的等待时间，秒，之后每次翻倍
+            max_backoff (float) 最长等待时间，秒
+            hedge_delay (float) 幂等接口发出对冲请求前的等待时间，秒，None表示不对冲
+            failure_threshold (int) 熔断器连续失败阈值
+            reset_timeout (float) 熔断器打开后多久放行探测请求，秒
+        """
+        self.client = client
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.hedge_delay = hedge_delay
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.breakers = {}
+        self._stats = {}
+
+    def breaker(self, name):
+        """Returns: 接口对应的熔断器"""
+        breaker = self.breakers.get(name)
+        if breaker is None:
+            breaker = self.breakers[name] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+        return breaker
+
+    def stats(self):
+        """Returns: 各接口的请求、重试、对冲、失败次数及熔断器状态"""
+        return dict((name, dict(stats, circuit=self.breaker(name).state, opened=self.breaker(name).opened))
+                    for name, stats in self._stats.items())
+
+    def _count(self, name, key):
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = self._stats[name] = {"requests": 0, "retries": 0, "hedges": 0, "failures": 0}
+        stats[key] += 1
+
+    async def check(self, name, params=None, timeout=None):
+        """请求易盾接口
+        Args:
+            name (str) 接口名称，如text_check
+            params (dict) 请求参数，不会被修改，每次请求都基于原始参数重新签名
+            timeout (tuple) (连接超时, 读超时)秒，默认使用接口配置
+        Returns:
+            请求结果，json格式，code为200
+        Raises:
+            APIError 重试后仍然失败
+        """
+        endpoint = get_endpoint(name)
+        params = {} if params is None else params
+        idempotent = endpoint.idempotent
+        breaker = self.breaker(name)
+        self._count(name, "requests")
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                raise CircuitOpenError(name, "circuit open")
+            try:
+                if self.hedge_delay is not None and idempotent:
+                    ret = await self._hedged(endpoint, params, timeout)
+                else:
+                    ret = await self._send(endpoint, params, timeout)
+            except asyncio.CancelledError:
+                breaker.record_cancel()
+                raise
+            except APIError as ex:
+                if isinstance(ex, APIResponseError):
+                    breaker.record_success()
+                    raise
+                breaker.record_failure()
+                self._count(name, "failures")
+                sent = getattr(ex, "sent", True)
+                if attempt >= self.retries or not ex.retryable or (sent and not idempotent):
+                    raise
+                attempt += 1
+                self._count(name, "retries")
+                delay = min(self.max_backoff, self.backoff * (2 ** (attempt - 1)))
+                await asyncio.sleep(random.uniform(delay / 2, delay))
+                continue
+            except Exception:
+                # 探测请求必须结束半开状态，否则熔断器一直停留在half_open，之后的请求全部被拒绝
+                breaker.record_failure()
+                self._count(name, "failures")
+                raise
+            breaker.record_success()
+            return ret
+
+    query = check
+
+    async def _send(self, endpoint, params, timeout):
+        """发送一次请求，每次都复制原始参数重新签名"""
+        name = endpoint.name
+        try:
+            ret = await self.client.request(endpoint, dict(params), timeout)
+        except ConnectError as ex:
+            raise APIConnectionError(name, str(ex), sent=False) from ex
+        except asyncio.TimeoutError as ex:
+            raise APITimeoutError(name, "read timeout") from ex
+        except HttpStatusError as ex:
+            raise APIServerError(name, str(ex), ex.status) from ex
+        except ResponseDecodeError as ex:
+            raise APIDecodeError(name, str(ex)) from ex
+        except (OSError, ValueError) as ex:
+            raise APIConnectionError(name, str(ex) or type(ex).__name__) from ex
+        except Exception as ex:  # 如限流等待超过max_wait时的RateLimitExceeded，不重试
+            raise APIError(name, str(ex) or type(ex).__name__) from ex
+        code = ret.get("code")
+        if code in RETRYABLE_CODES:
+            raise APIServerError(name, ret.get("msg"), code)
+        if code != 200:
+            raise APIResponseError(name, code, ret.get("msg"))
+        return ret
+
+    async def _hedged(self, endpoint, params, timeout):
+        first = asyncio.ensure_future(self._send(endpoint, params, timeout))
+        try:
+            done, _ = await asyncio.wait([first], timeout=self.hedge_delay)
+        except asyncio.CancelledError:
+            first.cancel()
+            raise
+        if done:
+            return first.result()
+        self._count(endpoint.name, "hedges")
+        pending = {first, asyncio.ensure_future(self._send(endpoint, params, timeout))}
+        error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+
+async def main():
+    SECRET_ID = "your_secret_id"  # 产品密钥ID，产品标识
+    SECRET_KEY = "your_secret_key"  # 产品私有密钥，服务端生成签名信息使用，请严格保管，避免泄露
+    BUSINESS_ID = "your_business_id"  # 业务ID，易盾根据产品业务特点分配
+    async with AsyncAPIClient(SECRET_ID, SECRET_KEY, BUSINESS_ID) as client:
+        api = ResilientClient(client, retries=2, hedge_delay=0.3)
+        try:
+            ret = await api.check("text_check", {"dataId": "ebfcad1c-dba1-490c-b4de-e784c2691768",
+                                                 "content": "易盾测试内容！v5接口!"})
+            antispam: dict = ret["result"]["antispam"]
+            print("taskId: %s, suggestion: %s" % (antispam["taskId"], antispam["suggestion"]))
+        except APIResponseError as ex:
+            print("ERROR: code=%s, msg=%s" % (ex.code, ex.msg))
+        except APIError as ex:
+            print("调用API接口失败:", str(ex))
+        print(api.stats())
+
+
+if __name__ == "__main__":
+    """示例代码入口"""
+    asyncio.run(main())
@@ -0,0 +1,588 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+易盾反垃圾云服务响应模型
+视频、音频回调等响应可达数MB，json.loads会一次性构造全部嵌套dict/list；本模块按需解析:
+    1. LazyObject 按字段顺序向后解析，读取code、msg等靠前的字段时不会解析之后的result
+    2. LazyArray 只记录已扫描元素在响应文本中的起始位置(array)，按下标访问或遍历时才向后扫描并解码对应元素，
+       segments、pictures、details等大数组不会整体驻留内存；超过depth层的对象、数组由json的C扫描器直接解码
+    3. Response及各产品的模型类使用__slots__，以task_id、suggestion等属性访问字段，
+       同时保留ret["result"]["antispam"]这样的下标访问方式，兼容现有解析代码
+注意: LazyArray每次访问元素都会重新解码，需要多次使用的元素请自行保存
+python版本：python3.7
+运行:
+    $ python -m common.responses
+"""
+__author__ = 'yidun-dev'
+__date__ = '2026/10/18'
+__version__ = '0.2-dev'
+
+import json
+import re
+from array import array
+from json.decoder import scanstring
+
+DEFAULT_DEPTH = 5  # 按需解析的对象、数组层数，包含最外层对象
+
+_scan_once = json.JSONDecoder().scan_once
+_END = object()
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+def _skip(doc, pos):
+    """Returns: pos及之后第一个非空白字符的位置，调用方随后都会读取该字符，已到结尾时抛出JSONDecodeError"""
+    if pos < len(doc) and doc[pos] in " \t\n\r":
+        pos = _WHITESPACE.match(doc, pos).end()
+    if pos >= len(doc):
+        raise _error("Expecting value", doc, pos)
+    return pos
+
+
+def _error(msg, doc, pos):
+    return json.JSONDecodeError(msg, doc, pos)
+
+
+def _decode(doc, pos, depth):
+    """解码pos处的值
+    Returns:
+        (值, 结束位置)，值为LazyObject、LazyArray时结束位置为None，需调用finish获取
+    """
+    c = doc[pos]
+    if depth > 0 and c == "{":
+        return LazyObject(doc, pos, depth), None
+    if depth > 0 and c == "[":
+        return LazyArray(doc, pos, depth), None
+    try:
+        return _scan_once(doc, pos)
+    except StopIteration:
+        raise _error("Expecting value", doc, pos)
+
+
+class LazyObject(object):
+    """按需解析的json对象"""
+
+    __slots__ = ("_doc", "_pos", "_depth", "_fields", "_pending", "end")
+
+    def __init__(self, doc, pos, depth=DEFAULT_DEPTH):
+        """
+        Args:
+            doc (str) 响应文本
+            pos (int) 对象起始位置，即"{"所在位置
+            depth (int) 按需解析的层数
+        """
+        self._doc = doc
+        self._pos = _skip(doc, pos + 1)
+        self._depth = depth
+        self._fields = {}
+        self._pending = None  # 尚未确定结束位置的最后一个字段值
+        self.end = None  # 对象结束位置，全部字段解析完成后才确定
+        if doc[self._pos] == "}":
+            self._done(self._pos)
+
+    def _done(self, pos):
+        self.end = pos + 1
+        self._doc = None
+
+    def _next(self):
+        """解析下一个字段，Returns: 是否解析了新字段"""
+        if self.end is not None:
+            return False
+        doc = self._doc
+        if self._pending is not None:
+            self._pos = _skip(doc, self._pending.finish())
+            self._pending = None
+        pos = self._pos
+        if self._fields:
+            if doc[pos] == "}":
+                self._done(pos)
+                return False
+            if doc[pos] != ",":
+                raise _error("Expecting ',' delimiter", doc, pos)
+            pos = _skip(doc, pos + 1)
+        if doc[pos] != '"':
+            raise _error("Expecting property name enclosed in double quotes", doc, pos)
+        key, pos = scanstring(doc, pos + 1)
+        pos = _skip(doc, pos)
+        if doc[pos] != ":":
+            raise _error("Expecting ':' delimiter", doc, pos)
+        value, end = _decode(doc, _skip(doc, pos + 1), self._depth - 1)
+        self._fields[key] = value
+        if end is None:
+            self._pending = value
+        else:
+            self._pos = _skip(doc, end)
+        return True
+
+    def finish(self):
+        """解析全部字段，Returns: 对象结束位置"""
+        while self._next():
+            pass
+        return self.end
+
+    def __getitem__(self, key):
+        while key not in self._fields:
+            if not self._next():
+                raise KeyError(key)
+        return self._fields[key]
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def __setitem__(self, key, value):
+        self.finish()
+        self._fields[key] = value
+
+    def keys(self):
+        self.finish()
+        return self._fields.keys()
+
+    def items(self):
+        self.finish()
+        return self._fields.items()
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        self.finish()
+        return len(self._fields)
+
+    def to_python(self):
+        """Returns: 完整解码后的dict"""
+        return dict((key, to_python(value)) for key, value in self.items())
+
+    def __repr__(self):
+        return "LazyObject(%s)" % ", ".join(self._fields)
+
+
+class LazyArray(object):
+    """按需解码元素的json数组，只保存已扫描元素的起始位置"""
+
+    __slots__ = ("_doc", "_pos", "_depth", "_offsets", "_pending", "end")
+
+    def __init__(self, doc, pos, depth=DEFAULT_DEPTH):
+        """
+        Args:
+            doc (str) 响应文本
+            pos (int) 数组起始位置，即"["所在位置
+            depth (int) 按需解析的层数
+        """
+        self._doc = doc
+        self._pos = _skip(doc, pos + 1)
+        self._depth = depth
+        self._offsets = array("Q")
+        self._pending = None  # 尚未确定结束位置的最后一个元素
+        self.end = None  # 数组结束位置，全部元素扫描完成后才确定
+
+    def _next(self):
+        """扫描下一个元素
+        Returns:
+            元素值，没有更多元素时返回_END
+        """
+        if self.end is not None:
+            return _END
+        doc = self._doc
+        if self._pending is not None:
+            self._pos = _skip(doc, self._pending.finish())
+            self._pending = None
+        pos = self._pos
+        if doc[pos] == "]":
+            self.end = pos + 1
+            return _END
+        if self._offsets:
+            if doc[pos] != ",":
+                raise _error("Expecting ',' delimiter", doc, pos)
+            pos = _skip(doc, pos + 1)
+        self._offsets.append(pos)
+        value, end = _decode(doc, pos, self._depth - 1)
+        if end is None:
+            self._pending = value
+        else:
+            self._pos = _skip(doc, end)
+        return value
+
+    def finish(self):
+        """扫描全部元素，Returns: 数组结束位置"""
+        while self._next() is not _END:
+            pass
+        return self.end
+
+    def _element(self, pos):
+        return _decode(self._doc, pos, self._depth - 1)[0]
+
+    def __len__(self):
+        self.finish()
+        return len(self._offsets)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice) or index < 0:
+            self.finish()
+            if isinstance(index, slice):
+                return [self._element(pos) for pos in self._offsets[index]]
+        elif index >= len(self._offsets):
+            value = _END
+            while index >= len(self._offsets):
+                value = self._next()
+                if value is _END:
+                    raise IndexError("list index out of range")
+            return value
+        return self._element(self._offsets[index])
+
+    def __iter__(self):
+        index = 0
+        while True:
+            if index < len(self._offsets):
+                value = self._element(self._offsets[index])
+            else:
+                value = self._next()
+                if value is _END:
+                    return
+            yield value
+            index += 1
+
+    def to_python(self):
+        """Returns: 完整解码后的list"""
+        return [to_python(value) for value in self]
+
+    def __repr__(self):
+        return "LazyArray(%s%s)" % (len(self._offsets), "" if self.end is not None else "+")
+
+
+def to_python(value):
+    """Returns: 将LazyObject、LazyArray及模型完整解码为dict、list"""
+    if isinstance(value, (LazyObject, LazyArray, Model, ModelList)):
+        return value.to_python()
+    return value
+
+
+class Field(object):
+    """模型字段，从json对象中按需读取"""
+
+    __slots__ = ("key", "model")
+
+    def __init__(self, key, model=None):
+        """
+        Args:
+            key (str) json字段名
+            model (type) 字段值对应的模型类，数组时为元素的模型类，None表示原样返回
+        """
+        self.key = key
+        self.model = model
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        value = instance._data.get(self.key)
+        if self.model is None or value is None:
+            return value
+        if isinstance(value, (list, LazyArray)):
+            return ModelList(value, self.model)
+        return self.model(value)
+
+
+class Model(object):
+    """响应模型基类，包装LazyObject或dict"""
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data):
+        self._data = data
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __setitem__(self, key, value):
+        self._data[key] = value
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        return self._data.get(key, default)
+
+    def to_python(self):
+        """Returns: 完整解码后的dict"""
+        return to_python(self._data)
+
+    def __repr__(self):
+        fields = [name for klass in type(self).__mro__ for name, value in vars(klass).items()
+                  if isinstance(value, Field)]
+        return "%s(%s)" % (type(self).__name__, ", ".join(
+            "%s=%r" % (name, getattr(self, name)) for name in fields if name != "result"))
+
+
+class ModelList(object):
+    """模型数组，按需构造元素模型"""
+
+    __slots__ = ("_items", "_model")
+
+    def __init__(self, items, model):
+        self._items = items
+        self._model = model
+
+    def __len__(self):
+        return len(self._items)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._model(item) for item in self._items[index]]
+        return self._model(self._items[index])
+
+    def __iter__(self):
+        for item in self._items:
+            yield self._model(item)
+
+    def to_python(self):
+        return to_python(self._items)
+
+    def __repr__(self):
+        return "ModelList(%s, %d)" % (self._model.__name__, len(self))
+
+
+class Label(Model):
+    """分类信息"""
+
+    __slots__ = ()
+    label = Field("label")
+    level = Field("level")
+    rate = Field("rate")
+    sub_labels = Field("subLabels")
+
+
+class TextAntispam(Model):
+    """文本检测结果"""
+
+    __slots__ = ()
+    task_id = Field("taskId")
+    data_id = Field("dataId")
+    callback = Field("callback")
+    suggestion = Field("suggestion")
+    suggestion_level = Field("suggestionLevel")
+    result_type = Field("resultType")
+    censor_type = Field("censorType")
+    is_related_hit = Field("isRelatedHit")
+    labels = Field("labels", Label)
+    strategy_versions = Field("strategyVersions")
+
+
+class TextResult(Model):
+    __slots__ = ()
+    antispam = Field("antispam", TextAntispam)
+
+
+class ImageAntispam(Model):
+    """图片检测结果"""
+
+    __slots__ = ()
+    name = Field("name")
+    task_id = Field("taskId")
+    data_id = Field("dataId")
+    status = Field("status")
+    failure_reason = Field("failureReason")
+    suggestion = Field("suggestion")
+    result_type = Field("resultType")
+    labels = Field("labels", Label)
+
+
+class ImageOcr(Model):
+    """图片OCR结果，details中的lineContents随details元素一起解码"""
+
+    __slots__ = ()
+    name = Field("name")
+    task_id = Field("taskId")
+    details = Field("details")
+
+
+class ImageResult(Model):
+    __slots__ = ()
+    antispam = Field("antispam", ImageAntispam)
+    ocr = Field("ocr", ImageOcr)
+    face = Field("face")
+    quality = Field("quality")
+
+
+class AudioSegment(Model):
+    """音频断句"""
+
+    __slots__ = ()
+    start_time = Field("startTime")
+    end_time = Field("endTime")
+    type = Field("type")
+    content = Field("content")
+    labels = Field("labels", Label)
+
+
+class AudioAntispam(Model):
+    """音频检测结果"""
+
+    __slots__ = ()
+    task_id = Field("taskId")
+    data_id = Field("dataId")
+    callback = Field("callback")
+    status = Field("status")
+    suggestion = Field("suggestion")
+    result_type = Field("resultType")
+    segments = Field("segments", AudioSegment)
+
+
+class AudioResult(Model):
+    __slots__ = ()
+    antispam = Field("antispam", AudioAntispam)
+    asr = Field("asr")
+    language = Field("language")
+    voice = Field("voice")
+
+
+class VideoPicture(Model):
+    """视频截图"""
+
+    __slots__ = ()
+    type = Field("type")
+    url = Field("url")
+    start_time = Field("startTime")
+    end_time = Field("endTime")
+    labels = Field("labels", Label)
+
+
+class VideoAntispam(Model):
+    """视频检测结果"""
+
+    __slots__ = ()
+    task_id = Field("taskId")
+    data_id = Field("dataId")
+    callback = Field("callback")
+    status = Field("status")
+    suggestion = Field("suggestion")
+    result_type = Field("resultType")
+    labels = Field("labels", Label)
+    pictures = Field("pictures", VideoPicture)
+    evidence = Field("evidence")
+
+
+class VideoResult(Model):
+    __slots__ = ()
+    antispam = Field("antispam", VideoAntispam)
+
+
+class SolutionAntispam(Model):
+    """融媒体、数字阅读、投诉举报、文档解决方案检测结果"""
+
+    __slots__ = ()
+    task_id = Field("taskId")
+    data_id = Field("dataId")
+    callback = Field("callback")
+    check_status = Field("checkStatus")
+    suggestion = Field("suggestion")
+    result_type = Field("resultType")
+    evidences = Field("evidences")
+
+
+class SolutionResult(Model):
+    __slots__ = ()
+    antispam = Field("antispam", SolutionAntispam)
+
+
+class Response(Model):
+    """接口响应，result原样返回"""
+
+    __slots__ = ()
+    code = Field("code")
+    msg = Field("msg")
+    result = Field("result")
+
+
+class TextResponse(Response):
+    __slots__ = ()
+    result = Field("result", TextResult)
+
+
+class ImageResponse(Response):
+    __slots__ = ()
+    result = Field("result", ImageResult)
+
+
+class AudioResponse(Response):
+    __slots__ = ()
+    result = Field("result", AudioResult)
+
+
+class VideoResponse(Response):
+    __slots__ = ()
+    result = Field("result", VideoResult)
+
+
+class SolutionResponse(Response):
+    __slots__ = ()
+    result = Field("result", SolutionResult)
+
+
+# 接口名称前缀 -> 响应模型，回调、批量接口的result为数组时自动按元素构造模型
+RESPONSE_MODELS = [
+    ("text_", TextResponse),
+    ("image_", ImageResponse),
+    ("audio_", AudioResponse),
+    ("liveaudio_", AudioResponse),
+    ("video_", VideoResponse),
+    ("livevideo_", VideoResponse),
+    ("digital_", SolutionResponse),
+    ("filesolution_", SolutionResponse),
+    ("mediasolution_", SolutionResponse),
+    ("report_", SolutionResponse),
+]
+
+
+def response_model(name):
+    """Returns: 接口对应的响应模型类"""
+    for prefix, model in RESPONSE_MODELS:
+        if name and name.startswith(prefix):
+            return model
+    return Response
+
+
+def parse(data, name=None, depth=DEFAULT_DEPTH, model=None):
+    """按需解析响应
+    Args:
+        data (bytes|str) 响应内容
+        name (str) 接口名称，如video_callback，用于选择响应模型
+        depth (int) 按需解析的层数
+        model (type) 响应模型，默认根据name选择
+    Returns:
+        Response或其子类
+    """
+    doc = data.decode("utf-8") if isinstance(data, (bytes, bytearray)) else data
+    pos = _skip(doc, 0)
+    if doc[pos] != "{":
+        raise _error("Expecting '{'", doc, pos)
+    return (model or response_model(name))(LazyObject(doc, pos, depth))
+
+
+def main():
+    raw = json.dumps({
+        "code": 200, "msg": "ok",
+        "result": [{"antispam": {
+            "taskId": "fx6sxdcd89fvbvg4967b4o3k00009vq5", "status": 0, "callback": "{\"p\":\"xx\"}",
+            "pictures": [{"type": 1, "url": "https://nos.netease.com/yidun/%d.jpg" % i, "startTime": i * 1000,
+                          "endTime": i * 1000, "labels": [{"label": 100, "level": 2, "rate": 0.99, "subLabels": []}]}
+                         for i in range(10000)]}}]})
+    ret = parse(raw, "video_callback")
+    print("code: %s, msg: %s" % (ret.code, ret.msg))
+    for result in ret.result:
+        antispam = result.antispam
+        print("taskId: %s, pictures: %s" % (antispam.task_id, len(antispam.pictures)))
+        for picture in antispam.pictures[:3]:
+            print("url: %s, labels: %s" % (picture.url, [label.label for label in picture.labels]))
+
+
+if __name__ == "__main__":
+    """示例代码入口"""
+    main()
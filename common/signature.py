@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+易盾反垃圾云服务请求签名公共组件
+签名规则: 按参数名排序后依次拼接"参数名+参数值"，末尾拼接secretKey，再计算md5或SM3摘要
+本实现将各参数逐个编码后送入摘要的增量状态，不再拼接完整签名串，大图片base64参数仅会被编码一次
+SM3摘要由common.sm3自动选择本地最快的实现
+python版本：python3.7
+"""
+__author__ = 'yidun-dev'
+__date__ = '2026/10/18'
+__version__ = '0.2-dev'
+
+import hashlib
+import random
+import time
+
+from common import sm3
+
+
+def new_digest(signature_method=None):
+    """创建签名摘要对象
+    Args:
+        signature_method (str) 签名方法，默认MD5，支持SM3
+    Returns:
+        支持update/hexdigest的摘要对象
+    """
+    if signature_method == "SM3":
+        return sm3.new()
+    return hashlib.md5()
+
+
+def gen_signature(secret_key, params):
+    """生成签名信息
+    Args:
+        secret_key (str) 产品私有密钥
+        params (dict) 请求参数
+    Returns:
+        参数签名摘要值
+    """
+    digest = new_digest(params.get("signatureMethod"))
+    for k in sorted(params.keys()):
+        digest.update(str(k).encode("utf8"))
+        value = params[k]
+        if hasattr(value, "iter_text"):
+            # 流式参数(如common.image_stream.StreamingImages)逐块计算
+            for chunk in value.iter_text():
+                digest.update(chunk.encode("utf8"))
+        else:
+            digest.update(str(value).encode("utf8"))
+    digest.update(secret_key.encode("utf8"))
+    return digest.hexdigest()
+
+
+def sign_params(params, secret_id, secret_key, version, business_id=None, signature_method=None):
+    """填充公共参数并生成签名，与各示例代码check方法的处理一致
+    Args:
+        params (dict) 请求参数，会被直接修改
+        secret_id (str) 产品密钥ID
+        secret_key (str) 产品私有密钥
+        version (str) 接口版本
+        business_id (str) 业务ID，不需要携带businessId的接口传None
+        signature_method (str) 签名方法，默认MD5，支持SM3
+    Returns:
+        签名后的请求参数
+    """
+    params["secretId"] = secret_id
+    if business_id is not None:
+        params["businessId"] = business_id
+    params["version"] = version
+    params["timestamp"] = int(time.time() * 1000)
+    params["nonce"] = int(random.random() * 100000000)
+    if signature_method is not None:
+        params["signatureMethod"] = signature_method
+    params.pop("signature", None)
+    params["signature"] = gen_signature(secret_key, params)
+    return params
@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+易盾反垃圾云服务SM3签名摘要组件
+按优先级自动选择本地可用的最快实现:
+    1. openssl: hashlib.new("sm3")，需要python链接的OpenSSL支持SM3
+    2. python: 纯python增量实现，按64字节分组批量解包计算，输出与gmssl.sm3.sm3_hash一致
+也可通过register_engine注册其他实现，通过set_engine或环境变量YIDUN_SM3_ENGINE指定使用的实现
+python版本：python3.7
+"""
+__author__ = 'yidun-dev'
+__date__ = '2026/10/18'
+__version__ = '0.2-dev'
+
+import hashlib
+import os
+import struct
+
+_IV = (0x7380166F, 0x4914B2B9, 0x172442D7, 0xDA8A0600, 0xA96F30BC, 0x163138AA, 0xE38DEE4D, 0xB0FB0E4E)
+_MASK = 0xFFFFFFFF
+# 预先计算每轮循环左移后的常量T_j
+_T = tuple(
+    (((t << (j % 32)) | (t >> (32 - j % 32))) & _MASK) if j % 32 else t
+    for j, t in ((j, 0x79CC4519 if j < 16 else 0x7A879D8A) for j in range(64))
+)
+_BLOCK = struct.Struct(">16I")
+
+
+def _compress(v, block):
+    """SM3压缩函数，处理一个64字节分组"""
+    w = list(_BLOCK.unpack(block))
+    append = w.append
+    for j in range(16, 68):
+        x = w[j - 16] ^ w[j - 9]
+        y = w[j - 3]
+        x ^= ((y << 15) | (y >> 17)) & _MASK
+        y = w[j - 13]
+        append(x ^ (((x << 15) | (x >> 17)) & _MASK) ^ (((x << 23) | (x >> 9)) & _MASK)
+               ^ (((y << 7) | (y >> 25)) & _MASK) ^ w[j - 6])
+    a, b, c, d, e, f, g, h = v
+    t = _T
+    for j in range(16):
+        a12 = ((a << 12) | (a >> 20)) & _MASK
+        ss1 = (a12 + e + t[j]) & _MASK
+        ss1 = ((ss1 << 7) | (ss1 >> 25)) & _MASK
+        wj = w[j]
+        tt1 = ((a ^ b ^ c) + d + (ss1 ^ a12) + (wj ^ w[j + 4])) & _MASK
+        tt2 = ((e ^ f ^ g) + h + ss1 + wj) & _MASK
+        d = c
+        c = ((b << 9) | (b >> 23)) & _MASK
+        b = a
+        a = tt1
+        h = g
+        g = ((f << 19) | (f >> 13)) & _MASK
+        f = e
+        e = tt2 ^ (((tt2 << 9) | (tt2 >> 23)) & _MASK) ^ (((tt2 << 17) | (tt2 >> 15)) & _MASK)
+    for j in range(16, 64):
+        a12 = ((a << 12) | (a >> 20)) & _MASK
+        ss1 = (a12 + e + t[j]) & _MASK
+        ss1 = ((ss1 << 7) | (ss1 >> 25)) & _MASK
+        wj = w[j]
+        tt1 = (((a & b) | (c & (a | b))) + d + (ss1 ^ a12) + (wj ^ w[j + 4])) & _MASK
+        tt2 = ((g ^ (e & (f ^ g))) + h + ss1 + wj) & _MASK
+        d = c
+        c = ((b << 9) | (b >> 23)) & _MASK
+        b = a
+        a = tt1
+        h = g
+        g = ((f << 19) | (f >> 13)) & _MASK
+        f = e
+        e = tt2 ^ (((tt2 << 9) | (tt2 >> 23)) & _MASK) ^ (((tt2 << 17) | (tt2 >> 15)) & _MASK)
+    return (v[0] ^ a, v[1] ^ b, v[2] ^ c, v[3] ^ d, v[4] ^ e, v[5] ^ f, v[6] ^ g, v[7] ^ h)
+
+
+class PySm3(object):
+    """纯python的SM3增量实现，接口与hashlib摘要对象一致"""
+
+    name = "sm3"
+    digest_size = 32
+    block_size = 64
+
+    def __init__(self, data=b""):
+        self._v = _IV
+        self._buff = bytearray()
+        self._length = 0
+        if data:
+            self.update(data)
+
+    def update(self, data):
+        self._length += len(data)
+        buff = self._buff
+        buff += data
+        full = len(buff) - len(buff) % 64
+        if full:
+            v = self._v
+            view = memoryview(buff)
+            for i in range(0, full, 64):
+                v = _compress(v, view[i:i + 64])
+            view.release()
+            del buff[:full]
+            self._v = v
+
+    def copy(self):
+        other = PySm3()
+        other._v = self._v
+        other._buff = bytearray(self._buff)
+        other._length = self._length
+        return other
+
+    def digest(self):
+        tail = bytes(self._buff) + b"\x80"
+        tail += b"\x00" * ((56 - len(tail)) % 64) + struct.pack(">Q", self._length * 8)
+        v = self._v
+        for i in range(0, len(tail), 64):
+            v = _compress(v, tail[i:i + 64])
+        return struct.pack(">8I", *v)
+
+    def hexdigest(self):
+        return self.digest().hex()
+
+
+def _openssl_sm3(data=b""):
+    return hashlib.new("sm3", data)
+
+
+# 按优先级排列的SM3实现，(名称, 是否可用, 构造函数)
+_ENGINES = [
+    ["openssl", "sm3" in hashlib.algorithms_available, _openssl_sm3],
+    ["python", True, PySm3],
+]
+_selected = None
+
+
+def register_engine(name, factory, priority=None):
+    """注册SM3实现
+    Args:
+        name (str) 实现名称
+        factory (callable) 构造函数，接收可选的初始数据，返回支持update/hexdigest的摘要对象
+        priority (int) 插入位置，默认追加到最低优先级
+    """
+    global _selected
+    engine = [name, True, factory]
+    if priority is None:
+        _ENGINES.append(engine)
+    else:
+        _ENGINES.insert(priority, engine)
+    _selected = None
+
+
+def available_engines():
+    """Returns: 当前可用的SM3实现名称列表，按优先级排列"""
+    return [name for name, available, _ in _ENGINES if available]
+
+
+def set_engine(name=None):
+    """指定使用的SM3实现，name为None时恢复自动选择"""
+    global _selected
+    _selected = None
+    if name is not None:
+        for engine_name, available, factory in _ENGINES:
+            if engine_name == name and available:
+                _selected = (engine_name, factory)
+                return
+        raise ValueError("SM3 engine not available: %s" % name)
+
+
+def current_engine():
+    """Returns: 当前使用的SM3实现名称"""
+    return _select()[0]
+
+
+def _select():
+    global _selected
+    if _selected is None:
+        name = os.environ.get("YIDUN_SM3_ENGINE")
+        if name:
+            set_engine(name)
+        else:
+            _selected = next((n, f) for n, available, f in _ENGINES if available)
+    return _selected
+
+
+def new(data=b""):
+    """创建SM3摘要对象
+    Args:
+        data (bytes) 初始数据
+    Returns:
+        支持update/digest/hexdigest的摘要对象
+    """
+    return _select()[1](data)
+
+
+def sm3_hash(data):
+    """计算SM3摘要，结果与gmssl.sm3.sm3_hash(func.bytes_to_list(data))一致
+    Args:
+        data (bytes) 待计算数据
+    Returns:
+        小写十六进制摘要字符串
+    """
+    return new(data).hexdigest()
@@ -0,0 +1,215 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+易盾反垃圾云服务taskId批量结果查询组件
+用于故障恢复后的对账等场景，按taskId查询大量检测结果:
+    1. taskIds可以是任意长度的迭代器，按chunk_size切分为多次请求，只在需要发送时才从迭代器读取
+    2. 最多concurrency个请求同时进行，结果按请求完成顺序逐条返回，不等待全部查询结束
+    3. 请求异常或返回common.resilience.RETRYABLE_CODES时按retries重试，仍失败的taskId记入report.failed，
+       可稍后重新查询
+    4. 状态为20(不是7天内数据)、30(taskId不存在)及响应中缺失的taskId分别记入report，不作为结果返回
+支持text_query、image_query、video_query、audio_query、digital_query、report_query、mediasolution_query
+python版本：python3.7
+运行:
+    1. 修改 SECRET_ID,SECRET_KEY,BUSINESS_ID 为对应申请到的值
+    2. $ python -m common.task_query
+"""
+__author__ = 'yidun-dev'
+__date__ = '2026/10/18'
+__version__ = '0.2-dev'
+
+import asyncio
+import itertools
+from collections import namedtuple
+
+from common import json_codec
+from common.async_client import AsyncAPIClient
+from common.endpoints import get_endpoint
+from common.resilience import retry_request
+
+QUERY_ENDPOINTS = ("text_query", "image_query", "video_query", "audio_query", "digital_query", "report_query",
+                   "mediasolution_query")
+MAX_TASK_IDS = 100  # 单次请求最多携带的taskId个数
+STATUS_EXPIRED = 20  # 不是7天内数据
+STATUS_NOT_FOUND = 30  # taskId不存在
+
+# task_id 数据taskId, status 查询状态, result 该taskId的查询结果，audio_query为{"antispam", "language", "asr"}
+TaskResult = namedtuple("TaskResult", ["task_id", "status", "result"])
+
+
+class QueryReport(object):
+    """批量查询统计"""
+
+    def __init__(self):
+        self.requested = 0  # 已发送查询的taskId数
+        self.requests = 0  # 请求次数，含重试
+        self.results = 0  # 返回的结果数
+        self.expired = []  # 状态为20的taskId
+        self.not_found = []  # 状态为30的taskId
+        self.missing = []  # 请求成功但响应中没有对应结果的taskId
+        self.failed = []  # 重试后仍失败的taskId
+
+    def stats(self):
+        """Returns: 统计信息"""
+        return {
+            "requested": self.requested,
+            "requests": self.requests,
+            "results": self.results,
+            "expired": len(self.expired),
+            "not_found": len(self.not_found),
+            "missing": len(self.missing),
+            "failed": len(self.failed),
+        }
+
+
+def _task_id(item):
+    antispam = item.get("antispam")
+    task_id = item.get("taskId")
+    if task_id is None and antispam is not None:
+        task_id = antispam.get("taskId")
+    return task_id
+
+
+def _status(item):
+    status = item.get("status")
+    if status is None and item.get("antispam") is not None:
+        status = item["antispam"].get("status")
+    return status
+
+
+def iter_results(name, ret):
+    """按taskId拆分查询响应
+    Args:
+        name (str) 接口名称
+        ret (dict) 查询响应
+    Returns:
+        TaskResult生成器
+    """
+    if name == "audio_query":
+        # 点播语音查询按antispam、language、asr分别返回，按taskId合并
+        merged = {}
+        for kind in ("antispam", "language", "asr"):
+            for item in ret.get(kind) or ():
+                merged.setdefault(item["taskId"], {})[kind] = item
+        for task_id, result in merged.items():
+            yield TaskResult(task_id, _status(next(iter(result.values()))), result)
+        return
+    for item in ret.get("result") or ():
+        yield TaskResult(_task_id(item), _status(item), item)
+
+
+class BulkTaskQuery(object):
+    """taskId批量结果查询"""
+
+    def __init__(self, client, name, chunk_size=MAX_TASK_IDS, concurrency=8, retries=2):
+        """
+        Args:
+            client (AsyncAPIClient) 对应产品的异步客户端
+            name (str) 接口名称，如text_query
+            chunk_size (int) 单次请求携带的taskId个数，不超过MAX_TASK_IDS
+            concurrency (int) 最大并发请求数
+            retries (int) 单次请求失败后的重试次数
+        """
+        if name not in QUERY_ENDPOINTS:
+            raise ValueError("unsupported query endpoint: %s" % name)
+        if not 0 < chunk_size <= MAX_TASK_IDS:
+            raise ValueError("chunk_size must be in 1..%d" % MAX_TASK_IDS)
+        self.client = client
+        self.endpoint = get_endpoint(name)
+        self.chunk_size = chunk_size
+        self.concurrency = concurrency
+        self.retries = retries
+        self.report = QueryReport()
+
+    async def _query(self, task_ids):
+        """Returns: 查询响应，重试后仍失败时返回None"""
+        async def send():
+            self.report.requests += 1
+            return await self.client.request(self.endpoint, {"taskIds": json_codec.dumps(task_ids)})
+
+        ret, error = await retry_request(send, self.retries)
+        if ret is None:
+            print("批量查询失败: %s, taskIds: %d" % (error, len(task_ids)))
+        return ret
+
+    def _collect(self, task_ids, ret):
+        """统计单次查询响应，Returns: 需要返回的结果列表"""
+        report = self.report
+        if ret is None:
+            report.failed.extend(task_ids)
+            return []
+        results = []
+        pending = set(task_ids)
+        for item in iter_results(self.endpoint.name, ret):
+            pending.discard(item.task_id)
+            if item.status == STATUS_EXPIRED:
+                report.expired.append(item.task_id)
+            elif item.status == STATUS_NOT_FOUND:
+                report.not_found.append(item.task_id)
+            else:
+                results.append(item)
+        report.missing.extend(task_id for task_id in task_ids if task_id in pending)
+        report.results += len(results)
+        return results
+
+    async def results(self, task_ids):
+        """查询taskId对应的结果，按请求完成顺序逐条返回
+        Args:
+            task_ids (iterable) taskId迭代器，长度不限
+        Returns:
+            TaskResult异步生成器，状态为20、30的taskId记入report，不返回
+        """
+        task_ids = iter(task_ids)
+        running = {}
+        try:
+            while True:
+                while len(running) < self.concurrency:
+                    chunk = list(itertools.islice(task_ids, self.chunk_size))
+                    if not chunk:
+                        break
+                    self.report.requested += len(chunk)
+                    running[asyncio.ensure_future(self._query(chunk))] = chunk
+                if not running:
+                    return
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    for item in self._collect(running.pop(future), future.result()):
+                        yield item
+        finally:
+            # 调用方提前结束迭代时取消尚未完成的请求
+            for future in running:
+                future.cancel()
+
+    async def run(self, task_ids, handler):
+        """查询全部taskId，结果逐条交给handler处理
+        Args:
+            task_ids (iterable) taskId迭代器
+            handler (callable) 结果处理函数，参数为TaskResult，可以是普通函数或协程函数
+        Returns:
+            QueryReport
+        """
+        async for item in self.results(task_ids):
+            ret = handler(item)
+            if asyncio.iscoroutine(ret):
+                await ret
+        return self.report
+
+
+async def main():
+    SECRET_ID = "your_secret_id"  # 产品密钥ID，产品标识
+    SECRET_KEY = "your_secret_key"  # 产品私有密钥，服务端生成签名信息使用，请严格保管，避免泄露
+    BUSINESS_ID = "your_business_id"  # 业务ID，易盾根据产品业务特点分配
+    async with AsyncAPIClient(SECRET_ID, SECRET_KEY, BUSINESS_ID) as client:
+        query = BulkTaskQuery(client, "text_query", concurrency=16)
+        with open("task_ids.txt") as f:  # 每行一个taskId
+            async for item in query.results(line.strip() for line in f if line.strip()):
+                print("taskId: %s, status: %s" % (item.task_id, item.status))
+        report = query.report
+        print("统计: %s" % report.stats())
+        print("不是7天内数据: %s" % report.expired)
+        print("taskId不存在: %s" % report.not_found)
+
+
+if __name__ == "__main__":
+    """示例代码入口"""
+    asyncio.run(main())
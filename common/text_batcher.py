@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+易盾反垃圾云服务文本检测自动合批组件
+按单条文本调用check，内部在max_delay时间内或凑满max_items条后合并为一次文本批量在线检测(text_batch_check)请求，
+再按dataId把每条文本的检测结果分发给对应调用方，返回结构与文本在线检测(text_check)一致
+python版本：python3.7
+运行:
+    1. 修改 SECRET_ID,SECRET_KEY,BUSINESS_ID 为对应申请到的值
+    2. $ python -m common.text_batcher
+"""
+__author__ = 'yidun-dev'
+__date__ = '2026/10/18'
+__version__ = '0.2-dev'
+
+import asyncio
+import uuid
+
+from common import json_codec
+from common.async_client import AsyncAPIClient
+
+# 批量接口中属于单条文本的参数，其余参数(如checkLabels)相同的文本才能合并为一批
+TEXT_FIELDS = frozenset([
+    "dataId", "content", "dataType", "ip", "account", "deviceType", "deviceId",
+    "callback", "publishTime", "callbackUrl",
+])
+
+
+class _Batch(object):
+    """待发送的一批文本"""
+
+    def __init__(self, shared_params):
+        self.shared_params = shared_params
+        self.texts = []
+        self.futures = {}
+        self.timer = None
+
+
+class TextCheckBatcher(object):
+    """文本检测自动合批"""
+
+    def __init__(self, client, max_items=100, max_delay=0.02):
+        """
+        Args:
+            client (AsyncAPIClient) 异步客户端
+            max_items (int) 单批最大文本条数
+            max_delay (float) 单批最长等待时间，秒
+        """
+        self.client = client
+        self.max_items = max_items
+        self.max_delay = max_delay
+        self.texts = 0  # 累计提交文本数
+        self.batches = 0  # 累计发送批量请求数
+        self._pending = {}
+        self._sending = set()
+
+    async def check(self, params):
+        """检测单条文本
+        Args:
+            params (dict) 文本在线检测请求参数
+        Returns:
+            请求结果，json格式，与文本在线检测接口结构一致，失败时返回None
+        """
+        text = dict((k, v) for k, v in params.items() if k in TEXT_FIELDS)
+        text.setdefault("dataId", uuid.uuid4().hex)
+        shared_params = tuple(sorted((k, str(v)) for k, v in params.items() if k not in TEXT_FIELDS))
+        batch = self._pending.get(shared_params)
+        if batch is not None and text["dataId"] in batch.futures:
+            # 同一批内dataId不能重复，先发送当前批
+            self._dispatch(batch)
+            batch = None
+        if batch is None:
+            batch = self._pending[shared_params] = _Batch(shared_params)
+            batch.timer = asyncio.get_event_loop().call_later(self.max_delay, self._dispatch, batch)
+        future = asyncio.get_event_loop().create_future()
+        batch.texts.append(text)
+        batch.futures[text["dataId"]] = future
+        self.texts += 1
+        if len(batch.texts) >= self.max_items:
+            self._dispatch(batch)
+        return await future
+
+    def _dispatch(self, batch):
+        if self._pending.get(batch.shared_params) is batch:
+            del self._pending[batch.shared_params]
+        batch.timer.cancel()
+        task = asyncio.ensure_future(self._send(batch))
+        self._sending.add(task)
+        task.add_done_callback(self._sending.discard)
+
+    async def _send(self, batch):
+        self.batches += 1
+        params = dict(batch.shared_params)
+        params["texts"] = json_codec.dumps(batch.texts)
+        try:
+            ret = await self.client.check("text_batch_check", params)
+        except BaseException as ex:
+            for future in batch.futures.values():
+                if not future.done():
+                    future.set_exception(ex)
+            raise
+        results = {}
+        if ret is not None and ret["code"] == 200:
+            for result in ret["result"] or []:
+                results[result["antispam"]["dataId"]] = result
+        for data_id, future in batch.futures.items():
+            if future.done():
+                continue
+            if data_id in results:
+                future.set_result({"code": ret["code"], "msg": ret["msg"], "result": results[data_id]})
+            elif ret is not None and ret["code"] != 200:
+                future.set_result(ret)
+            else:
+                future.set_result(None)
+
+    async def flush(self):
+        """立即发送全部待发送文本，并等待已发送的请求完成"""
+        for batch in list(self._pending.values()):
+            self._dispatch(batch)
+        if self._sending:
+            await asyncio.wait(list(self._sending))
+
+
+async def main():
+    SECRET_ID = "your_secret_id"  # 产品密钥ID，产品标识
+    SECRET_KEY = "your_secret_key"  # 产品私有密钥，服务端生成签名信息使用，请严格保管，避免泄露
+    BUSINESS_ID = "your_business_id"  # 业务ID，易盾根据产品业务特点分配
+    async with AsyncAPIClient(SECRET_ID, SECRET_KEY, BUSINESS_ID) as client:
+        batcher = TextCheckBatcher(client, max_items=100, max_delay=0.02)
+        contents = ["易盾测试内容！v5接口! %d" % i for i in range(250)]
+        results = await asyncio.gather(*[
+            batcher.check({"dataId": "data-%d" % i, "content": content, "checkLabels": "200, 500"})
+            for i, content in enumerate(contents)
+        ])
+        print("文本数: %s, 批量请求数: %s" % (batcher.texts, batcher.batches))
+        for content, ret in zip(contents, results):
+            if ret is None:
+                continue
+            if ret["code"] == 200:
+                antispam: dict = ret["result"]["antispam"]
+                print("content: %s, taskId: %s, suggestion: %s"
+                      % (content, antispam["taskId"], antispam["suggestion"]))
+            else:
+                print("ERROR: code=%s, msg=%s" % (ret["code"], ret["msg"]))
+
+
+if __name__ == "__main__":
+    """示例代码入口"""
+    asyncio.run(main())
@@ -0,0 +1,238 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+易盾反垃圾云服务文本在线检测结果缓存
+聊天等场景大量重复内容时，相同内容直接使用本地缓存的检测结果，不再请求/v5/text/check:
+    1. 缓存key由归一化后的content(NFKC、忽略大小写、合并空白)、checkLabels及businessId计算
+    2. 只缓存CACHED_FIELDS中的判定字段，按ttl过期，超过max_entries或max_bytes时按LRU淘汰
+    3. 接口返回的strategyVersions中某个分类的策略版本发生变化时，自动清除按旧版本策略得到的缓存结果
+需要显式开启: TextVerdictCache().wrap(api)，api可以是TextCheckAPIDemo实例、APIClient.text_check或
+AsyncAPIClient.endpoint("text_check")
+缓存命中时返回的antispam包含CACHED_FIELDS、dataId、cached=True，taskId为空字符串(本次未提交检测)
+python版本：python3.7
+运行:
+    1. 修改 SECRET_ID,SECRET_KEY,BUSINESS_ID 为对应申请到的值
+    2. $ python -m common.text_cache
+"""
+__author__ = 'yidun-dev'
+__date__ = '2026/10/18'
+__version__ = '0.2-dev'
+
+import asyncio
+import collections
+import functools
+import hashlib
+import re
+import threading
+import time
+import unicodedata
+
+from common import json_codec
+from common.check_wrapper import replace_check
+from common.responses import to_python
+
+# text/text_check.py等解析代码读取的antispam字段，taskId每次检测不同，不缓存
+CACHED_FIELDS = ("suggestion", "suggestionLevel", "labels", "resultType", "censorType", "strategyVersions",
+                 "isRelatedHit")
+ENTRY_OVERHEAD = 200  # 单条缓存除结果json外的大致内存占用，字节
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize(content):
+    """Returns: 归一化后的文本，全角半角、大小写、连续空白不同的内容视为相同"""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", str(content)).casefold()).strip()
+
+
+def cache_key(content, check_labels=None, business_id=None):
+    """Returns: 缓存key"""
+    labels = ",".join(sorted(label.strip() for label in str(check_labels).split(",") if label.strip())) \
+        if check_labels else ""
+    raw = "\x00".join((normalize(content), labels, business_id or ""))
+    return hashlib.sha1(raw.encode("utf8")).digest()
+
+
+class TextVerdictCache(object):
+    """文本检测结果缓存"""
+
+    def __init__(self, ttl=600.0, max_entries=100000, max_bytes=64 << 20):
+        """
+        Args:
+            ttl (float) 缓存有效期，秒
+            max_entries (int) 最大缓存条数
+            max_bytes (int) 缓存内容的最大内存占用估算值，字节
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0  # LRU淘汰条数
+        self.expirations = 0  # 过期条数
+        self.purged = 0  # 因策略版本变化清除的条数
+        self.memory_bytes = 0  # 缓存内容的内存占用估算值
+        self.strategy_versions = {}  # 已知的各分类策略版本
+        self._entries = collections.OrderedDict()  # key -> (过期时间, 检测结果, 占用字节数)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Returns: 缓存的检测结果，未命中时返回None"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= now:
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, antispam):
+        """缓存检测结果
+        Args:
+            key (bytes) 缓存key
+            antispam (dict) text_check返回的result.antispam
+        """
+        if antispam.get("suggestion") is None:
+            return
+        verdict = dict((field, to_python(antispam.get(field))) for field in CACHED_FIELDS)
+        size = len(key) + len(json_codec.dumpb(verdict)) + ENTRY_OVERHEAD
+        with self._lock:
+            self._observe_versions(verdict.get("strategyVersions") or [])
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, verdict, size)
+            self.memory_bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or self.memory_bytes > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key):
+        self.memory_bytes -= self._entries.pop(key)[2]
+
+    def _observe_versions(self, strategy_versions):
+        changed = set()
+        for item in strategy_versions:
+            label, version = item.get("label"), item.get("version")
+            known = self.strategy_versions.get(label)
+            if known is not None and known != version:
+                changed.add((label, known))
+            self.strategy_versions[label] = version
+        if changed:
+            self._purge(lambda versions: any((v.get("label"), v.get("version")) in changed for v in versions))
+
+    def purge(self, label=None):
+        """清除缓存
+        Args:
+            label (int) 只清除按该分类策略得到的结果，None表示全部清除
+        Returns:
+            清除条数
+        """
+        with self._lock:
+            if label is None:
+                count = len(self._entries)
+                self._entries.clear()
+                self.memory_bytes = 0
+                self.purged += count
+                return count
+            return self._purge(lambda versions: any(v.get("label") == label for v in versions))
+
+    def _purge(self, match):
+        keys = [key for key, entry in self._entries.items() if match(entry[1].get("strategyVersions") or [])]
+        for key in keys:
+            self._remove(key)
+        self.purged += len(keys)
+        return len(keys)
+
+    def stats(self):
+        """Returns: 命中率及内存占用"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "memory_bytes": self.memory_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / float(lookups) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "purged": self.purged,
+            }
+
+    def response(self, verdict, params):
+        """Returns: 由缓存结果构造的text_check响应"""
+        antispam = dict(verdict, taskId="", dataId=params.get("dataId"), cached=True)
+        return {"code": 200, "msg": "ok", "result": {"antispam": antispam}}
+
+    def store(self, key, ret):
+        """缓存接口返回的检测结果"""
+        if ret is not None and ret.get("code") == 200:
+            antispam = (ret.get("result") or {}).get("antispam")
+            if antispam:
+                self.put(key, antispam)
+
+    def wrap(self, api):
+        """为文本在线检测接口增加缓存
+        Args:
+            api (object) TextCheckAPIDemo实例、APIClient.text_check或AsyncAPIClient.endpoint("text_check")
+        Returns:
+            替换check后的接口，见common.check_wrapper.replace_check
+        """
+        check = api.check
+        business_id = getattr(api, "business_id", None) or getattr(getattr(api, "client", None), "business_id", None)
+
+        def key_of(params):
+            return cache_key(params.get("content", ""), params.get("checkLabels"), business_id)
+
+        if asyncio.iscoroutinefunction(check):
+            @functools.wraps(check)
+            async def cached(params=None, *args, **kwargs):
+                params = {} if params is None else params
+                key = key_of(params)
+                verdict = self.get(key)
+                if verdict is not None:
+                    return self.response(verdict, params)
+                ret = await check(params, *args, **kwargs)
+                self.store(key, ret)
+                return ret
+        else:
+            @functools.wraps(check)
+            def cached(params, *args, **kwargs):
+                key = key_of(params)
+                verdict = self.get(key)
+                if verdict is not None:
+                    return self.response(verdict, params)
+                ret = check(params, *args, **kwargs)
+                self.store(key, ret)
+                return ret
+        return replace_check(api, cached)
+
+
+async def main():
+    from common.async_client import AsyncAPIClient
+
+    SECRET_ID = "your_secret_id"  # 产品密钥ID，产品标识
+    SECRET_KEY = "your_secret_key"  # 产品私有密钥，服务端生成签名信息使用，请严格保管，避免泄露
+    BUSINESS_ID = "your_business_id"  # 业务ID，易盾根据产品业务特点分配
+    cache = TextVerdictCache(ttl=300, max_entries=10000)
+    async with AsyncAPIClient(SECRET_ID, SECRET_KEY, BUSINESS_ID) as client:
+        text_check = cache.wrap(client.endpoint("text_check"))
+        for content in ["hi", "HI ", "ｈｉ", "易盾测试内容！", "易盾测试内容!"]:
+            ret = await text_check.check({"dataId": "ebfcad1c-dba1-490c-b4de-e784c2691768", "content": content})
+            if ret is not None and ret["code"] == 200:
+                antispam: dict = ret["result"]["antispam"]
+                print("content: %s, suggestion: %s, cached: %s"
+                      % (content, antispam["suggestion"], antispam.get("cached", False)))
+    print(cache.stats())
+
+
+if __name__ == "__main__":
+    """示例代码入口"""
+    asyncio.run(main())
@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+易盾反垃圾云服务按接口自适应的读超时
+按接口地址(API_URL)统计最近的请求耗时，读超时 = margin * (耗时分位数 + 每字节耗时 * 请求体字节数):
+    1. 每字节耗时按请求体大小与耗时做指数加权线性回归得到，扣除请求体大小影响后的剩余耗时记入直方图，
+       大批量texts、images请求据此获得更长的超时，小请求不会被大请求拖长
+    2. 直方图按window秒滚动，只反映最近一到两个窗口内的耗时分布
+    3. 样本数不足min_samples时使用接口默认超时；超时的请求按已等待时间记录，避免超时过短时无法自我修正
+AsyncAPIClient(timeouts=TimeoutController())时使用，histograms()可用于监控上报
+python版本：python3.7
+"""
+__author__ = 'yidun-dev'
+__date__ = '2026/10/18'
+__version__ = '0.2-dev'
+
+import bisect
+import math
+import threading
+import time
+
+# 直方图桶上界，1ms到约2分钟，相邻桶相差25%
+BUCKET_BOUNDS = [0.001 * 1.25 ** i for i in range(53)]
+
+
+class LatencyHistogram(object):
+    """按时间窗口滚动的耗时直方图"""
+
+    def __init__(self, window=300.0):
+        """
+        Args:
+            window (float) 窗口长度，秒
+        """
+        self.window = window
+        self.count = 0  # 累计样本数
+        self.sum = 0.0  # 累计耗时，秒
+        self._current = [0] * (len(BUCKET_BOUNDS) + 1)
+        self._previous = [0] * (len(BUCKET_BOUNDS) + 1)
+        self._rotated_at = time.monotonic()
+
+    def _rotate(self):
+        now = time.monotonic()
+        elapsed = now - self._rotated_at
+        if elapsed >= self.window:
+            self._previous = self._current if elapsed < 2 * self.window else [0] * len(self._current)
+            self._current = [0] * len(self._current)
+            self._rotated_at = now
+
+    def record(self, seconds):
+        self._rotate()
+        self._current[bisect.bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def recent(self):
+        """Returns: 最近窗口内各桶的样本数"""
+        self._rotate()
+        return [a + b for a, b in zip(self._current, self._previous)]
+
+    def percentile(self, p, counts=None):
+        """Returns: 最近窗口内耗时的p分位数(所在桶的上界)，没有样本时返回None"""
+        counts = counts or self.recent()
+        total = sum(counts)
+        if not total:
+            return None
+        rank = max(1, int(math.ceil(p * total)))
+        seen = 0
+        for i, count in enumerate(counts):
+            seen += count
+            if seen >= rank:
+                return BUCKET_BOUNDS[i] if i < len(BUCKET_BOUNDS) else BUCKET_BOUNDS[-1] * 1.25
+        return BUCKET_BOUNDS[-1] * 1.25
+
+    def snapshot(self):
+        """Returns: 直方图快照，buckets为[桶上界, 样本数]，只包含非空桶"""
+        counts = self.recent()
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "recent": sum(counts),
+            "p50": self.percentile(0.50, counts),
+            "p90": self.percentile(0.90, counts),
+            "p99": self.percentile(0.99, counts),
+            "buckets": [[BUCKET_BOUNDS[i] if i < len(BUCKET_BOUNDS) else float("inf"), count]
+                        for i, count in enumerate(counts) if count],
+        }
+
+
+class _UrlStats(object):
+    """单个接口的耗时统计"""
+
+    def __init__(self, window, alpha):
+        self.histogram = LatencyHistogram(window)
+        self.alpha = alpha
+        self.samples = 0
+        # 请求体字节数x与耗时y的指数加权均值，用于估计每字节耗时
+        self.mx = self.my = self.mxx = self.mxy = 0.0
+
+    def seconds_per_byte(self, default):
+        if self.samples < 2:
+            return default
+        variance = self.mxx - self.mx * self.mx
+        if variance <= (self.mx * 0.01) ** 2 + 1.0:
+            # 请求体大小几乎不变，无法拟合
+            return default
+        return max(0.0, (self.mxy - self.mx * self.my) / variance)
+
+    def observe(self, payload_bytes, seconds, default):
+        alpha = 1.0 if self.samples == 0 else self.alpha
+        self.mx += alpha * (payload_bytes - self.mx)
+        self.my += alpha * (seconds - self.my)
+        self.mxx += alpha * (payload_bytes * payload_bytes - self.mxx)
+        self.mxy += alpha * (payload_bytes * seconds - self.mxy)
+        self.samples += 1
+        self.histogram.record(max(0.0, seconds - self.seconds_per_byte(default) * payload_bytes))
+
+
+class TimeoutController(object):
+    """按接口自适应的读超时控制"""
+
+    def __init__(self, percentile=0.99, margin=1.5, min_timeout=0.2, max_timeout=30.0, min_samples=50,
+                 window=300.0, default_seconds_per_mb=0.5, alpha=0.05):
+        """
+        Args:
+            percentile (float) 剩余耗时分位数
+            margin (float) 超时相对估计耗时的倍数
+            min_timeout (float) 最短读超时，秒
+            max_timeout (float) 最长读超时，秒
+            min_samples (int) 最近窗口内样本数达到该值后才使用自适应超时
+            window (float) 直方图窗口长度，秒
+            default_seconds_per_mb (float) 无法拟合时每MB请求体的耗时，秒
+            alpha (float) 每字节耗时回归的指数加权系数
+        """
+        self.percentile = percentile
+        self.margin = margin
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.min_samples = min_samples
+        self.window = window
+        self.default_seconds_per_byte = default_seconds_per_mb / (1 << 20)
+        self.alpha = alpha
+        self._stats = {}
+        self._lock = threading.RLock()
+
+    def _get(self, url):
+        stats = self._stats.get(url)
+        if stats is None:
+            with self._lock:
+                stats = self._stats.setdefault(url, _UrlStats(self.window, self.alpha))
+        return stats
+
+    def timeout(self, url, default, payload_bytes=0):
+        """计算超时
+        Args:
+            url (str) 接口地址
+            default (tuple) 接口默认的(连接超时, 读超时)秒
+            payload_bytes (int) 请求体字节数
+        Returns:
+            (连接超时, 读超时)秒
+        """
+        with self._lock:
+            stats = self._get(url)
+            counts = stats.histogram.recent()
+            if sum(counts) < self.min_samples:
+                return default
+            expected = (stats.histogram.percentile(self.percentile, counts)
+                        + stats.seconds_per_byte(self.default_seconds_per_byte) * payload_bytes)
+        return default[0], min(self.max_timeout, max(self.min_timeout, self.margin * expected))
+
+    def observe(self, url, payload_bytes, seconds):
+        """记录一次请求耗时，超时的请求按已等待时间记录"""
+        with self._lock:
+            self._get(url).observe(payload_bytes, seconds, self.default_seconds_per_byte)
+
+    def histograms(self):
+        """Returns: 各接口的耗时直方图快照及每字节耗时估计"""
+        with self._lock:
+            return dict((url, dict(stats.histogram.snapshot(),
+                                   seconds_per_mb=stats.seconds_per_byte(self.default_seconds_per_byte) * (1 << 20)))
+                        for url, stats in self._stats.items())
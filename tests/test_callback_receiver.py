@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""common.callback_receiver主动回调的签名校验"""
+__author__ = 'yidun-dev'
+__date__ = '2026/10/18'
+__version__ = '0.2-dev'
+
+import asyncio
+import hashlib
+import json
+import unittest
+
+from common.callback_receiver import CallbackReceiver
+from common.http_server import HttpRequest
+
+SECRET_ID = "test_secret_id"
+SECRET_KEY = "test_secret_key"
+
+
+def sign(params):
+    """按推送方的方式签名，非字符串的值使用请求体中的json文本"""
+    digest = hashlib.md5()
+    for k in sorted(params):
+        value = params[k]
+        digest.update(k.encode("utf8"))
+        digest.update((value if isinstance(value, str) else json.dumps(value, separators=(",", ":"))).encode("utf8"))
+    digest.update(SECRET_KEY.encode("utf8"))
+    return digest.hexdigest()
+
+
+class VerifyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.receiver = CallbackReceiver({SECRET_ID: SECRET_KEY})
+        self.params = {"secretId": SECRET_ID, "timestamp": 1760745600000, "nonce": 12345678, "retry": True,
+                       "callbackData": json.dumps({"antispam": {"taskId": "task-0", "suggestion": 0}})}
+        self.params["signature"] = sign(self.params)
+
+    def test_json_numeric_and_boolean(self):
+        self.assertTrue(self.receiver.verify(self.params, json_body=True))
+
+    def test_tampered(self):
+        self.assertFalse(self.receiver.verify(dict(self.params, retry=False), json_body=True))
+
+    def test_handle_json_body(self):
+        body = json.dumps(self.params).encode("utf8")
+        request = HttpRequest("POST", "/callback/text", "", {"content-type": "application/json"}, body)
+
+        async def handle():
+            self.receiver.on("text", lambda product, data, params: None)
+            self.receiver._queue = asyncio.Queue()
+            return await self.receiver.handle(request)
+
+        self.assertEqual(asyncio.run(handle()).status, 200)
+        self.assertEqual(self.receiver.rejected, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""common.responses按需解析的异常响应"""
+__author__ = 'yidun-dev'
+__date__ = '2026/10/18'
+__version__ = '0.2-dev'
+
+import json
+import unittest
+
+from common.responses import parse, to_python
+
+RAW = json.dumps({"code": 200, "msg": "ok", "result": {"antispam": {
+    "taskId": "fx6sxdcd89fvbvg4967b4o3k00009vq5", "suggestion": 0, "labels": [{"label": 100, "level": 0}]}}})
+
+
+class ParseTest(unittest.TestCase):
+
+    def test_complete(self):
+        self.assertEqual(to_python(parse(RAW, "text_check")), json.loads(RAW))
+
+    def test_empty_body(self):
+        for body in (b"", "", "  \n"):
+            with self.assertRaises(json.JSONDecodeError):
+                parse(body, "text_check")
+
+    def test_truncated(self):
+        # 每个截断位置都应抛出ValueError，而不是IndexError
+        for end in range(1, len(RAW)):
+            with self.assertRaises(ValueError, msg=RAW[:end]):
+                to_python(parse(RAW[:end], "text_check"))
+
+    def test_truncated_field_access(self):
+        ret = parse(RAW[:RAW.index('"result"') + 12], "text_check")
+        self.assertEqual(ret["code"], 200)
+        with self.assertRaises(ValueError):
+            ret["result"]["antispam"]["labels"]
+
+
+if __name__ == "__main__":
+    unittest.main()